@@ -0,0 +1,216 @@
+from oldcoins import OldCoinStash, transfer, apply
+from coin_ledger import CoinLedger
+from coin_server import CoinServer, CoinClient
+import asyncio
+import numpy as np
+import os
+import tempfile
+import random
+import threading
+import time
+
+#Run with: python benchmark_oldcoins.py
+
+#HELPERS
+
+def run_threads(work, threads:int) -> float:
+    '''Runs work(thread number) in several threads at the same time and returns the time in seconds.'''
+    workers = [threading.Thread(target=work, args=(number,)) for number in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+def operations(seed:int, stashes:list, count:int) -> list:
+    '''Returns random (kind, stash, riksdaler, skilling, target) transactions: half deposits, a quarter withdrawals and a quarter transfers.'''
+    generator = random.Random(seed)
+    kinds = ["deposit", "deposit", "withdraw", "transfer"]
+    return [(generator.choice(kinds), generator.choice(stashes), 1, 1, generator.choice(stashes)) for _ in range(count)]
+
+async def load(server:CoinServer, clients:int, requests_per_client:int, window:int, accounts:int) -> tuple:
+    '''Load generator: every client keeps window requests waiting at the same time. Returns (seconds, latencies in seconds).'''
+    listener = await server.start()
+    port = listener.sockets[0].getsockname()[1]
+    async with await CoinClient.connect(port=port) as client:
+        for number in range(accounts):
+            await client.open(f"Owner {number}")
+            await client.deposit(f"Owner {number}", 1_000_000, 0)
+
+    latencies = []
+    async def run_client(seed:int) -> None:
+        generator = random.Random(seed)
+        async with await CoinClient.connect(port=port) as client:
+            async def one_request() -> None:
+                account = f"Owner {generator.randrange(accounts)}"
+                start = time.perf_counter()
+                if generator.random() < 0.5:
+                    await client.deposit(account, 0, 1)
+                else:
+                    await client.withdraw(account, 0, 1)
+                latencies.append(time.perf_counter() - start)
+
+            async def worker(count:int) -> None:
+                for _ in range(count):
+                    await one_request()
+            await asyncio.gather(*[worker(requests_per_client//window) for _ in range(window)])
+
+    start = time.perf_counter()
+    await asyncio.gather(*[run_client(seed) for seed in range(clients)])
+    seconds = time.perf_counter() - start
+    await server.close()
+    listener.close()
+    await listener.wait_closed()
+    return seconds, latencies
+
+
+#BENCHMARKS
+
+def benchmark_contention(thread_counts:tuple=(1, 2, 4, 8, 16), stash_count:int=10, operations_per_thread:int=50_000, batch_size:int=1_000) -> None:
+    '''Compares one call (and lock) per transaction with apply() in batches, for threads that share a few stashes.'''
+    print(f"\nContention ({stash_count} shared stashes, {operations_per_thread} transactions per thread, batches of {batch_size})")
+    for threads in thread_counts:
+        stashes = [OldCoinStash(f"Owner {number}") for number in range(stash_count)]
+        for stash in stashes:
+            stash.deposit(1_000_000, 1_000_000)
+        work = [operations(number, stashes, operations_per_thread) for number in range(threads)]
+
+        def one_at_a_time(number:int) -> None:
+            for kind, stash, riksdaler, skilling, target in work[number]:
+                if kind == "deposit":
+                    stash.deposit(riksdaler, skilling)
+                elif kind == "withdraw":
+                    stash.withdraw(riksdaler, skilling)
+                else:
+                    transfer(stash, target, riksdaler, skilling)
+
+        def batched(number:int) -> None:
+            for start in range(0, operations_per_thread, batch_size):
+                apply(work[number][start:start + batch_size])
+
+        total = threads*operations_per_thread
+        single_seconds, batch_seconds = run_threads(one_at_a_time, threads), run_threads(batched, threads)
+        print(f"{threads:>3} threads   one at a time: {total/single_seconds:12,.0f} transactions/s   "
+              f"apply: {total/batch_seconds:12,.0f} transactions/s   speedup: {single_seconds/batch_seconds:5.1f}x")
+
+        #Every deposit adds 1 riksdaler and 1 skilling and every withdrawal removes them, both runs included
+        deposits = sum(kind == "deposit" for transactions in work for kind, *_ in transactions)
+        withdrawals = sum(kind == "withdraw" for transactions in work for kind, *_ in transactions)
+        coins = stashes[0].to_skilling(1, 1)
+        expected = stash_count*stashes[0].to_skilling(1_000_000, 1_000_000) + 2*(deposits - withdrawals)*coins
+        assert sum(stash.value for stash in stashes) == expected, "The total number of coins is wrong"
+
+
+def benchmark_mixed_operations(count:int=10_000_000, stash_count:int=100, chunk_size:int=1_000_000) -> None:
+    '''Measures deposits, withdrawals and transfers per second (one call each), and checks that no coin is lost or created.'''
+    print(f"\nMixed operations ({count:,} deposits, withdrawals and transfers, {stash_count} stashes)")
+    rng = np.random.default_rng(0)
+    stashes = [OldCoinStash(f"Owner {number}") for number in range(stash_count)]
+    deposited = withdrawn = 0
+    seconds = 0.0
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        #The random numbers are made (as Python ints) before the time is measured: 0 deposit, 1 withdraw, 2 transfer
+        kinds, sources, targets = rng.integers(0, 3, size).tolist(), rng.integers(0, stash_count, size).tolist(), rng.integers(0, stash_count, size).tolist()
+        riksdaler, skilling = rng.integers(0, 3, size).tolist(), rng.integers(0, 100, size).tolist()
+
+        failed = []
+        begin = time.perf_counter()
+        for index, (kind, source, target, coins, small_coins) in enumerate(zip(kinds, sources, targets, riksdaler, skilling)):
+            try:
+                if kind == 0:
+                    stashes[source].deposit(coins, small_coins)
+                elif kind == 1:
+                    stashes[source].withdraw(coins, small_coins)
+                else:
+                    transfer(stashes[source], stashes[target], coins, small_coins)
+            except ValueError:
+                failed.append(index) #Withdrawing more than there is in the stash
+        seconds += time.perf_counter() - begin
+
+        #Transfers keep the total, and failed operations change nothing
+        kinds, amounts = np.array(kinds), np.array(riksdaler)*OldCoinStash.SKILLING_PER_RIKSDALER + np.array(skilling)
+        kinds[failed] = 2
+        deposited += int(amounts[kinds == 0].sum())
+        withdrawn += int(amounts[kinds == 1].sum())
+    print(f"{'one call per operation':<40} {count/seconds:12,.0f} operations/s")
+
+    total = sum(stash.value for stash in stashes)
+    assert total == deposited - withdrawn, "Coins were lost or created"
+    assert all(stash.balance[1] < OldCoinStash.SKILLING_PER_RIKSDALER for stash in stashes), "A balance is not carried"
+    print(f"{'total value (exact, in skilling)':<40} {total:12,}")
+
+def benchmark_group_commit(sync_settings:tuple=(1, 10, 100, 1_000, 10_000), transactions:int=20_000, stash_count:int=100) -> None:
+    '''Measures logged transactions per second when the log is synced (fsync) after every sync_every transactions.'''
+    print(f"\nGroup commit ({transactions} logged deposits and transfers)")
+    for sync_every in sync_settings:
+        with tempfile.TemporaryDirectory() as directory:
+            with CoinLedger(directory, sync_every=sync_every) as ledger:
+                stashes = [ledger.open_stash(f"Owner {number}") for number in range(stash_count)]
+                ledger.apply([("deposit", stash, 1_000_000, 1_000_000) for stash in stashes])
+                work = operations(sync_every, stashes, transactions)
+                count = transactions if sync_every >= 100 else transactions//10 #One fsync per transaction is slow, so fewer are timed
+                start = time.perf_counter()
+                for kind, stash, riksdaler, skilling, target in work[:count]:
+                    if kind == "transfer":
+                        ledger.transfer(stash, target, riksdaler, skilling)
+                    else:
+                        ledger.deposit(stash, riksdaler, skilling) #Withdrawals are deposits here, so no transaction fails
+                ledger.flush()
+                seconds = time.perf_counter() - start
+        print(f"sync_every={sync_every:<8} {count/seconds:12,.0f} transactions/s")
+
+def benchmark_server(client_counts:tuple=(1, 10, 50), requests_per_client:int=2_000, window:int=20, accounts:int=10) -> None:
+    '''Measures ops/s and p50/p99 latency of CoinServer over TCP (with a CoinLedger), with one commit (and fsync) per request and with batches.'''
+    print(f"\nServer with a ledger ({requests_per_client} requests per client, {window} waiting per client, {accounts} accounts)")
+    for clients in client_counts:
+        for max_batch in (1, 1_000):
+            with tempfile.TemporaryDirectory() as directory:
+                with CoinLedger(directory) as ledger:
+                    server = CoinServer(ledger, max_batch=max_batch)
+                    seconds, latencies = asyncio.run(load(server, clients, requests_per_client, window, accounts))
+            p50, p99 = np.percentile(latencies, [50, 99])*1000
+            print(f"{clients:>3} clients  max_batch={max_batch:<6} {len(latencies)/seconds:10,.0f} ops/s   "
+                  f"p50: {p50:7.2f} ms   p99: {p99:7.2f} ms   average batch: {server.operations/server.commits:7.1f}")
+
+def benchmark_recovery(entries:int=10_000_000, stash_count:int=10_000) -> None:
+    '''Measures how long it takes to recover the stashes from a log with many entries, with and without a snapshot.'''
+    print(f"\nRecovery ({entries:,} log entries, {stash_count} stashes)")
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        with CoinLedger(directory) as ledger:
+            for number in range(stash_count):
+                ledger.open_stash(f"Owner {number}")
+
+        #The log is written directly (in chunks) with deposits and transfers, which are always valid
+        with open(os.path.join(directory, "transactions.log"), "ab") as file:
+            for start in range(0, entries, 1_000_000):
+                records = np.zeros(min(1_000_000, entries - start), dtype=CoinLedger.RECORD)
+                records["kind"] = rng.choice([CoinLedger.KINDS["deposit"], CoinLedger.KINDS["transfer"]], len(records), p=[0.9, 0.1])
+                records["stash"], records["target"] = rng.integers(0, stash_count, (2, len(records)))
+                records["skilling"] = (records["kind"] == CoinLedger.KINDS["deposit"])*rng.integers(1, 100*48, len(records))
+                file.write(records.tobytes())
+        print(f"{'log size':<40} {os.path.getsize(os.path.join(directory, 'transactions.log'))/2**20:9.1f} MB")
+
+        start = time.perf_counter()
+        ledger = CoinLedger(directory)
+        print(f"{'replay the whole log':<40} {(time.perf_counter() - start)*1000:9.1f} ms")
+        ledger.snapshot()
+        expected = [stash.balance for stash in ledger.stashes]
+        ledger.deposit(ledger.stashes[0], 1, 0)
+        ledger.close()
+
+        start = time.perf_counter()
+        ledger = CoinLedger(directory)
+        print(f"{'snapshot and the tail (1 entry)':<40} {(time.perf_counter() - start)*1000:9.1f} ms")
+        assert [stash.balance for stash in ledger.stashes][1:] == expected[1:], "The recovered balances are wrong"
+        ledger.close()
+
+
+if __name__ == "__main__":
+    benchmark_contention()
+    benchmark_mixed_operations()
+    benchmark_group_commit()
+    benchmark_server()
+    benchmark_recovery()
@@ -0,0 +1,205 @@
+from oldcoins import OldCoinStash, Transaction, apply
+import os
+import threading
+import numpy as np
+
+class CoinLedger:
+    '''
+    Keeps OldCoinStash objects in a directory, so that the coins are not lost when the program stops (or crashes).
+
+    Every committed transaction is appended to a binary log (transactions.log) as a fixed-size record. The records
+    are written and synced to the disk (fsync) in groups of sync_every transactions (group commit), since one fsync per
+    transaction is slow. A snapshot of all balances is saved every snapshot_every transactions, so that recovery only
+    has to replay the records after the last snapshot. The owners are kept in owners.txt, one line per stash.
+
+    Only valid transactions are logged, and deposits, withdrawals and transfers only add and subtract coins, so
+    recovery adds up the records of every stash with NumPy instead of replaying them one at a time. The coins are
+    logged as an int number of skilling (like OldCoinStash.value), so the recovered balances are exact, and the
+    ledger must be opened with the same skilling_per_riksdaler every time.
+
+    Transactions in a group that is not synced yet (see flush) are lost if the program crashes. The stashes must
+    be changed through the ledger (not with stash.deposit), otherwise the changes are not logged.
+
+    The stashes are changed before their records are written. If writing or syncing the log fails (e.g. the disk
+    is full), the error is raised and the balances in memory are ahead of the log, so the ledger stops: every later
+    call raises an OSError. Open the ledger again to recover the balances of the transactions that are on the disk.
+    '''
+
+    #One record: the kind of transaction (see KINDS), the stash and target numbers, and the coins in skilling (17 bytes, without padding)
+    RECORD = np.dtype([("kind", "u1"), ("stash", "<u4"), ("target", "<u4"), ("skilling", "<i8")])
+    KINDS = {"deposit": 0, "withdraw": 1, "transfer": 2}
+    MAX_SKILLING = np.iinfo(np.int64).max
+
+    def __init__(self, directory:str, sync_every:int = 1, snapshot_every:int = 1_000_000, skilling_per_riksdaler:int = OldCoinStash.SKILLING_PER_RIKSDALER) -> None:
+        '''Opens the ledger in directory (which is created if needed), and recovers the stashes if there already is a ledger.'''
+        if not isinstance(sync_every, int) or sync_every <= 0:
+            raise ValueError(f"sync_every must be an int above 0, not {sync_every}.")
+        if not isinstance(snapshot_every, int) or snapshot_every <= 0:
+            raise ValueError(f"snapshot_every must be an int above 0, not {snapshot_every}.")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory, self.sync_every, self.snapshot_every = directory, sync_every, snapshot_every
+        self.skilling_per_riksdaler = skilling_per_riksdaler
+        self._lock = threading.Lock() #Transactions are logged in the same order as they are done
+        self._pending = []
+        self._failed = None #The error of a failed write of the log, after which the ledger stops
+        self._stashes, self._numbers = [], {}
+        self._records, self._snapshot_records = self._recover()
+        self._log = open(self._path("transactions.log"), "ab")
+        self._owners = open(self._path("owners.txt"), "a", encoding="utf-8")
+
+    @property
+    def stashes(self) -> list:
+        '''Returns the stashes, in the order they were opened.'''
+        return list(self._stashes)
+
+    def open_stash(self, owner:str) -> OldCoinStash:
+        '''Creates a new (empty) stash in the ledger and returns it.'''
+        if "\n" in owner:
+            raise ValueError("The owner can not contain a new line.")
+
+        with self._lock:
+            self._check()
+            self._owners.write(owner + "\n")
+            self._owners.flush()
+            os.fsync(self._owners.fileno())
+            return self._add_stash(OldCoinStash(owner, self.skilling_per_riksdaler))
+
+    def deposit(self, stash:OldCoinStash, riksdaler:int = 0, skilling:int = 0) -> None:
+        self.apply([Transaction("deposit", stash, riksdaler, skilling)])
+
+    def withdraw(self, stash:OldCoinStash, riksdaler:int = 0, skilling:int = 0) -> None:
+        self.apply([Transaction("withdraw", stash, riksdaler, skilling)])
+
+    def transfer(self, source:OldCoinStash, target:OldCoinStash, riksdaler:int = 0, skilling:int = 0) -> None:
+        self.apply([Transaction("transfer", source, riksdaler, skilling, target)])
+
+    def apply(self, transactions:list) -> None:
+        '''Commits transactions with oldcoins.apply (all or nothing) and logs them. Raises ValueError if a stash is not in the ledger, and OverflowError if the coins do not fit in a record.'''
+        transactions = [Transaction(*transaction) for transaction in transactions]
+        with self._lock:
+            self._check()
+            for kind, stash, riksdaler, skilling, target in transactions:
+                if id(stash) not in self._numbers or (target is not None and id(target) not in self._numbers):
+                    raise ValueError("Please use stashes that were opened in this ledger.")
+                if isinstance(riksdaler, int) and isinstance(skilling, int) and abs(stash.to_skilling(riksdaler, skilling)) > self.MAX_SKILLING:
+                    raise OverflowError(f"A transaction can be at most {self.MAX_SKILLING} skilling to fit in the log.")
+            apply(transactions)
+
+            #The transactions are valid now, so the coins can be changed into skilling without checking them again
+            records = [(self.KINDS[kind], self._numbers[id(stash)], self._numbers[id(target)] if target is not None else 0, stash.to_skilling(riksdaler, skilling))
+                       for kind, stash, riksdaler, skilling, target in transactions]
+
+            self._pending.extend(records)
+            if len(self._pending) >= self.sync_every:
+                self._flush()
+
+    def flush(self) -> None:
+        '''Writes and syncs the transactions that are not on the disk yet.'''
+        with self._lock:
+            self._check()
+            self._flush()
+
+    def snapshot(self) -> None:
+        '''Saves the balances of all stashes, so that recovery starts from here.'''
+        with self._lock:
+            self._check()
+            self._flush()
+            self._snapshot()
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                if self._failed is None:
+                    self._flush()
+            finally:
+                self._log.close()
+                self._owners.close()
+
+    #The ledger can be used in a with statement, which closes it
+    def __enter__(self) -> "CoinLedger":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"CoinLedger(directory='{self.directory}', stashes={len(self._stashes)}, transactions={self._records + len(self._pending)})"
+
+
+    #HELPERS
+
+    def _path(self, name:str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _add_stash(self, stash:OldCoinStash) -> OldCoinStash:
+        self._numbers[id(stash)] = len(self._stashes)
+        self._stashes.append(stash)
+        return stash
+
+    def _check(self) -> None:
+        if self._failed is not None:
+            raise OSError(f"The ledger stopped after a failed write of the log ({self._failed}), open it again to recover the balances.")
+
+    def _flush(self) -> None:
+        '''Group commit: all pending records are written with one write and synced with one fsync.'''
+        if not self._pending:
+            return
+        try:
+            self._log.write(np.array(self._pending, dtype=self.RECORD).tobytes())
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        except OSError as error:
+            #The stashes already have the pending transactions, which may or may not be on the disk
+            self._failed = error
+            raise
+        self._records += len(self._pending)
+        self._pending.clear()
+        if self._records - self._snapshot_records >= self.snapshot_every:
+            self._snapshot()
+
+    def _snapshot(self) -> None:
+        '''Saves the values (in skilling) and the number of logged records. The file is replaced in one step, so a crash never leaves half a snapshot.'''
+        values = np.array([stash.value for stash in self._stashes], dtype=np.int64)
+        temporary = self._path("snapshot.tmp.npz")
+        with open(temporary, "wb") as file:
+            np.savez(file, values=values, records=self._records)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self._path("snapshot.npz"))
+        self._snapshot_records = self._records
+
+    def _recover(self) -> tuple:
+        '''Creates the stashes from the last snapshot and the records after it. Returns (number of records, records in the snapshot).'''
+        owners = []
+        if os.path.exists(self._path("owners.txt")):
+            with open(self._path("owners.txt"), "rb") as file:
+                data = file.read()
+            #The text after the last new line is an owner that was not completely written when the program crashed
+            end = data.rfind(b"\n") + 1
+            if end != len(data):
+                os.truncate(self._path("owners.txt"), end)
+            owners = data[:end].decode("utf-8").split("\n")[:-1]
+
+        values, snapshot_records = np.zeros(len(owners), dtype=np.int64), 0
+        if os.path.exists(self._path("snapshot.npz")):
+            with np.load(self._path("snapshot.npz")) as snapshot:
+                values[:len(snapshot["values"])] = snapshot["values"]
+                snapshot_records = int(snapshot["records"])
+
+        path = self._path("transactions.log")
+        records = os.path.getsize(path)//self.RECORD.itemsize if os.path.exists(path) else 0
+        if os.path.exists(path) and os.path.getsize(path) != records*self.RECORD.itemsize:
+            os.truncate(path, records*self.RECORD.itemsize) #A record that was not completely written when the program crashed
+
+        tail = np.fromfile(path, dtype=self.RECORD, offset=snapshot_records*self.RECORD.itemsize) if records > snapshot_records else np.empty(0, self.RECORD)
+        #Deposits add coins to the stash, withdrawals and transfers take coins from it, and transfers add coins to the target
+        #np.add.at adds int64 numbers (np.bincount would change them into floats, which are not exact for large numbers)
+        signs = np.where(tail["kind"] == self.KINDS["deposit"], 1, -1)
+        np.add.at(values, tail["stash"], signs*tail["skilling"])
+        transfers = tail["kind"] == self.KINDS["transfer"]
+        np.add.at(values, tail["target"][transfers], tail["skilling"][transfers])
+
+        for owner, value in zip(owners, values.tolist()):
+            self._add_stash(OldCoinStash.from_trusted(owner, value, self.skilling_per_riksdaler))
+        return records, snapshot_records
@@ -0,0 +1,258 @@
+from oldcoins import OldCoinStash, Transaction, apply
+import asyncio
+import itertools
+import json
+
+class CoinServer:
+    '''
+    Lets many clients use OldCoinStash accounts at the same time, with JSON over TCP (or a unix socket).
+
+    Every request is one line of JSON, e.g. {"id": 1, "op": "deposit", "account": "Kajsa", "riksdaler": 1, "skilling": 2},
+    and gets one line back: {"id": 1, "ok": true, "balance": [1, 2]} or {"id": 1, "ok": false, "error": "..."}.
+    The ops are "open", "deposit", "withdraw", "transfer" (with a "target" account) and "balance".
+
+    Every account has its own queue and worker task, so requests for one account are done in order and
+    requests for different accounts never wait for each other (there is no global lock). A worker takes all
+    requests that are waiting in its queue (at most max_batch) and commits them with one apply() call.
+    If ledger (a CoinLedger) is given, the accounts are kept in it, and the commits are done in a thread,
+    so that the server can take new requests (which become the next batch) while the log is synced.
+    '''
+
+    OPERATIONS = ("open", "deposit", "withdraw", "transfer", "balance")
+
+    def __init__(self, ledger=None, max_batch:int = 1_000) -> None:
+        if not isinstance(max_batch, int) or max_batch <= 0:
+            raise ValueError(f"max_batch must be an int above 0, not {max_batch}.")
+
+        self.ledger, self.max_batch = ledger, max_batch
+        self._accounts = {stash.owner: stash for stash in ledger.stashes} if ledger is not None else {}
+        self._queues, self._workers = {}, {}
+        self._opening = set() #Accounts that are being opened in the ledger, so that they are not opened twice
+
+        #Statistics, the average batch is operations/commits
+        self.commits = self.operations = 0
+
+    async def start(self, host:str = "127.0.0.1", port:int = 0, path:str = None) -> asyncio.AbstractServer:
+        '''Starts listening on host and port (0 picks a free port), or on a unix socket if path is given.'''
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle, path=path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def request(self, message:dict) -> dict:
+        '''Does one request (a dict like the JSON lines) and returns the response, without a connection.'''
+        try:
+            if not isinstance(message, dict):
+                raise ValueError("Every request must be a JSON object.")
+            operation, account = message.get("op"), message.get("account")
+            if operation not in self.OPERATIONS:
+                raise ValueError(f"The op must be one of {', '.join(self.OPERATIONS)}, not {operation}.")
+            if not isinstance(account, str):
+                raise ValueError(f"Please enter the account as a string, not {type(account)}.")
+
+            if operation == "open":
+                return self._response(message, await self._open(account))
+            if account not in self._accounts:
+                raise ValueError(f"There is no account {account}.")
+            target = message.get("target")
+            if operation == "transfer" and target not in self._accounts:
+                raise ValueError(f"There is no target account {target}.")
+
+            future = asyncio.get_running_loop().create_future()
+            self._worker(account).put_nowait((message, future))
+            return self._response(message, await future)
+        except (TypeError, ValueError, OverflowError) as error:
+            return {"id": message.get("id") if isinstance(message, dict) else None, "ok": False, "error": str(error)}
+
+    async def close(self) -> None:
+        '''Stops the workers (after the requests in the queues are done).'''
+        for queue in self._queues.values():
+            await queue.join()
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+
+
+    #HELPERS
+
+    async def _open(self, account:str) -> OldCoinStash:
+        if account in self._accounts or account in self._opening:
+            raise ValueError(f"The account {account} is already open.")
+        if self.ledger is None:
+            stash = OldCoinStash(account)
+        else:
+            #open_stash syncs owners.txt to the disk, which is done in a thread like the commits
+            self._opening.add(account)
+            try:
+                stash = await asyncio.to_thread(self.ledger.open_stash, account)
+            finally:
+                self._opening.discard(account)
+        self._accounts[account] = stash
+        return stash
+
+    def _worker(self, account:str) -> asyncio.Queue:
+        '''Returns the queue of an account, and starts its worker the first time.'''
+        if account not in self._workers:
+            self._queues[account] = asyncio.Queue()
+            self._workers[account] = asyncio.get_running_loop().create_task(self._run(account))
+        return self._queues[account]
+
+    async def _run(self, account:str) -> None:
+        queue = self._queues[account]
+        while True:
+            batch = [await queue.get()]
+            #The requests that came while the last batch was committed are committed together
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            try:
+                if self.ledger is not None:
+                    errors = await asyncio.to_thread(self._commit, batch)
+                else:
+                    errors = self._commit(batch)
+            except Exception as error: #E.g. the disk is full, then all requests in the batch fail
+                errors = [error]*len(batch)
+
+            for (message, future), error in zip(batch, errors):
+                if future.cancelled():
+                    pass
+                elif error is None:
+                    future.set_result(self._accounts[account])
+                else:
+                    future.set_exception(error)
+            for _ in batch:
+                queue.task_done()
+
+    def _commit(self, batch:list) -> list:
+        '''Commits a batch with one apply() call and returns an error (or None) for every request.'''
+        transactions = [self._transaction(message) for message, future in batch]
+        valid = [transaction for transaction in transactions if isinstance(transaction, Transaction)]
+        commit = self.ledger.apply if self.ledger is not None else apply
+        try:
+            commit(valid)
+            errors = [transaction if isinstance(transaction, Exception) else None for transaction in transactions]
+        except (TypeError, ValueError, OverflowError):
+            #apply() is all or nothing, so one invalid transaction (e.g. withdrawing too much) would stop the others,
+            #then they are committed one at a time instead
+            errors = []
+            for transaction in transactions:
+                if isinstance(transaction, Transaction):
+                    try:
+                        commit([transaction])
+                        transaction = None
+                    except (TypeError, ValueError, OverflowError) as error:
+                        transaction = error
+                errors.append(transaction)
+        self.commits += 1
+        self.operations += len(batch)
+        return errors
+
+    def _transaction(self, message:dict):
+        '''Returns the Transaction of a request (None for balance), or the error if the request is not valid.'''
+        operation = message["op"]
+        if operation == "balance":
+            return None
+        riksdaler, skilling = message.get("riksdaler", 0), message.get("skilling", 0)
+        target = self._accounts[message["target"]] if operation == "transfer" else None
+        return Transaction(operation, self._accounts[message["account"]], riksdaler, skilling, target)
+
+    def _response(self, message:dict, stash:OldCoinStash) -> dict:
+        return {"id": message.get("id"), "ok": True, "balance": list(stash.balance)}
+
+    async def _handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        '''Reads the requests of one connection. The requests are done at the same time, so the responses can come in another order (use the ids).'''
+        tasks = set()
+
+        async def answer(line:bytes) -> None:
+            try:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    raise ValueError("Every request must be a JSON object.")
+            except ValueError as error: #json.JSONDecodeError is a ValueError
+                response = {"id": None, "ok": False, "error": f"Not valid JSON: {error}"}
+            else:
+                response = await self.request(message)
+            if not writer.is_closing(): #The client may have gone before the answer
+                writer.write(json.dumps(response).encode() + b"\n")
+
+        try:
+            while line := await reader.readline():
+                task = asyncio.get_running_loop().create_task(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                if writer.transport.get_write_buffer_size() > 2**20:
+                    await writer.drain() #Stops reading while the client does not read its responses
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+
+class CoinClient:
+    '''A client for CoinServer. Many requests can be sent at the same time (from different tasks) on one connection.'''
+
+    def __init__(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        self._reader, self._writer = reader, writer
+        self._ids = itertools.count()
+        self._waiting = {}
+        self._responses = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def connect(cls, host:str = "127.0.0.1", port:int = None, path:str = None) -> "CoinClient":
+        '''Connects to host and port, or to a unix socket if path is given.'''
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, operation:str, account:str, **fields) -> tuple:
+        '''Sends one request and returns the balance (riksdaler, skilling) of the account. Raises ValueError if the server says no.'''
+        number = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[number] = future
+        self._writer.write(json.dumps({"id": number, "op": operation, "account": account, **fields}).encode() + b"\n")
+        response = await future
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        return tuple(response["balance"])
+
+    async def open(self, account:str) -> tuple:
+        return await self.request("open", account)
+
+    async def deposit(self, account:str, riksdaler:int = 0, skilling:int = 0) -> tuple:
+        return await self.request("deposit", account, riksdaler=riksdaler, skilling=skilling)
+
+    async def withdraw(self, account:str, riksdaler:int = 0, skilling:int = 0) -> tuple:
+        return await self.request("withdraw", account, riksdaler=riksdaler, skilling=skilling)
+
+    async def transfer(self, account:str, target:str, riksdaler:int = 0, skilling:int = 0) -> tuple:
+        return await self.request("transfer", account, target=target, riksdaler=riksdaler, skilling=skilling)
+
+    async def balance(self, account:str) -> tuple:
+        return await self.request("balance", account)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._responses.cancel()
+
+    #The client can be used in an async with statement, which closes it
+    async def __aenter__(self) -> "CoinClient":
+        return self
+
+    async def __aexit__(self, *exception) -> None:
+        await self.close()
+
+
+    #HELPERS
+
+    async def _read(self) -> None:
+        '''Gives every response to the request with the same id.'''
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._waiting.pop(response["id"], None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("The connection to the server was closed."))
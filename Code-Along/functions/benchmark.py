@@ -0,0 +1,44 @@
+import geometry as geo
+import numpy as np
+import time
+
+#Run with: python benchmark.py
+
+#HELPERS
+
+def best_time(function, repeats:int = 3) -> float:
+    '''Returns the fastest of several runs of a function, in seconds.'''
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def report(name:str, loop_seconds:float, array_seconds:float) -> None:
+    print(f"{name:<28} loop: {loop_seconds*1000:10.2f} ms   array: {array_seconds*1000:8.3f} ms   speedup: {loop_seconds/array_seconds:7.1f}x")
+
+
+#BENCHMARKS
+
+def benchmark_geometry(sizes:tuple=(1_000, 10_000, 100_000, 1_000_000, 10_000_000)) -> None:
+    '''Compares calling the functions once per number (in a loop) with calling them once with arrays.'''
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        print(f"\n{size:,} triangles and squares")
+        a, b, c = rng.uniform(1, 10, (3, size))
+        #The loop gets Python floats, like the functions got before they worked with arrays
+        a_list, b_list, c_list = a.tolist(), b.tolist(), c.tolist()
+        repeats = 3 if size < 1_000_000 else 1 #The loops are slow for the largest sizes
+
+        cases = [("triangle_area", lambda: [geo.triangle_area(x, y) for x, y in zip(a_list, b_list)], lambda: geo.triangle_area(a, b)),
+                 ("triangle_circumference", lambda: [geo.triangle_circumference(x, y, z) for x, y, z in zip(a_list, b_list, c_list)], lambda: geo.triangle_circumference(a, b, c)),
+                 ("square_area", lambda: [geo.square_area(x) for x in a_list], lambda: geo.square_area(a)),
+                 ("square_circumference", lambda: [geo.square_circumference(x) for x in a_list], lambda: geo.square_circumference(a))]
+        for name, loop, array in cases:
+            assert np.allclose(loop(), array()), f"{name} gives different results"
+            report(name, best_time(loop, repeats), best_time(array))
+
+
+if __name__ == "__main__":
+    benchmark_geometry()
@@ -1,11 +1,20 @@
+import numpy as np
+
+#The functions work for one number, or for NumPy arrays (or lists) of many numbers at once, e.g. a million triangles.
+#The arrays are broadcast, so a side can also be one number for all of them.
+
+def _numbers(value):
+    #Lists and int arrays are made into float arrays, one number is used as it is
+    return np.asarray(value, dtype=float) if isinstance(value, (list, tuple, np.ndarray)) else value
+
 def triangle_area(base, height):
-    return (base*height)/2
+    return (_numbers(base)*_numbers(height))/2
 
 def triangle_circumference(side1, side2, side3):
-    return sum([side1, side2, side3])
+    return _numbers(side1) + _numbers(side2) + _numbers(side3) #No list is needed to add three sides
 
 def square_area(side):
-    return side**2
+    return _numbers(side)**2 #For one float x**2 can round differently from x*x, so the same formula as before is used
 
 def square_circumference(side):
-    return side*4 
\ No newline at end of file
+    return _numbers(side)*4
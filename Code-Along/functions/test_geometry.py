@@ -0,0 +1,44 @@
+import geometry as geo
+import numpy as np
+import random
+import unittest
+
+class TestGeometry(unittest.TestCase):
+    def test_scalar_int(self):
+        #One int gives the same value and type as before the functions took arrays
+        self.assertEqual((geo.triangle_area(3, 4), type(geo.triangle_area(3, 4))), (6.0, float))
+        for result, expected in ((geo.triangle_circumference(3, 4, 5), 12), (geo.square_area(3), 9), (geo.square_circumference(3), 12)):
+            self.assertEqual(result, expected)
+            self.assertIs(type(result), int)
+
+    def test_scalar_float(self):
+        #The same formulas as before, so one float gives exactly the same float
+        generator = random.Random(0)
+        for _ in range(1_000):
+            a, b, c = (generator.uniform(0.1, 100) for _ in range(3))
+            self.assertIs(type(geo.square_area(a)), float)
+            self.assertEqual(geo.triangle_area(a, b), (a*b)/2)
+            self.assertEqual(geo.triangle_circumference(a, b, c), sum([a, b, c]))
+            self.assertEqual(geo.square_area(a), a**2)
+            self.assertEqual(geo.square_circumference(a), a*4)
+
+    def test_list_and_array(self):
+        sides = [1, 2, 3]
+        for value in (sides, np.array(sides)):
+            result = geo.square_area(value)
+            self.assertIsInstance(result, np.ndarray)
+            self.assertEqual(result.dtype, np.float64)
+            self.assertEqual(result.tolist(), [1, 4, 9])
+        self.assertEqual(geo.triangle_area([3, 6], np.array([4, 4])).tolist(), [6, 12])
+        self.assertEqual(geo.triangle_circumference([3, 1], [4, 1], [5, 1]).tolist(), [12, 3])
+        self.assertEqual(geo.square_circumference((1, 2.5)).tolist(), [4, 10])
+
+    def test_broadcasting(self):
+        #One number is used for all numbers in the array
+        self.assertEqual(geo.triangle_area([2, 4, 6], 3).tolist(), [3, 6, 9])
+        self.assertEqual(geo.triangle_circumference(np.array([1, 2]), 3, 4).tolist(), [8, 9])
+        self.assertEqual(geo.triangle_area(np.ones((2, 1)), np.array([1, 2, 3])).shape, (2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
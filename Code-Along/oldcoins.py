@@ -1,30 +1,142 @@
+from collections import namedtuple
+from contextlib import ExitStack
+import itertools
+import threading
+
+#A transaction for apply(). kind is "deposit", "withdraw" or "transfer" (then target is the stash that receives the coins)
+Transaction = namedtuple("Transaction", ["kind", "stash", "riksdaler", "skilling", "target"], defaults=[0, 0, None])
+
 class OldCoinStash:
-    def __init__(self, owner:str) -> None: #type hinting, it returns None (only for documentation, good practice, if we hoover over the __init__ we will see the type that it returns)
+    #Every stash gets a unique number, which gives the order that locks are taken in (so two transfers can never wait for each other)
+    _numbers = itertools.count()
+
+    #How many skilling one riksdaler is worth, if nothing else is given when the stash is created
+    SKILLING_PER_RIKSDALER = 48
+
+    def __init__(self, owner:str, skilling_per_riksdaler:int = SKILLING_PER_RIKSDALER) -> None: #type hinting, it returns None (only for documentation, good practice, if we hoover over the __init__ we will see the type that it returns)
+        if not isinstance(skilling_per_riksdaler, int) or skilling_per_riksdaler <= 0:
+            raise ValueError(f"skilling_per_riksdaler must be an int above 0, not {skilling_per_riksdaler}.")
+
         #These attributes are public
         self.owner = owner
 
         #Private - by convention use underscore prefix (prefix before the word, postfix after the word) (we can also use name mangling)
-        self._riksdaler = 0
-        self._skilling = 0
+        #All coins are counted in skilling (the smallest coin) as an int, so there are no rounding errors and
+        #riksdaler are carried and borrowed automatically, e.g. 50 skilling are 1 riksdaler and 2 skilling (with 48 skilling per riksdaler)
+        self._value = 0
+        self._rate = skilling_per_riksdaler
+
+        #Every stash has its own lock, so threads that use different stashes do not wait for each other
+        self._lock = threading.Lock()
+        self._number = next(OldCoinStash._numbers)
+
+    #A classmethod gets the class (cls) and can be used as another constructor
+    @classmethod
+    def from_trusted(cls, owner:str, value:int, skilling_per_riksdaler:int = SKILLING_PER_RIKSDALER) -> "OldCoinStash":
+        '''Creates a stash with a value in skilling that is already valid (e.g. recovered from a log), without checking it.'''
+        stash = cls(owner, skilling_per_riksdaler)
+        stash._value = value
+        return stash
 
-    def deposit(self, riksdaler: float = 0, skilling: float = 0) -> None: #"riksdaler: float" is also type hinting, we expect to receive a float. We can also use | for or "float|int" for the latest version of Python.
+    def deposit(self, riksdaler: int = 0, skilling: int = 0) -> None: #"riksdaler: int" is also type hinting, we expect to receive an int. We can also use | for or "float|int" for the latest version of Python.
+        amount = self.to_skilling(riksdaler, skilling)
         if riksdaler < 0 or skilling < 0:
             raise ValueError(f"Stop depositing negative values. {riksdaler} riksdaler or {skilling} skilling not okay.")
-        
-        self._riksdaler += riksdaler #We use _riksdaler because we want to get to the private variable and change it
-        self._skilling += skilling
-    
-    def withdraw(self, riksdaler: float, skilling: float) -> None:
-        if riksdaler > self._riksdaler or skilling > self._skilling:
-            raise ValueError("You cannot withdraw more coins than you have.")
+
+        with self._lock: #+= is a read and a write, so another thread could write in between without the lock
+            self._value += amount #We use _value because we want to get to the private variable and change it
+
+    def withdraw(self, riksdaler: int = 0, skilling: int = 0) -> None:
+        amount = self.to_skilling(riksdaler, skilling)
         if riksdaler < 0 or skilling < 0:
             raise ValueError("You cannot withdraw negative numbers.")
-        
-        self._riksdaler -= riksdaler
-        self._skilling -= skilling
-    
+
+        #The check and the update are done with the lock, so no other thread can withdraw the same coins in between
+        #Riksdaler are changed into skilling if needed, so only the total value has to be large enough
+        with self._lock:
+            if amount > self._value:
+                raise ValueError("You cannot withdraw more coins than you have.")
+            self._value -= amount
+
+    def to_skilling(self, riksdaler: int = 0, skilling: int = 0) -> int:
+        '''Returns the value of the coins in skilling. Only whole coins (int) can be used.'''
+        #bool is a subclass of int, but True riksdaler is not a coin
+        if not isinstance(riksdaler, int) or not isinstance(skilling, int) or isinstance(riksdaler, bool) or isinstance(skilling, bool):
+            raise TypeError(f"Please enter whole coins (int), not {type(riksdaler)} riksdaler and {type(skilling)} skilling.")
+        return riksdaler*self._rate + skilling
+
+    @property
+    def skilling_per_riksdaler(self) -> int:
+        return self._rate
+
+    @property
+    def value(self) -> int:
+        '''Returns the value of all coins in skilling.'''
+        return self._value
+
+    @property
+    def balance(self) -> tuple:
+        '''Returns (riksdaler, skilling) with as many riksdaler as possible, so skilling is below skilling_per_riksdaler.'''
+        return divmod(self._value, self._rate) #The value is one int, so it is never half changed by another thread
+
+    #The string is only made when the balance is checked, not in deposit and withdraw
     def check_balance(self) -> str:
-        return f"Coins in stash: {self._riksdaler} riksdaler and {self._skilling} skillingar."
-    
+        riksdaler, skilling = self.balance
+        return f"Coins in stash: {riksdaler} riksdaler and {skilling} skillingar."
+
     def __repr__(self) -> str: #Type hinting, it will return a String
-        return f"OldCoinStash(owner='{self.owner})'."
\ No newline at end of file
+        return f"OldCoinStash(owner='{self.owner})'."
+
+
+def transfer(source:OldCoinStash, target:OldCoinStash, riksdaler:int = 0, skilling:int = 0) -> None:
+    '''Moves coins from one stash to another, so that no thread can see the coins in both or in none of the stashes.'''
+    apply([Transaction("transfer", source, riksdaler, skilling, target)])
+
+def apply(transactions:list) -> None:
+    '''
+    Validates and commits many transactions at once: either all of them are done, or (if one is not valid) none of them.
+
+    The locks of all stashes are taken once (in the order of their numbers, so that two calls can not deadlock),
+    the transactions are checked in order on copies of the values, and the new values are then written.
+    A withdrawal can use coins that were deposited earlier in the same list. The riksdaler of a transfer are
+    changed into skilling with the rate of the stash they are taken from.
+
+    Raises ValueError or TypeError (with the number of the transaction) if a transaction is not valid, and then nothing is changed.
+    '''
+
+    transactions = [Transaction(*transaction) for transaction in transactions] #Also accepts plain tuples
+    stashes = {}
+    for transaction in transactions:
+        #Only the target can be None (for deposits and withdrawals)
+        for stash in (transaction.stash, transaction.target) if transaction.target is not None else (transaction.stash,):
+            if not isinstance(stash, OldCoinStash):
+                raise TypeError(f"Please enter OldCoinStash objects, not a {type(stash)}.")
+            stashes[id(stash)] = stash
+
+    with ExitStack() as locks:
+        for stash in sorted(stashes.values(), key=lambda stash: stash._number):
+            locks.enter_context(stash._lock)
+
+        #The values are only changed on the copies until all transactions are checked
+        values = {key: stash._value for key, stash in stashes.items()}
+        for number, (kind, stash, riksdaler, skilling, target) in enumerate(transactions):
+            if kind not in ("deposit", "withdraw", "transfer"):
+                raise ValueError(f"Transaction {number}: the kind must be 'deposit', 'withdraw' or 'transfer', not {kind}.")
+            if kind == "transfer" and target is None:
+                raise ValueError(f"Transaction {number}: a transfer needs a target stash.")
+            try:
+                amount = stash.to_skilling(riksdaler, skilling)
+            except TypeError as error:
+                raise TypeError(f"Transaction {number}: {error}")
+            if riksdaler < 0 or skilling < 0:
+                raise ValueError(f"Transaction {number}: the coins can not be negative, not {riksdaler} riksdaler or {skilling} skilling.")
+
+            if kind != "deposit": #withdraw or transfer, the coins are taken from the stash
+                if amount > values[id(stash)]:
+                    raise ValueError(f"Transaction {number}: you cannot withdraw more coins than you have.")
+                values[id(stash)] -= amount
+            if kind != "withdraw": #deposit or transfer, the coins are put in the stash (or the target)
+                values[id(target if kind == "transfer" else stash)] += amount
+
+        for key, value in values.items():
+            stashes[key]._value = value
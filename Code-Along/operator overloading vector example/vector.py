@@ -1,4 +1,5 @@
 from plotter import PlotVectors #They are in the same folder, so we can import it directly
+import numpy as np
 
 class Vector:
     '''A class to represent a euclidean vector with magnitude and direction.'''
@@ -16,12 +17,30 @@ class Vector:
         #self.numbers = (number for number in numbers) #this is a tuple comprehension, this will create a generator
         #We convert the number into a float so that True and False will also be numbers
         #Using _ here makes it private (we could also use a setter, but in this case we do not want that, since we want it to be set only when creating the class)
-        self._numbers = tuple(float(number) for number in numbers) #We have to convert the generator to a tuple
+        #The numbers are stored in a NumPy array, so that + - * are done on all numbers at once (instead of one at a time in a generator)
+        #The array is made read-only, so the numbers can still only be set when creating the Vector
+        self._array = np.array(numbers, dtype=float)
+        self._array.flags.writeable = False
+
+    #A classmethod gets the class (cls) instead of an object
+    #It is used for the results of + - *, which are already valid, so the numbers do not have to be checked again
+    @classmethod
+    def _from_array(cls, array:np.ndarray) -> "Vector":
+        '''Creates a Vector from a 1D float array, without validating the numbers again.'''
+        vector = cls.__new__(cls) #Creates the object without running __init__
+        vector._array = array
+        vector._array.flags.writeable = False
+        return vector
 
     @property
     def numbers(self) -> tuple:
         '''Read only property that returns the numbers.'''
-        return self._numbers
+        return tuple(self._array.tolist())
+
+    @property
+    def array(self) -> np.ndarray:
+        '''Read only property that returns the numbers as a read-only NumPy array (without copying).'''
+        return self._array
 
     #We us __add__ to overload addition
     #It's convention to use self, so that other developers see that it is a method (although Python does not require it)
@@ -35,31 +54,21 @@ class Vector:
         '''Adds to vectors of same dimension using + operator.'''
         if self.validate_vectors(other): #The object itself will be sent it to the method, together with other that we specify
             #Other will now be a vector have the same dimension
-            #We zip together self.numbers and other.numbers and unpack them in a and b, then add them together and store them in number
-            numbers = (a+b for a, b in zip(self.numbers, other.numbers)) #numbers is now a generator
-            #we have to unpack the generator object using *
-            #If we have five numbers the numbers will be unpacked and each element will be sent to the Vector
-            return Vector(*numbers) 
+            #NumPy adds the arrays element by element, so (2, 3) + (1, 1) = (3, 4)
+            return Vector._from_array(self._array + other._array)
 
     def __sub__(self, other) -> "Vector":
-        '''Subtracts to vectors of same dimension using + operator.'''
+        '''Subtracts to vectors of same dimension using - operator.'''
         if self.validate_vectors(other): #The object itself will be sent it to the method, together with other that we specify
             #Other will now be a vector have the same dimension
-            #We zip together self.numbers and other.numbers and unpack them in a and b, then add them together and store them in number
-            numbers = (a-b for a, b in zip(self.numbers, other.numbers)) #numbers is now a generator
-            #we have to unpack the generator object using *
-            #If we have five numbers the numbers will be unpacked and each element will be sent to the Vector
-            return Vector(*numbers)  
+            return Vector._from_array(self._array - other._array)
 
     def __mul__(self, value:float) -> "Vector":
-        print("__mul__ called ...")
         if not isinstance(value, (float, int)):
             raise TypeError(f"Value must be float or int, not {type(value)}")  
-        numbers = (value*a for a in self.numbers) 
-        return Vector(*numbers) 
+        return Vector._from_array(self._array*value) #Every number is multiplied with value
 
     def __rmul__(self, value:float) -> "Vector":
-        print("__rmul__ called ...")
         return self*value
 
     #If we do not make this function we cannot runt len(v1) in the Jupyter notebook
@@ -67,7 +76,7 @@ class Vector:
     # len() function
     def __len__(self) -> int:
         '''Returns number of components in a Vector, not the Euclidean length.'''
-        return len(self.numbers) #self.numbers is a tuple which we can run len on and get the number of elements
+        return len(self._array) #self._array is a 1D array which we can run len on and get the number of elements
 
     def validate_vectors(self, other: "Vector") -> bool:
         '''Validate that two vectors have same dimension'''
@@ -85,15 +94,15 @@ class Vector:
 
     # [] operator __getitem__ is the "name" of the [] operator
     def __getitem__(self, item:int) -> float:
-        return self.numbers[item] #This will enable us to reach an element in the list
+        #This will enable us to reach an element in the list (a slice, e.g. v[1:3], returns a tuple)
+        if isinstance(item, slice):
+            return tuple(self._array[item].tolist())
+        return float(self._array[item])
 
     def __eq__(self, other) -> bool:
         if not self.validate_vectors(other): #If the vectors does not have the same length, return False
             return False
-        for num1, num2 in zip(self.numbers, other.numbers):
-            if num1 != num2:
-                return False
-        return True
+        return bool((self._array == other._array).all()) #True if all numbers are equal
     
     def plot(self, *others:"Vector") -> None:
         #TODO: error checking
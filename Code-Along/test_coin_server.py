@@ -0,0 +1,106 @@
+from coin_server import CoinServer, CoinClient
+from coin_ledger import CoinLedger
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+class TestCoinServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = CoinServer()
+        self.listener = await self.server.start()
+        self.client = await CoinClient.connect(port=self.listener.sockets[0].getsockname()[1])
+        await self.client.open("Gore Bord")
+        await self.client.open("Kajsa")
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def test_deposit_and_withdraw(self):
+        self.assertEqual(await self.client.deposit("Gore Bord", 10, 50), (11, 2))
+        self.assertEqual(await self.client.withdraw("Gore Bord", 1, 0), (10, 2))
+        self.assertEqual(await self.client.balance("Gore Bord"), (10, 2))
+
+    async def test_transfer(self):
+        await self.client.deposit("Gore Bord", 10, 0)
+        await self.client.transfer("Gore Bord", "Kajsa", 3, 0)
+        self.assertEqual(await self.client.balance("Gore Bord"), (7, 0))
+        self.assertEqual(await self.client.balance("Kajsa"), (3, 0))
+
+    async def test_invalid_requests(self):
+        with self.assertRaises(ValueError):
+            await self.client.withdraw("Kajsa", 1, 0)
+        with self.assertRaises(ValueError):
+            await self.client.deposit("Nobody", 1, 0)
+        with self.assertRaises(ValueError):
+            await self.client.deposit("Kajsa", 0.5, 0)
+        with self.assertRaises(ValueError):
+            await self.client.deposit("Kajsa", True, 0)
+        with self.assertRaises(ValueError):
+            await self.client.open("Kajsa")
+        with self.assertRaises(ValueError):
+            await self.client.request("steal", "Kajsa")
+
+    async def test_request_that_is_not_a_dict(self):
+        response = await self.server.request(["x"])
+        self.assertEqual((response["id"], response["ok"]), (None, False))
+
+    async def test_requests_are_batched(self):
+        balances = await asyncio.gather(*[self.client.deposit("Kajsa", 0, 1) for _ in range(200)])
+        self.assertEqual(max(balances), (4, 8))
+        self.assertLess(self.server.commits, self.server.operations) #More than one request per commit
+
+    async def test_invalid_request_in_batch(self):
+        #Only the withdrawal that is too large fails, the other requests in the same batch are done
+        requests = [self.client.deposit("Kajsa", 1, 0), self.client.withdraw("Kajsa", 100, 0), self.client.deposit("Kajsa", 1, 0)]
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(await self.client.balance("Kajsa"), (2, 0))
+
+    async def test_many_clients_keep_total(self):
+        await self.client.deposit("Gore Bord", 100, 0)
+        port = self.listener.sockets[0].getsockname()[1]
+
+        async def move(source:str, target:str) -> None:
+            async with await CoinClient.connect(port=port) as client:
+                results = await asyncio.gather(*[client.transfer(source, target, 0, 7) for _ in range(50)], return_exceptions=True)
+                self.assertTrue(all(isinstance(result, (tuple, ValueError)) for result in results))
+
+        await asyncio.gather(*[move(*pair) for pair in [("Gore Bord", "Kajsa"), ("Kajsa", "Gore Bord")]*3])
+        riksdaler, skilling = (sum(coins) for coins in zip(await self.client.balance("Gore Bord"), await self.client.balance("Kajsa")))
+        self.assertEqual(riksdaler*48 + skilling, 100*48)
+
+    async def test_not_valid_json(self):
+        reader, writer = await asyncio.open_connection(port=self.listener.sockets[0].getsockname()[1])
+        writer.write(b"{not json\n[1, 2]\n")
+        responses = [json.loads(await reader.readline()) for _ in range(2)]
+        self.assertEqual([response["ok"] for response in responses], [False, False])
+        writer.close()
+        await writer.wait_closed()
+
+
+class TestCoinServerWithLedger(unittest.IsolatedAsyncioTestCase):
+    async def test_unix_socket_and_ledger(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with CoinLedger(directory, sync_every=1) as ledger:
+                server = CoinServer(ledger)
+                path = os.path.join(directory, "coins.sock")
+                listener = await server.start(path=path)
+                async with await CoinClient.connect(path=path) as client:
+                    opened = await asyncio.gather(client.open("Kajsa"), client.open("Kajsa"), return_exceptions=True)
+                    self.assertEqual(sum(isinstance(result, ValueError) for result in opened), 1) #Opened once, while the first is syncing
+                    await asyncio.gather(*[client.deposit("Kajsa", 1, 0) for _ in range(100)])
+                await server.close()
+                listener.close()
+                await listener.wait_closed()
+
+            with CoinLedger(directory) as ledger:
+                self.assertEqual(ledger.stashes[0].balance, (100, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+from oldcoins import OldCoinStash, Transaction, transfer, apply
+from coin_ledger import CoinLedger
+import os
+import random
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+class TestOldCoinStash(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stash = OldCoinStash("Gore Bord")
+        self.stash.deposit(500, 3000)
+
+    def test_deposit(self):
+        self.stash.deposit(riksdaler=10, skilling=5)
+        self.assertEqual(self.stash.balance, (572, 29)) #3000 skilling are 62 riksdaler and 24 skilling
+
+    def test_deposit_negative(self):
+        with self.assertRaises(ValueError):
+            self.stash.deposit(-20, 35)
+
+    def test_withdraw(self):
+        self.stash.withdraw(100, 100)
+        self.assertEqual(self.stash.balance, (460, 20))
+
+    def test_withdraw_too_much(self):
+        with self.assertRaises(ValueError):
+            self.stash.withdraw(20000000, 35000000)
+        self.assertEqual(self.stash.balance, (562, 24))
+
+    def test_check_balance(self):
+        self.assertEqual(self.stash.check_balance(), "Coins in stash: 562 riksdaler and 24 skillingar.")
+
+    def test_carry(self):
+        stash = OldCoinStash("Kajsa")
+        stash.deposit(0, 50)
+        self.assertEqual(stash.balance, (1, 2))
+        self.assertEqual(stash.value, 50)
+
+    def test_borrow(self):
+        stash = OldCoinStash("Kajsa")
+        stash.deposit(1, 0)
+        stash.withdraw(0, 1) #A riksdaler is changed into skilling
+        self.assertEqual(stash.balance, (0, 47))
+
+    def test_exchange_rate(self):
+        stash = OldCoinStash("Kajsa", skilling_per_riksdaler=12)
+        stash.deposit(1, 25)
+        self.assertEqual(stash.balance, (3, 1))
+        with self.assertRaises(ValueError):
+            OldCoinStash("Kajsa", skilling_per_riksdaler=0)
+
+    def test_float_is_rejected(self):
+        with self.assertRaises(TypeError):
+            self.stash.deposit(0.1, 0)
+        with self.assertRaises(TypeError):
+            self.stash.withdraw(0, 1.5)
+        with self.assertRaises(TypeError):
+            self.stash.deposit(True, True)
+        self.assertEqual(self.stash.balance, (562, 24))
+
+
+class TestTransactions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.first, self.second = OldCoinStash("Gore Bord"), OldCoinStash("Kajsa")
+        self.first.deposit(100, 100)
+
+    def test_transfer(self):
+        transfer(self.first, self.second, 40, 10)
+        self.assertEqual(self.first.balance, (61, 42))
+        self.assertEqual(self.second.balance, (40, 10))
+
+    def test_transfer_too_much(self):
+        with self.assertRaises(ValueError):
+            transfer(self.second, self.first, 1, 0)
+
+    def test_apply(self):
+        apply([("deposit", self.second, 5, 5),
+               Transaction("transfer", self.first, 100, 0, self.second),
+               ("withdraw", self.second, 105, 5)]) #Uses the coins from the transactions before
+        self.assertEqual(self.first.balance, (2, 4))
+        self.assertEqual(self.second.balance, (0, 0))
+
+    def test_apply_all_or_nothing(self):
+        with self.assertRaises(ValueError):
+            apply([("deposit", self.second, 5, 5), ("withdraw", self.first, 1000, 0)])
+        self.assertEqual(self.first.balance, (102, 4)) #The deposit before the invalid withdrawal is not done either
+        self.assertEqual(self.second.balance, (0, 0))
+
+    def test_apply_invalid_kind(self):
+        with self.assertRaises(ValueError):
+            apply([("steal", self.first, 5, 5)])
+
+    def test_apply_float(self):
+        with self.assertRaises(TypeError):
+            apply([("deposit", self.second, 5, 5), ("deposit", self.first, 0.5, 0)])
+        self.assertEqual(self.second.balance, (0, 0))
+
+    def test_apply_invalid_stash(self):
+        with self.assertRaises(TypeError):
+            apply([("deposit", "Gore Bord", 5, 5)])
+        with self.assertRaises(TypeError):
+            apply([("deposit", None, 1, 0)])
+
+    def test_concurrent_transfers_keep_total(self):
+        #Threads move coins in both directions, which could deadlock if the locks were taken in different orders
+        def move(source, target):
+            for _ in range(2000):
+                try:
+                    transfer(source, target, 1, 1)
+                except ValueError:
+                    pass #The source is empty for the moment
+                self.first.deposit(0, 1)
+
+        threads = [threading.Thread(target=move, args=pair) for pair in [(self.first, self.second), (self.second, self.first)]*4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.first.value + self.second.value, 100*48 + 100 + 8*2000)
+
+
+class TestTotalsArePreserved(unittest.TestCase):
+    #Many random transactions (with a fixed seed) are compared with a simple model that counts all coins in skilling
+    def test_random_transactions(self):
+        generator = random.Random(0)
+        stashes = [OldCoinStash(f"Owner {number}", skilling_per_riksdaler=generator.choice([12, 48, 64])) for number in range(5)]
+        model = [0]*len(stashes)
+        for _ in range(5000):
+            number, target = generator.randrange(len(stashes)), generator.randrange(len(stashes))
+            kind = generator.choice(["deposit", "withdraw", "transfer"])
+            riksdaler, skilling = generator.randrange(3), generator.randrange(100)
+            amount = riksdaler*stashes[number].skilling_per_riksdaler + skilling
+            try:
+                apply([(kind, stashes[number], riksdaler, skilling, stashes[target])])
+            except ValueError:
+                self.assertGreater(amount, model[number]) #Only withdrawing too much fails
+                continue
+            if kind != "deposit":
+                model[number] -= amount
+            if kind != "withdraw":
+                model[target if kind == "transfer" else number] += amount
+
+            self.assertEqual([stash.value for stash in stashes], model)
+        for stash in stashes:
+            riksdaler, skilling = stash.balance
+            self.assertEqual(riksdaler*stash.skilling_per_riksdaler + skilling, stash.value)
+            self.assertTrue(0 <= skilling < stash.skilling_per_riksdaler)
+
+    def test_transfers_keep_total(self):
+        generator = random.Random(1)
+        stashes = [OldCoinStash(f"Owner {number}") for number in range(10)]
+        for stash in stashes:
+            stash.deposit(100, 0)
+        for _ in range(5000):
+            source, target = generator.sample(stashes, 2)
+            try:
+                transfer(source, target, generator.randrange(5), generator.randrange(200))
+            except ValueError:
+                pass
+        self.assertEqual(sum(stash.value for stash in stashes), 10*100*48)
+
+
+class TestCoinLedger(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def fill(self, ledger:CoinLedger) -> None:
+        first, second = ledger.open_stash("Gore Bord"), ledger.open_stash("Kajsa")
+        ledger.deposit(first, 100, 50)
+        ledger.transfer(first, second, 30, 20)
+        ledger.withdraw(second, 10, 0)
+        ledger.apply([("deposit", second, 1, 1), ("withdraw", first, 0, 5)])
+
+    def balances(self, ledger:CoinLedger) -> list:
+        return [(stash.owner, stash.balance) for stash in ledger.stashes]
+
+    def test_recover_from_log(self):
+        with CoinLedger(self.path) as ledger:
+            self.fill(ledger)
+            expected = self.balances(ledger)
+        self.assertEqual(expected, [("Gore Bord", (70, 25)), ("Kajsa", (21, 21))])
+        with CoinLedger(self.path) as ledger:
+            self.assertEqual(self.balances(ledger), expected)
+
+    def test_recover_from_snapshot_and_tail(self):
+        with CoinLedger(self.path, snapshot_every=2) as ledger:
+            self.fill(ledger)
+            expected = self.balances(ledger)
+        self.assertTrue(os.path.exists(os.path.join(self.path, "snapshot.npz")))
+        with CoinLedger(self.path) as ledger:
+            self.assertEqual(self.balances(ledger), expected)
+
+    def test_large_values_are_exact(self):
+        with CoinLedger(self.path, skilling_per_riksdaler=12) as ledger:
+            stash = ledger.open_stash("Gore Bord")
+            ledger.deposit(stash, 2**58, 11) #Too large to be exact as a float
+            ledger.withdraw(stash, 0, 12)
+            with self.assertRaises(OverflowError):
+                ledger.deposit(stash, 2**62, 0)
+        with CoinLedger(self.path, skilling_per_riksdaler=12) as ledger:
+            self.assertEqual(ledger.stashes[0].balance, (2**58 - 1, 11))
+
+    def test_group_commit(self):
+        ledger = CoinLedger(self.path, sync_every=100)
+        stash = ledger.open_stash("Gore Bord")
+        ledger.deposit(stash, 5, 5)
+        self.assertEqual(os.path.getsize(os.path.join(self.path, "transactions.log")), 0) #Not synced yet
+        ledger.flush()
+        self.assertEqual(os.path.getsize(os.path.join(self.path, "transactions.log")), CoinLedger.RECORD.itemsize)
+        ledger.close()
+
+    def test_torn_record_is_ignored(self):
+        with CoinLedger(self.path) as ledger:
+            self.fill(ledger)
+            expected = self.balances(ledger)
+        with open(os.path.join(self.path, "transactions.log"), "ab") as file:
+            file.write(b"\x00\x01\x00") #Part of a record, as if the program crashed while writing
+        with CoinLedger(self.path) as ledger:
+            self.assertEqual(self.balances(ledger), expected)
+            ledger.deposit(ledger.stashes[0], 1, 0)
+        with CoinLedger(self.path) as ledger:
+            self.assertEqual(ledger.stashes[0].balance, (71, 25))
+
+    def test_invalid_transaction_is_not_logged(self):
+        with CoinLedger(self.path) as ledger:
+            stash = ledger.open_stash("Gore Bord")
+            with self.assertRaises(ValueError):
+                ledger.withdraw(stash, 5, 0)
+        self.assertEqual(os.path.getsize(os.path.join(self.path, "transactions.log")), 0)
+
+    def test_stash_not_in_ledger(self):
+        with CoinLedger(self.path) as ledger:
+            with self.assertRaises(ValueError):
+                ledger.deposit(OldCoinStash("Gore Bord"), 5, 0)
+
+    def test_invalid_settings(self):
+        for snapshot_every in (0, -1, 1.5):
+            with self.assertRaises(ValueError):
+                CoinLedger(self.path, snapshot_every=snapshot_every)
+
+    def test_failed_write_stops_ledger(self):
+        ledger = CoinLedger(self.path)
+        stash = ledger.open_stash("Gore Bord")
+        ledger.deposit(stash, 5, 0)
+        with mock.patch("coin_ledger.os.fsync", side_effect=OSError("No space left on device")):
+            with self.assertRaises(OSError):
+                ledger.deposit(stash, 1, 0)
+        #The stash has the coins of the failed deposit, which may not be on the disk, so the ledger does not go on
+        with self.assertRaises(OSError):
+            ledger.deposit(stash, 1, 0)
+        with self.assertRaises(OSError):
+            ledger.flush()
+        ledger.close()
+        with CoinLedger(self.path) as ledger:
+            self.assertIn(ledger.stashes[0].balance, [(5, 0), (6, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,268 @@
+from vector import Vector, VectorAccumulator
+from vector_batch import VectorBatch
+from plotter import PlotVectors
+from sparse_vector import SparseVector
+import tempfile
+import os
+import numpy as np
+import math
+import time
+import functools
+import operator
+import tracemalloc
+
+#Run with: python benchmark.py
+
+#HELPERS
+
+def best_time(function, repeats: int = 3) -> float:
+    """Returns the fastest of several runs of a function, in seconds"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def report(name: str, baseline_seconds: float, other_seconds: float, baseline_name: str = "tuple", other_name: str = "numpy") -> None:
+    """Prints the time of a baseline next to the time of another implementation"""
+    print(f"{name:<40} {baseline_name}: {baseline_seconds*1000:9.2f} ms   {other_name}: {other_seconds*1000:9.2f} ms   speedup: {baseline_seconds/other_seconds:7.1f}x")
+
+def count_vectors(function) -> int:
+    """Returns how many Vector objects (and subclass objects) are created while running a function"""
+    created = [0]
+    def counting_new(cls, *args, **kwargs):
+        created[0] += 1
+        return object.__new__(cls)
+
+    Vector.__new__ = counting_new
+    try:
+        function()
+    finally:
+        del Vector.__new__
+    return created[0]
+
+
+class TupleVector:
+    """The tuple based Vector (before it was backed by NumPy), used as the baseline"""
+
+    def __init__(self, *numbers: float) -> None:
+        for number in numbers:
+            if not isinstance(number, (float, int)):
+                raise TypeError(f"{number} must be a float or int not {type(number)}")
+
+        if len(numbers) <= 0:
+            raise ValueError("Vectors can't be empty")
+
+        self._numbers = tuple(float(number) for number in numbers)
+
+    @property
+    def numbers(self) -> tuple:
+        return self._numbers
+
+    def __add__(self, other: "TupleVector") -> "TupleVector":
+        if self.validate_vectors(other):
+            numbers = (a+b for a,b in zip(self.numbers, other.numbers))
+            return TupleVector(*numbers)
+
+    def __sub__(self, other: "TupleVector") -> "TupleVector":
+        if self.validate_vectors(other):
+            numbers = (a-b for a,b in zip(self.numbers, other.numbers))
+            return TupleVector(*numbers)
+
+    def __mul__(self, value: float) -> "TupleVector":
+        if not isinstance(value, (float, int)):
+            raise TypeError(f"Value must be float or int not {type(value)}")
+
+        numbers = (value*a for a in self.numbers)
+        return TupleVector(*numbers)
+
+    def __rmul__(self, value: float) -> "TupleVector":
+        return self*value
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def validate_vectors(self, other: "TupleVector") -> bool:
+        if not isinstance(other, TupleVector) or len(other) != len(self):
+            raise TypeError("Both must be Vector and same length")
+        return len(self) == len(other)
+
+    def __getitem__(self, item: int) -> float:
+        return self.numbers[item]
+
+    def __eq__(self, other) -> bool:
+        if not self.validate_vectors(other):
+            return False
+
+        for num1, num2 in zip(self.numbers, other.numbers):
+            if num1 != num2:
+                return False
+
+        return True
+
+
+#BENCHMARKS
+
+def benchmark_vector(dimensions: tuple = (2, 3, 100, 1_000), operations: int = 10_000) -> None:
+    """Compares + - * and == of the tuple based Vector with the NumPy backed Vector, in a loop of operations"""
+    for dimension in dimensions:
+        print(f"\nVector ({dimension} dimensions, {operations} operations)")
+        numbers = [float(number) for number in range(dimension)]
+        tuples = TupleVector(*numbers), TupleVector(*numbers)
+        arrays = Vector(*numbers), Vector(*numbers)
+
+        for name, operation in (("+", lambda a, b: a + b), ("-", lambda a, b: a - b), ("*", lambda a, b: 2.5*a), ("==", lambda a, b: a == b)):
+            report(f"Vector {name}", best_time(lambda: [operation(*tuples) for _ in range(operations)]),
+                   best_time(lambda: [operation(*arrays) for _ in range(operations)]))
+
+        report("Vector(*numbers)", best_time(lambda: [TupleVector(*numbers) for _ in range(operations)]),
+               best_time(lambda: [Vector(*numbers) for _ in range(operations)]))
+
+        #A tight loop, where every result is used in the next operation
+        def chained(vector):
+            total = vector
+            for _ in range(operations):
+                total = (total + vector)*0.5
+            return total
+        report("(total + v)*0.5 in a loop", best_time(lambda: chained(tuples[0])), best_time(lambda: chained(arrays[0])))
+
+
+def benchmark_vector_batch(size: int = 100_000, dimensions: tuple = (2, 3)) -> None:
+    """Compares loops over lists of Vectors with VectorBatch"""
+    rng = np.random.default_rng(0)
+    for dimension in dimensions:
+        print(f"\nVectorBatch ({size} vectors, {dimension} dimensions)")
+        array = rng.normal(size=(size, dimension))
+        vectors = [Vector(*row) for row in array.tolist()]
+        batch = VectorBatch(array)
+        offset = Vector(*[1.0]*dimension)
+
+        report("v + offset", best_time(lambda: [vector + offset for vector in vectors]), best_time(lambda: batch + offset), "vectors", "batch")
+        report("v*2.5", best_time(lambda: [vector*2.5 for vector in vectors]), best_time(lambda: batch*2.5), "vectors", "batch")
+        report("dot(v, offset)", best_time(lambda: [sum(a*b for a, b in zip(vector.numbers, offset.numbers)) for vector in vectors]),
+               best_time(lambda: batch.dot(offset)), "vectors", "batch")
+        report("norm", best_time(lambda: [math.hypot(*vector.numbers) for vector in vectors]), best_time(batch.norm), "vectors", "batch")
+        report("normalize", best_time(lambda: [vector*(1/math.hypot(*vector.numbers)) for vector in vectors]), best_time(batch.normalize), "vectors", "batch")
+        print(f"{'from_vectors':<40} {best_time(lambda: VectorBatch.from_vectors(vectors))*1000:9.2f} ms   to_vectors (views): {best_time(batch.to_vectors)*1000:9.2f} ms")
+
+        # pairwise distances of the first 1000 vectors (a 1000 x 1000 matrix), the loop is timed for 100 vectors and scaled up
+        subset, small = vectors[:1000], VectorBatch(array[:1000])
+        loop = best_time(lambda: [[math.dist(a.numbers, b.numbers) for b in subset] for a in subset[:100]], 1)*10
+        report("pairwise_distances (1000 x 1000)", loop, best_time(small.pairwise_distances), "vectors", "batch")
+
+
+def benchmark_linear_algebra(dimensions: tuple = (2, 3, 100, 10_000), operations: int = 10_000) -> None:
+    """Compares dot, norm, angle_between, project_onto and cross with hand-written loops over numbers"""
+    rng = np.random.default_rng(0)
+    for dimension in dimensions:
+        print(f"\nLinear algebra ({dimension} dimensions, {operations} operations)")
+        v1, v2 = Vector(*rng.normal(size=dimension).tolist()), Vector(*rng.normal(size=dimension).tolist())
+        repeats = range(operations if dimension < 10_000 else operations//10) # 10,000 dimensions: fewer operations
+
+        def loop_dot(a, b):
+            total = 0.0
+            for x, y in zip(a.numbers, b.numbers):
+                total += x*y
+            return total
+
+        def loop_angle(a, b):
+            return math.acos(loop_dot(a, b)/math.sqrt(loop_dot(a, a)*loop_dot(b, b)))
+
+        def loop_project(a, b):
+            scale = loop_dot(a, b)/loop_dot(b, b)
+            return Vector(*[scale*y for y in b.numbers])
+
+        report("dot", best_time(lambda: [loop_dot(v1, v2) for _ in repeats]), best_time(lambda: [v1.dot(v2) for _ in repeats]), "loop", "Vector")
+        report("v1 @ v2", best_time(lambda: [loop_dot(v1, v2) for _ in repeats]), best_time(lambda: [v1 @ v2 for _ in repeats]), "loop", "Vector")
+        report("norm", best_time(lambda: [math.sqrt(loop_dot(v1, v1)) for _ in repeats]), best_time(lambda: [abs(v1) for _ in repeats]), "loop", "Vector")
+        report("angle_between", best_time(lambda: [loop_angle(v1, v2) for _ in repeats]), best_time(lambda: [v1.angle_between(v2) for _ in repeats]), "loop", "Vector")
+        report("project_onto", best_time(lambda: [loop_project(v1, v2) for _ in repeats]), best_time(lambda: [v1.project_onto(v2) for _ in repeats]), "loop", "Vector")
+        if dimension == 3:
+            def loop_cross(a, b):
+                (x1, y1, z1), (x2, y2, z2) = a.numbers, b.numbers
+                return Vector(y1*z2 - z1*y2, z1*x2 - x1*z2, x1*y2 - y1*x2)
+            report("cross", best_time(lambda: [loop_cross(v1, v2) for _ in repeats]), best_time(lambda: [v1.cross(v2) for _ in repeats]), "loop", "Vector")
+
+
+def benchmark_plot_vectors(sizes: tuple = (1_000, 10_000, 100_000)) -> None:
+    """Times PlotVectors saving images without a window, with arrows (quiver) and as a density image"""
+    print("\nPlotVectors (saved as png)")
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "vectors.png")
+        PlotVectors((1, 1)).plot(path) # matplotlib is imported before timing
+        for size in sizes:
+            batch = VectorBatch(rng.normal(size=(size, 2)))
+            tails = rng.uniform(-10, 10, (size, 2))
+            # arrows are only timed once for 100k vectors, since they take seconds
+            arrows = best_time(lambda: PlotVectors(batch, tails=tails).plot(path, density=False), 1 if size > 10_000 else 3)
+            density = best_time(lambda: PlotVectors(batch, tails=tails).plot(path, density=True))
+            report(f"{size} vectors", arrows, density, "arrows", "density")
+
+
+def benchmark_sparse_vector(length: int = 1_000_000, density: float = 0.01) -> None:
+    """Compares memory and speed of SparseVector with the tuple based Vector, for long vectors with few non-zero numbers"""
+    print(f"\nSparseVector ({length} dimensions, {density:.0%} non-zero)")
+    rng = np.random.default_rng(0)
+    vectors = []
+    for _ in range(2):
+        indices = rng.choice(length, int(length*density), replace=False)
+        dense = np.zeros(length)
+        dense[indices] = rng.normal(size=len(indices))
+        vectors.append((dense.tolist(), indices, dense[indices]))
+    (numbers, indices, values), (other_numbers, other_indices, other_values) = vectors
+
+    def memory(function) -> int:
+        tracemalloc.start()
+        vector = function()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size
+
+    tuple_memory, sparse_memory = memory(lambda: TupleVector(*numbers)), memory(lambda: SparseVector(length, indices, values))
+    print(f"{'memory':<40} tuple: {tuple_memory/2**20:9.2f} MB   sparse: {sparse_memory/2**20:9.2f} MB   ratio: {tuple_memory/sparse_memory:7.1f}x")
+
+    tuples = TupleVector(*numbers), TupleVector(*other_numbers)
+    sparse = SparseVector(length, indices, values), SparseVector(length, other_indices, other_values)
+    report("create", best_time(lambda: TupleVector(*numbers), 1), best_time(lambda: SparseVector(length, indices, values)), "tuple", "sparse")
+    report("sparse + sparse", best_time(lambda: tuples[0] + tuples[1], 1), best_time(lambda: sparse[0] + sparse[1]), "tuple", "sparse")
+    report("sparse - sparse", best_time(lambda: tuples[0] - tuples[1], 1), best_time(lambda: sparse[0] - sparse[1]), "tuple", "sparse")
+    report("2.5*sparse", best_time(lambda: 2.5*tuples[0], 1), best_time(lambda: 2.5*sparse[0]), "tuple", "sparse")
+    report("sparse == sparse", best_time(lambda: tuples[0] == tuples[0], 1), best_time(lambda: sparse[0] == sparse[0]), "tuple", "sparse")
+    report("sparse[i] (1000 lookups)", best_time(lambda: [tuples[0][i] for i in range(0, length, length//1000)]),
+           best_time(lambda: [sparse[0][i] for i in range(0, length, length//1000)]), "tuple", "sparse")
+
+    # with a dense (NumPy) Vector the result is dense, so the cost is proportional to the length
+    dense = Vector(*other_numbers)
+    report("sparse + dense Vector", best_time(lambda: tuples[0] + tuples[1], 1), best_time(lambda: sparse[0] + dense), "tuple", "sparse")
+
+
+def benchmark_accumulator(size: int = 1_000_000, dimensions: tuple = (3, 100)) -> None:
+    """Compares summing Vectors with functools.reduce(operator.add) with Vector.sum and VectorAccumulator"""
+    rng = np.random.default_rng(0)
+    for dimension in dimensions:
+        count = size if dimension < 100 else size//10
+        print(f"\nSumming {count} Vectors ({dimension} dimensions)")
+        vectors = [Vector._from_array(row) for row in rng.normal(size=(count, dimension))]
+
+        def accumulate():
+            accumulator = VectorAccumulator(dimension)
+            for vector in vectors:
+                accumulator += vector
+            return accumulator
+
+        reduce_seconds = best_time(lambda: functools.reduce(operator.add, vectors), 1)
+        print(f"{'Vectors created':<40} reduce: {count_vectors(lambda: functools.reduce(operator.add, vectors)):9d}      "
+              f"Vector.sum: {count_vectors(lambda: Vector.sum(vectors)):9d}      accumulator +=: {count_vectors(accumulate):9d}")
+        report("reduce(operator.add) vs Vector.sum", reduce_seconds, best_time(lambda: Vector.sum(vectors)), "reduce", "sum")
+        report("reduce(operator.add) vs accumulator +=", reduce_seconds, best_time(accumulate), "reduce", "+=")
+
+
+if __name__ == "__main__":
+    benchmark_vector()
+    benchmark_vector_batch()
+    benchmark_linear_algebra()
+    benchmark_plot_vectors()
+    benchmark_sparse_vector()
+    benchmark_accumulator()
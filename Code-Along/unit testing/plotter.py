@@ -1,29 +1,127 @@
-import matplotlib.pyplot as plt 
+import numpy as np
 
 class PlotVectors:
     """Plotting several vectors in cartesian coordinate system"""
 
-    def __init__(self, *vectors) -> None:
-        X, Y = [], []
+    # the title lists at most this many vectors, and then the number of vectors
+    TITLE_VECTORS = 5
+    # above this many vectors they are drawn as a density image instead of arrows (matplotlib needs seconds for 100k arrows)
+    ARROW_LIMIT = 10_000
+    # the density image is calculated for about this many points on the lines at a time, so the memory use is fixed
+    # (one line has at most 2*resolution + 1 points, and a chunk always has at least one line)
+    CHUNK_SAMPLES = 1_000_000
 
+    def __init__(self, *vectors, tails=None) -> None:
+        """
+        vectors can be Vectors, tuples, VectorBatches or N x 2 arrays (one row per vector),
+        and tails are the (x, y) start points of the vectors (one for all, or one per vector, default origin)
+        """
+        # everything with an array (Vector, VectorBatch) is used without copying, and other input is converted
+        arrays = []
         for vector in vectors:
-            X.append(vector[0])
-            Y.append(vector[1])
-
-        self.X, self.Y = X, Y
-        # (0,0,...,0)
-        self.originX = self.originY = tuple(0 for _ in range(len(X)))
-
-    def plot(self) -> None:
-        """Visualize vectors"""
-
-        plt.quiver(self.originX, self.originY, self.X, self.Y, scale=1, scale_units="xy", angles="xy")
-
-        plt.xlim(-2,10)
-        plt.ylim(-2,10)
-        plt.xlabel("x")
-        plt.ylabel("y")
-        title = " ".join(f"{X, Y}" for X,Y in zip(self.X, self.Y))
-        plt.title(f"Vectors: {title}")
-        plt.grid()
-        plt.show() 
\ No newline at end of file
+            array = np.asarray(getattr(vector, "array", vector), dtype=float)
+            if array.ndim == 1:
+                array = array[np.newaxis]
+            if array.ndim != 2 or array.shape[1] < 2:
+                raise ValueError(f"Vectors must have at least 2 components (x, y) not shape {array.shape}")
+            arrays.append(array[:, :2])
+
+        XY = np.concatenate(arrays) if arrays else np.empty((0, 2))
+        self.X, self.Y = XY[:, 0], XY[:, 1]
+
+        # (0,0,...,0) if no tails are given
+        origin = np.zeros((len(XY), 2)) if tails is None else np.broadcast_to(np.asarray(tails, dtype=float), XY.shape)
+        self.originX, self.originY = origin[:, 0], origin[:, 1]
+
+    def limits(self) -> tuple:
+        """Returns ((lowest x, highest x), (lowest y, highest y)) that show all tails and heads, with some space around them"""
+        if len(self.X) == 0:
+            return (-2, 10), (-2, 10)
+
+        limits = []
+        for tails, heads in ((self.originX, self.X), (self.originY, self.Y)):
+            heads = tails + heads
+            low, high = min(tails.min(), heads.min(), 0), max(tails.max(), heads.max(), 0)
+            margin = (high - low)*0.1 or 1 # 1 if all vectors are 0
+            limits.append((float(low - margin), float(high + margin)))
+        return tuple(limits)
+
+    def title(self) -> str:
+        """Returns the title, which lists the first vectors and the number of vectors if there are many"""
+        shown = " ".join(f"{X, Y}" for X, Y in zip(self.X[:self.TITLE_VECTORS].tolist(), self.Y[:self.TITLE_VECTORS].tolist()))
+        if len(self.X) > self.TITLE_VECTORS:
+            return f"Vectors: {shown} ... ({len(self.X)} vectors)"
+        return f"Vectors: {shown}"
+
+    def plot(self, path: str = None, size: tuple = (6, 6), dpi: int = 100, density: bool = None) -> None:
+        """
+        Visualize vectors, in a window or (if path is given) in an image file without a window,
+        as arrows or as a density image (default None, which uses a density image above ARROW_LIMIT vectors)
+        """
+
+        if path is None:
+            import matplotlib.pyplot as plt
+            self.draw(plt.gca(), density)
+            plt.show()
+            return
+
+        # a Figure with an Agg canvas does not need a display, and pyplot is not used
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        figure = Figure(figsize=size, dpi=dpi)
+        FigureCanvasAgg(figure)
+        self.draw(figure.add_subplot(), density)
+        figure.savefig(path)
+
+    def draw(self, axes, density: bool = None) -> None:
+        """Draws all vectors in matplotlib axes, with one quiver call or as one density image"""
+
+        (lowest_x, highest_x), (lowest_y, highest_y) = self.limits()
+        if density is None:
+            density = len(self.X) > self.ARROW_LIMIT
+        if density:
+            # the logarithm, so that single vectors are visible next to places where thousands of vectors cross
+            image = np.log1p(self.density_image())
+            axes.imshow(image, origin="lower", extent=(lowest_x, highest_x, lowest_y, highest_y), cmap="Greys", aspect="auto", interpolation="nearest")
+        else:
+            axes.quiver(self.originX, self.originY, self.X, self.Y, scale=1, scale_units="xy", angles="xy")
+
+        axes.set_xlim(lowest_x, highest_x)
+        axes.set_ylim(lowest_y, highest_y)
+        axes.set_xlabel("x")
+        axes.set_ylabel("y")
+        axes.set_title(self.title())
+        axes.grid()
+
+    def density_image(self, resolution: int = 512) -> np.ndarray:
+        """
+        Returns a resolution x resolution array with the number of points on the vectors (lines from tail to head) in every pixel,
+        where every line has about one point per pixel along its length
+        """
+
+        (lowest_x, highest_x), (lowest_y, highest_y) = self.limits()
+        pixels_x, pixels_y = resolution/(highest_x - lowest_x), resolution/(highest_y - lowest_y)
+        counts = np.zeros(resolution*resolution, dtype=np.int64)
+
+        # every line is sampled at about one point per pixel along its length
+        all_samples = np.minimum(np.ceil(np.maximum(np.abs(self.X)*pixels_x, np.abs(self.Y)*pixels_y)), 2*resolution).astype(np.int64) + 1
+        ends = np.cumsum(all_samples)
+        start = 0
+        while start < len(all_samples):
+            # the chunk ends at the last line whose points fit in CHUNK_SAMPLES
+            done = ends[start - 1] if start else 0
+            stop = max(int(np.searchsorted(ends, done + self.CHUNK_SAMPLES, side="right")), start + 1)
+            tails_x, tails_y = self.originX[start:stop], self.originY[start:stop]
+            X, Y, samples = self.X[start:stop], self.Y[start:stop], all_samples[start:stop]
+            start = stop
+
+            lines = np.repeat(np.arange(len(X)), samples)
+            steps = np.arange(len(lines)) - np.repeat(np.cumsum(samples) - samples, samples)
+            fractions = steps/np.maximum(samples[lines] - 1, 1)
+
+            columns = ((tails_x[lines] + X[lines]*fractions - lowest_x)*pixels_x).astype(np.int64)
+            rows = ((tails_y[lines] + Y[lines]*fractions - lowest_y)*pixels_y).astype(np.int64)
+            inside = (columns >= 0) & (columns < resolution) & (rows >= 0) & (rows < resolution)
+            counts += np.bincount(rows[inside]*resolution + columns[inside], minlength=resolution*resolution)
+        return counts.reshape(resolution, resolution)
@@ -0,0 +1,180 @@
+from vector import Vector
+import numpy as np
+import operator
+
+class SparseVector(Vector):
+    """ A Vector where only the non-zero numbers are stored, as sorted index and value arrays"""
+
+    def __init__(self, length: int, indices=(), values=()) -> None:
+        """length is the number of components, and indices and values are the positions and values of the non-zero numbers"""
+        if not isinstance(length, int) or isinstance(length, bool):
+            raise TypeError(f"{length} must be an int not {type(length)}")
+        if length <= 0:
+            raise ValueError("Vectors can't be empty")
+
+        indices, values = np.asarray(indices), np.asarray(values)
+        if indices.size and indices.dtype.kind not in "iu":
+            raise TypeError(f"Indices must be int not {indices.dtype}")
+        if values.size and values.dtype.kind not in "biuf":
+            raise TypeError(f"Values must be float or int not {values.dtype}")
+        if indices.ndim != 1 or values.shape != indices.shape:
+            raise ValueError("Indices and values must be 1D and have same length")
+        if indices.size and (indices.min() < 0 or indices.max() >= length):
+            raise ValueError(f"Indices must be between 0 and {length - 1}")
+
+        # sorted and without zeros, so that two equal vectors store the same arrays
+        order = np.argsort(indices, kind="stable")
+        indices, values = indices[order].astype(np.int64), values[order].astype(float)
+        if (indices[1:] == indices[:-1]).any():
+            raise ValueError("Indices must be unique")
+        non_zero = values != 0
+        self._set(length, indices[non_zero], values[non_zero])
+
+    @classmethod
+    def from_dict(cls, length: int, values: dict) -> "SparseVector":
+        """Creates a SparseVector from a dict with the non-zero numbers {index: value}"""
+        return cls(length, np.fromiter(values.keys(), dtype=np.int64, count=len(values)), list(values.values()))
+
+    @classmethod
+    def from_dense(cls, vector: Vector) -> "SparseVector":
+        """Creates a SparseVector from the non-zero numbers of a Vector"""
+        indices = np.flatnonzero(vector.array)
+        return cls._from_arrays(len(vector), indices, vector.array[indices])
+
+    @classmethod
+    def _from_arrays(cls, length: int, indices: np.ndarray, values: np.ndarray) -> "SparseVector":
+        """Creates a SparseVector from sorted unique indices and values without validating them again (zeros are removed)"""
+        vector = cls.__new__(cls)
+        non_zero = values != 0
+        vector._set(length, indices[non_zero], values[non_zero])
+        return vector
+
+    def _set(self, length: int, indices: np.ndarray, values: np.ndarray) -> None:
+        self._length, self._indices, self._values = length, indices, values
+        self._indices.flags.writeable = self._values.flags.writeable = False
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Read only property that returns the sorted indices of the non-zero numbers"""
+        return self._indices
+
+    @property
+    def values(self) -> np.ndarray:
+        """Read only property that returns the non-zero numbers (in the order of indices)"""
+        return self._values
+
+    # the dense array is only created when it is needed, e.g. by numbers, array or the Vector methods (dot, norm ...)
+    @property
+    def _array(self) -> np.ndarray:
+        array = np.zeros(self._length)
+        array[self._indices] = self._values
+        array.flags.writeable = False
+        return array
+
+    # (sparse) + (sparse) is sparse, and (sparse) + (dense) is dense
+    def __add__(self, other: Vector) -> Vector:
+        """Adds two vectors of same dimensions using + operator"""
+        if self._validate_length(other):
+            if isinstance(other, SparseVector):
+                return self._merge(other, 1)
+            return self._add_to_dense(other._array, 1, 1)
+
+    # Python calls the reflected method of a subclass first, so (dense) + (sparse) also ends up here
+    def __radd__(self, other: Vector) -> Vector:
+        return self + other
+
+    def __sub__(self, other: Vector) -> Vector:
+        """Subtracts two vectors of same dimensions using - operator"""
+        if self._validate_length(other):
+            if isinstance(other, SparseVector):
+                return self._merge(other, -1)
+            return self._add_to_dense(other._array, 1, -1)
+
+    # (dense) - (sparse)
+    def __rsub__(self, other: Vector) -> Vector:
+        if self._validate_length(other):
+            return self._add_to_dense(other._array, -1, 1)
+
+    def __mul__(self, value: float) -> "SparseVector":
+        if not isinstance(value, (float, int)):
+            raise TypeError(f"Value must be float or int not {type(value)}")
+
+        return SparseVector._from_arrays(self._length, self._indices, self._values*value)
+
+    # len() function
+    def __len__(self) -> int:
+        """Returns number of components in a Vector (also the zeros) not the Euclidean length"""
+        return self._length
+
+    # [] operator, the value is found with a binary search in the indices
+    def __getitem__(self, item: int) -> float:
+        if isinstance(item, slice):
+            return tuple(self._lookup(np.arange(*item.indices(self._length))).tolist())
+
+        # s[1.5] and s['a'] raise TypeError as in a Vector, and so does s[True] (which is not an index of a component)
+        if isinstance(item, (bool, np.bool_)):
+            raise TypeError("Vector indices must be integers or slices, not bool")
+        item = operator.index(item)
+        if not -self._length <= item < self._length:
+            raise IndexError("Vector index out of range")
+        item = item % self._length
+        position = int(self._indices.searchsorted(item))
+        if position < len(self._indices) and self._indices[position] == item:
+            return float(self._values[position])
+        return 0.0
+
+    def __eq__(self, other) -> bool:
+        if not self._validate_length(other):
+            return False
+
+        if isinstance(other, SparseVector):
+            return bool(np.array_equal(self._indices, other._indices) and np.array_equal(self._values, other._values))
+        # a dense Vector is equal if it has the same non-zero numbers and no other
+        dense = other._array
+        return bool(np.count_nonzero(dense) == len(self._values) and (dense[self._indices] == self._values).all())
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{index}: {value}" for index, value in zip(self._indices.tolist()[:10], self._values.tolist()[:10]))
+        more = f", ... ({len(self._values)} non-zero numbers)" if len(self._values) > 10 else ""
+        return f"SparseVector({self._length}, {{{values}{more}}})"
+
+    # a million numbers are not printed
+    def __str__(self) -> str:
+        return repr(self)
+
+    def _validate_length(self, other: Vector) -> bool:
+        """ Validate that other is a Vector with same dimensions, without creating a dense array """
+        if not isinstance(other, Vector) or len(other) != self._length:
+            raise TypeError("Both must be Vector and same length")
+        return True
+
+    def _merge(self, other: "SparseVector", sign: int) -> "SparseVector":
+        """Returns self + sign*other, in time proportional to the non-zero numbers"""
+        indices = np.concatenate((self._indices, other._indices))
+        values = np.concatenate((self._values, sign*other._values))
+        order = np.argsort(indices, kind="stable")
+        indices, values = indices[order], values[order]
+
+        # the values of an index that is in both vectors are added
+        starts = np.flatnonzero(np.r_[True, indices[1:] != indices[:-1]])
+        values = np.add.reduceat(values, starts) if len(values) else values
+        return SparseVector._from_arrays(self._length, indices[starts], values)
+
+    def _add_to_dense(self, dense: np.ndarray, sign: int, dense_sign: int) -> Vector:
+        """Returns the dense Vector sign*self + dense_sign*dense (the dense array is copied once)"""
+        array = np.multiply(dense, dense_sign, dtype=float)
+        array[self._indices] += sign*self._values
+        return Vector._from_array(array)
+
+    def _add_into(self, buffer: np.ndarray, sign: int) -> None:
+        """Adds (sign 1) or subtracts (sign -1) the non-zero numbers to a buffer array in place"""
+        buffer[self._indices] += sign*self._values
+
+    def _lookup(self, items: np.ndarray) -> np.ndarray:
+        """Returns the numbers at the indices items (0 where no number is stored), with a binary search in the indices"""
+        positions = np.searchsorted(self._indices, items)
+        found = positions < len(self._indices)
+        found[found] = self._indices[positions[found]] == items[found]
+        numbers = np.zeros(len(items))
+        numbers[found] = self._values[positions[found]]
+        return numbers
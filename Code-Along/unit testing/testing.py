@@ -1,4 +1,11 @@
-from vector import Vector
+from vector import Vector, VectorAccumulator
+from vector_batch import VectorBatch
+from sparse_vector import SparseVector
+from plotter import PlotVectors
+import numpy as np
+import math
+import os
+import tempfile
 import unittest
 
 #v1 = Vector(1,1)
@@ -51,6 +58,17 @@ class TestVector(unittest.TestCase):
     def test_get_item(self):
         v = self.create_2D_vector()
         self.assertEqual(self.x, v[0])
+
+    def test_get_item_index_types(self):
+        # the same as indexing the tuple of numbers
+        v = self.create_2D_vector()
+        self.assertEqual(v[True], v.numbers[True])
+        self.assertEqual(v[np.int64(-1)], v.numbers[-1])
+        for item in ("a", 1.5, None):
+            with self.assertRaises(TypeError):
+                v[item]
+        with self.assertRaises(IndexError):
+            v[2]
     
     def test_get_item_5D_vector(self):
         v = Vector(1, 2, 3, 4, 5)
@@ -68,7 +86,366 @@ class TestVector(unittest.TestCase):
         v = self.create_2D_vector()
         v2 = 5*v
         self.assertEqual(v2, Vector(5, 10))   
+
+    #Tests the NumPy array that stores the numbers
+    def test_add_vectors(self):
+        v = self.create_2D_vector() + Vector(0.5, -2)
+        self.assertEqual(v.numbers, (1.5, 0))
+
+    def test_subtract_vectors(self):
+        v = Vector(1, 2, 3) - Vector(3, 2, 1)
+        self.assertEqual(v.numbers, (-2, 0, 2))
+
+    def test_numbers_is_tuple_of_floats(self):
+        v = self.create_2D_vector()
+        self.assertIsInstance(v.numbers, tuple)
+        self.assertIsInstance(v[1], float)
+
+    def test_array_is_read_only(self):
+        v = self.create_2D_vector()
+        with self.assertRaises(ValueError): #NumPy raises a ValueError when writing to a read-only array
+            v.array[0] = 5
+    
+    def test_result_is_read_only(self):
+        v = self.create_2D_vector()*2
+        with self.assertRaises(ValueError):
+            v.array[0] = 5
+
+    def test_from_array(self):
+        v = Vector._from_array(np.array([1.0, 2.0]))
+        self.assertEqual(v, self.create_2D_vector())
     
+    #Tests linear algebra
+    def test_dot(self):
+        self.assertEqual(Vector(1, 2, 3).dot(Vector(4, -5, 6)), 12)
+
+    def test_matmul_is_dot(self):
+        v = self.create_2D_vector()
+        self.assertEqual(v @ Vector(3, 4), v.dot(Vector(3, 4)))
+
+    def test_dot_diff_dim(self):
+        with self.assertRaises(TypeError):
+            self.create_2D_vector().dot(Vector(1, 2, 3))
+
+    def test_norm(self):
+        self.assertEqual(Vector(3, 4).norm(), 5)
+        self.assertEqual(abs(Vector(3, 4)), 5)
+
+    def test_cross(self):
+        self.assertEqual(Vector(1, 0, 0).cross(Vector(0, 1, 0)), Vector(0, 0, 1))
+        self.assertEqual(Vector(1, 2, 3).cross(Vector(4, 5, 6)), Vector(-3, 6, -3))
+
+    def test_cross_2D_vector(self):
+        with self.assertRaises(ValueError):
+            self.create_2D_vector().cross(Vector(3, 4))
+
+    def test_angle_between(self):
+        self.assertAlmostEqual(Vector(1, 0).angle_between(Vector(0, 2)), math.pi/2)
+        self.assertEqual(Vector(1, 1).angle_between(Vector(2, 2)), 0)
+
+    def test_angle_between_zero_vector(self):
+        with self.assertRaises(ValueError):
+            Vector(0, 0).angle_between(Vector(1, 1))
+
+    def test_project_onto(self):
+        self.assertEqual(Vector(2, 3).project_onto(Vector(4, 0)), Vector(2, 0))
+
+    def test_project_onto_zero_vector(self):
+        with self.assertRaises(ValueError):
+            Vector(2, 3).project_onto(Vector(0, 0))
+
+    #Tests adding many vectors
+    def test_sum(self):
+        self.assertEqual(Vector.sum([Vector(1, 2), Vector(3, 4), Vector(-1, 0)]), Vector(3, 6))
+
+    def test_sum_generator(self):
+        self.assertEqual(Vector.sum(Vector(i, 1) for i in range(10_000)), Vector(sum(range(10_000)), 10_000))
+
+    def test_sum_empty(self):
+        with self.assertRaises(ValueError):
+            Vector.sum([])
+
+    def test_sum_diff_dim(self):
+        with self.assertRaises(TypeError):
+            Vector.sum([Vector(1, 2), Vector(1, 2, 3)])
+
+    def test_mean(self):
+        self.assertEqual(Vector.mean([Vector(1, 2), Vector(3, 4)]), Vector(2, 3))
+        self.assertEqual(Vector.mean([Vector(5), Vector(0), Vector(0)]).numbers, (5/3,)) # 5*(1/3) is not exactly 5/3
+
+
+class TestVectorAccumulator(unittest.TestCase):
+    def test_iadd(self):
+        accumulator = VectorAccumulator(2)
+        buffer = accumulator.array
+        accumulator += Vector(1, 2)
+        accumulator += Vector(3, 4)
+        self.assertEqual(accumulator.to_vector(), Vector(4, 6))
+        self.assertTrue(np.shares_memory(accumulator.array, buffer)) #The same buffer is changed in place
+
+    def test_isub(self):
+        accumulator = VectorAccumulator(2)
+        accumulator -= Vector(1, 2)
+        self.assertEqual(accumulator.to_vector(), Vector(-1, -2))
+
+    def test_imul(self):
+        accumulator = VectorAccumulator(2)
+        accumulator += Vector(1, 2)
+        accumulator *= 3
+        self.assertEqual(accumulator.to_vector(), Vector(3, 6))
+
+    def test_itruediv(self):
+        accumulator = VectorAccumulator(2)
+        accumulator += Vector(3, 6)
+        accumulator /= 3
+        self.assertEqual(accumulator.to_vector(), Vector(1, 2))
+        with self.assertRaises(ZeroDivisionError):
+            accumulator /= 0
+
+    def test_add_accumulators(self):
+        accumulator, other = VectorAccumulator(2), VectorAccumulator(2)
+        other += Vector(1, 2)
+        accumulator += other
+        accumulator += other
+        self.assertEqual(accumulator.to_vector(), Vector(2, 4))
+
+    def test_to_vector_is_copy(self):
+        accumulator = VectorAccumulator(2)
+        v = accumulator.to_vector()
+        accumulator += Vector(1, 2)
+        self.assertEqual(v, Vector(0, 0))
+
+    def test_add_sparse_vector(self):
+        accumulator = VectorAccumulator(5)
+        accumulator += SparseVector(5, [1], [4])
+        self.assertEqual(accumulator.add_all([Vector(1, 1, 1, 1, 1), SparseVector(5, [4], [2])]), 2)
+        self.assertEqual(accumulator.to_vector(), Vector(1, 5, 1, 1, 3))
+
+    def test_add_invalid_vector(self):
+        accumulator = VectorAccumulator(2)
+        with self.assertRaises(TypeError):
+            accumulator += Vector(1, 2, 3)
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            VectorAccumulator(0)
+
+
+class TestVectorBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.array = np.array([[1.0, 2.0], [3.0, 4.0], [0.0, -2.0]])
+        self.batch = VectorBatch(self.array)
+
+    def test_create_from_array_without_copy(self):
+        self.assertIs(self.batch.array, self.array)
+    
+    def test_create_invalid_batch(self):
+        with self.assertRaises(ValueError):
+            VectorBatch(np.array([1.0, 2.0])) #Only one dimension
+
+    def test_create_batch_with_str(self):
+        with self.assertRaises(TypeError):
+            VectorBatch([["1", "2"], ["3", "4"]]) #Not parsed into floats, like Vector("1", "2")
+
+    def test_getitem(self):
+        self.assertEqual(self.batch[1], Vector(3, 4))
+        self.assertEqual(self.batch[1:], VectorBatch(self.array[1:]))
+        self.assertEqual(self.batch[[0, 2]], VectorBatch(self.array[[0, 2]]))
+        self.assertEqual(self.batch[self.array[:, 0] > 0], VectorBatch(self.array[:2]))
+        self.assertIsInstance(self.batch[np.int64(0)], Vector)
+    
+    def test_from_vectors(self):
+        batch = VectorBatch.from_vectors([Vector(1, 2), Vector(3, 4), Vector(0, -2)])
+        self.assertEqual(batch, self.batch)
+
+    def test_from_vectors_diff_dim(self):
+        with self.assertRaises(TypeError):
+            VectorBatch.from_vectors([Vector(1, 2), Vector(1, 2, 3)])
+
+    def test_to_vectors_are_views(self):
+        vectors = self.batch.to_vectors()
+        self.assertEqual(vectors[1], Vector(3, 4))
+        self.assertTrue(np.shares_memory(vectors[1].array, self.array))
+
+    def test_add_batches(self):
+        self.assertEqual(self.batch + self.batch, VectorBatch(self.array*2))
+
+    def test_subtract_vector(self):
+        self.assertEqual(self.batch - Vector(1, 2), VectorBatch(self.array - [1, 2]))
+
+    def test_multiply_scalar_batch(self):
+        self.assertEqual(3*self.batch, VectorBatch(self.array*3))
+
+    def test_dot(self):
+        self.assertEqual(self.batch.dot(Vector(1, 1)).tolist(), [3, 7, -2])
+
+    def test_norm(self):
+        self.assertEqual(self.batch.norm()[1], 5)
+
+    def test_normalize(self):
+        np.testing.assert_allclose(self.batch.normalize().norm(), 1)
+
+    def test_normalize_zero_vector(self):
+        with self.assertRaises(ValueError):
+            VectorBatch([[0, 0]]).normalize()
+
+    def test_pairwise_distances(self):
+        distances = self.batch.pairwise_distances()
+        self.assertEqual(distances.shape, (3, 3))
+        self.assertEqual(distances[0, 1], np.hypot(2, 2))
+        self.assertEqual(distances[2, 2], 0)
+
+    def test_pairwise_distances_many_dimensions(self):
+        batch = VectorBatch(np.random.default_rng(0).normal(size=(5, 10)))
+        expected = [[np.linalg.norm(a - b) for b in batch.array] for a in batch.array]
+        np.testing.assert_allclose(batch.pairwise_distances(), expected, atol=1e-7)
+
+    def test_get_item(self):
+        self.assertEqual(self.batch[0], Vector(1, 2))
+        self.assertEqual(len(self.batch[1:]), 2)
+
+    def test_plot_vectors_accepts_batch(self):
+        plot_vectors = PlotVectors(self.batch, Vector(5, 5))
+        self.assertEqual(plot_vectors.X.tolist(), [1, 3, 0, 5])
+
+
+class TestSparseVector(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sparse = SparseVector(5, [3, 1], [2, 4])
+        self.dense = Vector(0, 4, 0, 2, 0) #The same numbers as self.sparse
+
+    def test_create_sparse_vector(self):
+        self.assertEqual(self.sparse.indices.tolist(), [1, 3]) #The indices are sorted
+        self.assertEqual(self.sparse.numbers, self.dense.numbers)
+
+    def test_zeros_are_not_stored(self):
+        self.assertEqual(len(SparseVector(5, [0, 1], [0, 3]).values), 1)
+
+    def test_empty_vector(self):
+        with self.assertRaises(ValueError):
+            SparseVector(0)
+
+    def test_create_invalid_vector(self):
+        with self.assertRaises(TypeError):
+            SparseVector(5, [1], ["Two"])
+
+    def test_index_out_of_range(self):
+        with self.assertRaises(ValueError):
+            SparseVector(5, [5], [1])
+
+    def test_duplicate_indices(self):
+        with self.assertRaises(ValueError):
+            SparseVector(5, [1, 1], [1, 2])
+
+    def test_from_dict(self):
+        self.assertEqual(SparseVector.from_dict(5, {3: 2, 1: 4}), self.sparse)
+
+    def test_from_dense(self):
+        self.assertEqual(SparseVector.from_dense(self.dense), self.sparse)
+
+    def test_len(self):
+        self.assertEqual(len(SparseVector(1_000_000)), 1_000_000)
+
+    def test_get_item(self):
+        for i in range(-5, 5):
+            self.assertEqual(self.sparse[i], self.dense[i])
+
+    def test_get_item_slice(self):
+        self.assertEqual(self.sparse[1:4], self.dense[1:4])
+        self.assertEqual(self.sparse[::-2], self.dense[::-2])
+
+    def test_get_item_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.sparse[5]
+
+    def test_get_item_index_types(self):
+        self.assertEqual(self.sparse[np.int64(1)], self.dense[1])
+        for item in (1.5, "a", None, True):
+            with self.assertRaises(TypeError):
+                self.sparse[item]
+
+    def test_add_sparse_vectors(self):
+        v = self.sparse + SparseVector(5, [0, 1], [1, -4])
+        self.assertIsInstance(v, SparseVector)
+        self.assertEqual(v, Vector(1, 0, 0, 2, 0))
+        self.assertEqual(v.indices.tolist(), [0, 3]) #4 - 4 = 0 is not stored
+
+    def test_add_sparse_and_dense(self):
+        dense = Vector(1, 1, 1, 1, 1)
+        self.assertEqual(self.sparse + dense, Vector(1, 5, 1, 3, 1))
+        self.assertEqual(dense + self.sparse, Vector(1, 5, 1, 3, 1))
+
+    def test_subtract_sparse_and_dense(self):
+        dense = Vector(1, 1, 1, 1, 1)
+        self.assertEqual(self.sparse - dense, Vector(-1, 3, -1, 1, -1))
+        self.assertEqual(dense - self.sparse, Vector(1, -3, 1, -1, 1))
+        self.assertEqual(self.sparse - self.sparse, SparseVector(5))
+
+    def test_multiply_scalar(self):
+        self.assertEqual(2*self.sparse, self.dense*2)
+        self.assertIsInstance(self.sparse*2, SparseVector)
+
+    def test_equal_sparse_and_dense(self):
+        self.assertEqual(self.sparse, self.dense)
+        self.assertEqual(self.dense, self.sparse)
+        self.assertNotEqual(self.sparse, Vector(0, 4, 0, 2, 1))
+
+    def test_diff_dim(self):
+        with self.assertRaises(TypeError):
+            self.sparse + Vector(1, 2)
+
+    def test_dense_methods(self):
+        self.assertEqual(self.sparse.dot(self.dense), 20)
+        self.assertEqual(abs(self.sparse), abs(self.dense))
+
+
+class TestPlotVectors(unittest.TestCase):
+    def setUp(self) -> None:
+        self.array = np.random.default_rng(0).normal(size=(1000, 2))
+
+    def test_limits_include_all_vectors(self):
+        (lowest_x, highest_x), (lowest_y, highest_y) = PlotVectors(Vector(-20, 30)).limits()
+        self.assertTrue(lowest_x < -20 and highest_x > 0 and lowest_y < 0 and highest_y > 30)
+
+    def test_limits_include_tails(self):
+        (lowest_x, highest_x), _ = PlotVectors(Vector(1, 1), tails=(100, 0)).limits()
+        self.assertGreater(highest_x, 101)
+
+    def test_title_is_truncated(self):
+        title = PlotVectors(self.array).title()
+        self.assertTrue(title.endswith("(1000 vectors)"))
+        self.assertLess(len(title), 300)
+
+    def test_title_few_vectors(self):
+        self.assertEqual(PlotVectors(Vector(1, 2), (3, 4)).title(), "Vectors: (1.0, 2.0) (3.0, 4.0)")
+
+    def test_tails_per_vector(self):
+        plot_vectors = PlotVectors(self.array, tails=self.array)
+        self.assertEqual(plot_vectors.originX.tolist(), self.array[:, 0].tolist())
+
+    def test_invalid_vectors(self):
+        with self.assertRaises(ValueError):
+            PlotVectors(np.zeros((5, 1)))
+
+    def test_density_image_draws_line(self):
+        image = PlotVectors((1, 0)).density_image(64) #x from -0.1 to 1.1 and y from -1 to 1
+        self.assertEqual(image.shape, (64, 64))
+        self.assertEqual(image[32].sum(), image.sum()) #All pixels of the line are in the middle row
+        self.assertEqual((image[32] > 0).sum(), 54) #The line is 1/1.2 of the 64 pixels wide
+
+    def test_density_image_chunks(self):
+        vectors = PlotVectors(np.random.default_rng(0).uniform(-1, 1, (300, 2)))
+        expected = vectors.density_image(64)
+        vectors.CHUNK_SAMPLES = 100 #Chunks of a few lines (and one line if it has more points)
+        self.assertTrue((vectors.density_image(64) == expected).all())
+
+    def test_save_without_window(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for density in (False, True):
+                path = os.path.join(directory, f"vectors_{density}.png")
+                PlotVectors(self.array).plot(path, density=density)
+                self.assertTrue(os.path.getsize(path) > 0)
+
 
 #If this is true, run unittest.main()
 #We can run Python code as a stand alone script (it will get the value __main__)
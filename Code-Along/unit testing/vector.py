@@ -1,11 +1,17 @@
 from plotter import PlotVectors
+import numpy as np
+import math
+import operator
 
 #Run unit testing after creating a function and check if it works
 #When updating the code it should pass the same unit tests
 
-class Vector: 
+class Vector:
     """ A class to represent a Euclidean vector with magnitude and direction"""
 
+    # vectors up to this length are faster to calculate with Python floats than with NumPy (in norm and angle_between)
+    FAST_PATH_LENGTH = 16
+
     def __init__(self, *numbers: float) -> None:
         #print(numbers)
         for number in numbers:
@@ -15,78 +21,259 @@ class Vector:
         if len(numbers) <= 0:
             raise ValueError("Vectors can't be empty")
 
-        self._numbers = tuple(float(number) for number in numbers)
+        # the numbers are stored in a read-only NumPy array, so + - * work on all numbers at once
+        self._array = np.array(numbers, dtype=float)
+        self._array.flags.writeable = False
+
+    @classmethod
+    def _from_array(cls, array: np.ndarray) -> "Vector":
+        """Creates a Vector from a 1D float array without validating it again (used for results of operations)"""
+        vector = cls.__new__(cls)
+        vector._array = array
+        vector._array.flags.writeable = False
+        return vector
 
     @property
     def numbers(self) -> tuple:
         """Read only property that returns the numbers"""
-        return self._numbers
+        return tuple(self._array.tolist())
+
+    @property
+    def array(self) -> np.ndarray:
+        """Read only property that returns the numbers as a read-only NumPy array (without copying)"""
+        return self._array
 
     # (2,3) + (1,1,1) not okay
     # (2,3) + (1,1) = (3,4)
     def __add__(self, other: "Vector") -> "Vector": # overloads the + operator
         """Adds two vectors of same dimensions using + operator"""
         if self.validate_vectors(other):
-            numbers = (a+b for a,b in zip(self.numbers, other.numbers))
-            return Vector(*numbers)
+            return Vector._from_array(self._array + other._array)
 
     def __sub__(self, other: "Vector") -> "Vector":
-        """Adds two vectors of same dimensions using + operator"""
+        """Subtracts two vectors of same dimensions using - operator"""
         if self.validate_vectors(other):
-            numbers = (a-b for a,b in zip(self.numbers, other.numbers))
-            return Vector(*numbers)
+            return Vector._from_array(self._array - other._array)
 
     def __mul__(self, value: float) -> "Vector":
-        print("__mul__ called ...")
         if not isinstance(value, (float, int)):
             raise TypeError(f"Value must be float or int not {type(value)}")
-        
-        numbers = (value*a for a in self.numbers)
-        return Vector(*numbers)
+
+        return Vector._from_array(self._array*value)
 
     def __rmul__(self, value: float) -> "Vector":
-        print("__rmul__ called")
         return self*value
 
+    def dot(self, other: "Vector") -> float:
+        """Returns the dot product of two vectors of same dimensions"""
+        if self.validate_vectors(other):
+            return float(self._array @ other._array)
+
+    # @ operator, v1 @ v2 is the dot product
+    def __matmul__(self, other: "Vector") -> float:
+        return self.dot(other)
+
+    def norm(self) -> float:
+        """Returns the Euclidean length of the vector"""
+        if len(self._array) <= Vector.FAST_PATH_LENGTH:
+            return math.hypot(*self._array.tolist())
+        return math.sqrt(self._array @ self._array)
+
+    # abs() function
+    def __abs__(self) -> float:
+        return self.norm()
+
+    def cross(self, other: "Vector") -> "Vector":
+        """Returns the cross product of two 3D vectors"""
+        if len(self) != 3:
+            raise ValueError(f"The cross product is only defined for 3D vectors not {len(self)}D")
+        if self.validate_vectors(other):
+            # three numbers are faster to calculate with Python floats than with np.cross
+            (x1, y1, z1), (x2, y2, z2) = self._array.tolist(), other._array.tolist()
+            return Vector._from_array(np.array([y1*z2 - z1*y2, z1*x2 - x1*z2, x1*y2 - y1*x2]))
+
+    def angle_between(self, other: "Vector") -> float:
+        """Returns the angle between two vectors of same dimensions in radians (0 to pi)"""
+        self.validate_vectors(other)
+        length, other_length = self.norm(), other.norm()
+        if length == 0 or other_length == 0:
+            raise ValueError("The angle is not defined for vectors with length 0")
+        # 2*atan2(|a|b| - b|a||, |a|b| + b|a||) is exact also for small angles, where acos(cosine) loses precision
+        if len(self._array) <= Vector.FAST_PATH_LENGTH:
+            pairs = list(zip(self._array.tolist(), other._array.tolist()))
+            difference = math.hypot(*[a*other_length - b*length for a, b in pairs])
+            total = math.hypot(*[a*other_length + b*length for a, b in pairs])
+            return 2*math.atan2(difference, total)
+        scaled, other_scaled = self._array*other_length, other._array*length
+        difference, total = scaled - other_scaled, scaled + other_scaled
+        return 2*math.atan2(math.sqrt(difference @ difference), math.sqrt(total @ total))
+
+    def project_onto(self, other: "Vector") -> "Vector":
+        """Returns the projection of the vector onto other (the part of the vector in the direction of other)"""
+        self.validate_vectors(other)
+        squared_length = other.dot(other)
+        if squared_length == 0:
+            raise ValueError("Can't project onto a vector with length 0")
+        return Vector._from_array(other._array*(self.dot(other)/squared_length))
+
     # len() function
     def __len__(self) -> int:
         """Returns number of components in a Vector not the Euclidean length"""
-        return len(self.numbers)
+        return len(self._array)
 
     def validate_vectors(self, other: "Vector") -> bool:
         """ Validate that two vectors have same dimensions """
-        if not isinstance(other, Vector) or len(other) != len(self):
+        # the arrays are compared directly, since len() on the vectors is slower (this is called in every operation)
+        if not isinstance(other, Vector) or len(other._array) != len(self._array):
             raise TypeError("Both must be Vector and same length")
-        return len(self) == len(other)
+        return True
 
     def __repr__(self) -> str:
         return f"Vector{self.numbers}"
-    
+
     def __str__(self) -> str:
         return f"{self.numbers}"
 
-    # [] operator
+    # [] operator, the index is checked as in a tuple (TypeError for v['a'] and v[1.5], v[True] is v[1]) before the array is used
     def __getitem__(self, item: int) -> float:
-        return self.numbers[item]
+        if isinstance(item, slice):
+            return tuple(self._array[item].tolist())
+        return float(self._array[operator.index(item)])
 
     def __eq__(self, other) -> bool:
         if not self.validate_vectors(other):
             return False
-        
-        for num1, num2 in zip(self.numbers, other.numbers):
-            if num1 != num2:
-                return False
-        
-        return True
 
-    def plot(self, *others: "Vector") -> None:
+        return bool((self._array == other._array).all())
+
+    @staticmethod
+    def sum(vectors) -> "Vector":
+        """Returns the sum of Vectors of same dimensions, added in place into one array (no Vector is created per addition)"""
+        accumulator, _ = VectorAccumulator._fold(vectors)
+        return Vector._from_array(accumulator._buffer)
+
+    @staticmethod
+    def mean(vectors) -> "Vector":
+        """Returns the mean of Vectors of same dimensions, added in place into one array"""
+        accumulator, count = VectorAccumulator._fold(vectors)
+        accumulator /= count
+        return Vector._from_array(accumulator._buffer)
+
+    def _add_into(self, buffer: np.ndarray, sign: int) -> None:
+        """Adds (sign 1) or subtracts (sign -1) the numbers to a buffer array in place"""
+        if sign > 0:
+            np.add(buffer, self._array, out=buffer)
+        else:
+            np.subtract(buffer, self._array, out=buffer)
+
+    def plot(self, *others: "Vector", path: str = None) -> None:
+        """Plots the vectors in a window, or in an image file if path is given"""
         # TODO: error checking
 
         # composition -> Vector has a PlotVectors object
         plot_vector = PlotVectors(self, *others)
-        
-        plot_vector.plot()
 
+        plot_vector.plot(path)
+
+
+class VectorAccumulator:
+    """ A mutable vector for adding many Vectors in place, with += -= *= and /= (the numbers are stored in one buffer array)"""
+
+    # dense Vectors in add_all are summed this many at a time
+    CHUNK_SIZE = 4096
+
+    def __init__(self, length: int) -> None:
+        if not isinstance(length, int) or length <= 0:
+            raise ValueError(f"Length must be an int above 0 not {length}")
+
+        self._buffer = np.zeros(length)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Read only property that returns a read-only view of the buffer (without copying)"""
+        view = self._buffer.view()
+        view.flags.writeable = False
+        return view
+
+    def to_vector(self) -> Vector:
+        """Returns the current numbers as a Vector (a copy, so the accumulator can still be changed)"""
+        return Vector._from_array(self._buffer.copy())
+
+    # += operator, changes the accumulator instead of creating a new object
+    def __iadd__(self, other) -> "VectorAccumulator":
+        self._add(other, 1)
+        return self
+
+    def __isub__(self, other) -> "VectorAccumulator":
+        self._add(other, -1)
+        return self
+
+    def __imul__(self, value: float) -> "VectorAccumulator":
+        if not isinstance(value, (float, int)):
+            raise TypeError(f"Value must be float or int not {type(value)}")
+
+        self._buffer *= value
+        return self
+
+    def __itruediv__(self, value: float) -> "VectorAccumulator":
+        if not isinstance(value, (float, int)):
+            raise TypeError(f"Value must be float or int not {type(value)}")
+        if value == 0:
+            raise ZeroDivisionError("Can not divide by 0")
+
+        self._buffer /= value
+        return self
+
+    def add_all(self, vectors) -> int:
+        """Adds all Vectors of an iterable and returns the number of Vectors"""
+        count, chunk, length = 0, [], len(self._buffer)
+        for count, vector in enumerate(vectors, 1):
+            if type(vector) is Vector and len(vector._array) == length:
+                # dense Vectors are collected and summed a chunk at a time, which is faster than one NumPy call per Vector
+                chunk.append(vector._array)
+                if len(chunk) == self.CHUNK_SIZE:
+                    self._buffer += np.sum(chunk, axis=0)
+                    chunk.clear()
+            else:
+                self._validate_vector(vector)
+                vector._add_into(self._buffer, 1) # e.g. a SparseVector, which only adds its non-zero numbers
+        if chunk:
+            self._buffer += np.sum(chunk, axis=0)
+        return count
+
+    # len() function
+    def __len__(self) -> int:
+        """Returns number of components"""
+        return len(self._buffer)
+
+    def __repr__(self) -> str:
+        return f"VectorAccumulator{tuple(self._buffer.tolist())}"
+
+    def _add(self, other, sign: int) -> None:
+        if isinstance(other, VectorAccumulator) and len(other) == len(self):
+            self._buffer += sign*other._buffer
+            return
+        self._validate_vector(other)
+        other._add_into(self._buffer, sign)
+
+    def _validate_vector(self, other) -> None:
+        """ Validate that other is a Vector with same dimensions """
+        if not isinstance(other, Vector) or len(other) != len(self._buffer):
+            raise TypeError("Both must be Vector and same length")
+
+    @classmethod
+    def _fold(cls, vectors) -> tuple:
+        """Adds all Vectors of an iterable into a new accumulator and returns (accumulator, number of Vectors)"""
+        vectors = iter(vectors)
+        first = next(vectors, None)
+        if first is None:
+            raise ValueError("Can't add an empty iterable of Vectors")
+        if not isinstance(first, Vector):
+            raise TypeError(f"{first} must be a Vector not {type(first)}")
+
+        accumulator = cls(len(first))
+        accumulator += first
+        return accumulator, 1 + accumulator.add_all(vectors)
 
 
-# v1 = (1,1), v2=(1,1,14,5,252,56,2,7) 
+# v1 = (1,1), v2=(1,1,14,5,252,56,2,7)
@@ -0,0 +1,137 @@
+from vector import Vector
+from plotter import PlotVectors
+import numpy as np
+
+class VectorBatch:
+    """ A class to represent many Euclidean vectors of same dimensions, stored as one N x D array (one row per vector)"""
+
+    def __init__(self, array) -> None:
+        # np.asarray does not copy an array that already is a 2D float array
+        try:
+            array = np.asarray(array)
+        except (TypeError, ValueError):
+            raise TypeError(f"{array} must be an N x D array of floats or ints")
+        # checked before the cast, since dtype=float would parse strings like "1"
+        if array.dtype.kind not in "iuf":
+            raise TypeError(f"The array must contain floats or ints not {array.dtype}")
+        array = array.astype(float, copy=False)
+
+        if array.ndim != 2:
+            raise ValueError(f"The array must have 2 dimensions (N x D) not {array.ndim}")
+        if array.shape[1] <= 0:
+            raise ValueError("Vectors can't be empty")
+
+        self._array = array
+
+    @classmethod
+    def from_vectors(cls, vectors: list) -> "VectorBatch":
+        """Creates a VectorBatch from Vectors of same dimensions (the numbers are copied into one array)"""
+        vectors = list(vectors)
+        if not all(isinstance(vector, Vector) for vector in vectors):
+            raise TypeError("All must be Vector")
+        if len({len(vector) for vector in vectors}) > 1:
+            raise TypeError("All Vectors must have same length")
+        if not vectors:
+            raise ValueError("Can't create a VectorBatch without Vectors")
+
+        return cls(np.stack([vector.array for vector in vectors]))
+
+    @property
+    def array(self) -> np.ndarray:
+        """Read only property that returns the N x D array (without copying)"""
+        return self._array
+
+    @property
+    def dimensions(self) -> int:
+        """Read only property that returns the number of components in every vector"""
+        return self._array.shape[1]
+
+    def to_vectors(self) -> list:
+        """Returns a list of Vectors, which are read-only views of the rows (the numbers are not copied)"""
+        return [Vector._from_array(row) for row in self._array]
+
+    # (N x 2) + (N x 2) = (N x 2), and (N x 2) + Vector(1, 1) adds (1, 1) to all vectors
+    def __add__(self, other) -> "VectorBatch":
+        """Adds vectors of same dimensions using + operator"""
+        return VectorBatch(self._array + self._other_array(other))
+
+    def __sub__(self, other) -> "VectorBatch":
+        """Subtracts vectors of same dimensions using - operator"""
+        return VectorBatch(self._array - self._other_array(other))
+
+    def __mul__(self, value: float) -> "VectorBatch":
+        if not isinstance(value, (float, int)):
+            raise TypeError(f"Value must be float or int not {type(value)}")
+
+        return VectorBatch(self._array*value)
+
+    def __rmul__(self, value: float) -> "VectorBatch":
+        return self*value
+
+    def dot(self, other) -> np.ndarray:
+        """Returns the dot product of every vector with the vector on the same row of other (or with one Vector)"""
+        return np.einsum("ij,ij->i", self._array, np.broadcast_to(self._other_array(other), self._array.shape))
+
+    def norm(self) -> np.ndarray:
+        """Returns the Euclidean length of every vector"""
+        return np.sqrt(np.einsum("ij,ij->i", self._array, self._array))
+
+    def normalize(self) -> "VectorBatch":
+        """Returns the vectors scaled to the Euclidean length 1"""
+        norms = self.norm()
+        if not norms.all():
+            raise ValueError("Can't normalize vectors with length 0")
+
+        return VectorBatch(self._array/norms[:, np.newaxis])
+
+    def pairwise_distances(self, other: "VectorBatch" = None) -> np.ndarray:
+        """Returns an N x M array with the Euclidean distance from every vector to every vector in other (or in self)"""
+        other_array = self._array if other is None else self._other_array(other, batch_only=True)
+        if self.dimensions <= 3:
+            # few dimensions: the squared differences are added one axis at a time, which is exact
+            squared = np.zeros((len(self._array), len(other_array)))
+            for axis in range(self.dimensions):
+                squared += np.subtract.outer(self._array[:, axis], other_array[:, axis])**2
+        else:
+            # many dimensions: |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, where a.b of all pairs is one matrix product
+            squared = (self._array**2).sum(axis=1)[:, np.newaxis] + (other_array**2).sum(axis=1) - 2*self._array @ other_array.T
+            np.maximum(squared, 0, out=squared) # rounding can give tiny negative numbers
+        return np.sqrt(squared)
+
+    # len() function
+    def __len__(self) -> int:
+        """Returns number of vectors"""
+        return len(self._array)
+
+    # [] operator, batch[0] is a Vector, and batch[1:3], batch[[0, 2]] or batch[mask] are a VectorBatch (a slice without copying)
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)) and not isinstance(item, bool):
+            return Vector._from_array(self._array[item])
+
+        array = self._array[item]
+        if array.ndim != 2:
+            raise TypeError(f"Index must be int, slice, list of ints or bool mask not {type(item)}")
+        return VectorBatch(array)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, VectorBatch) or other._array.shape != self._array.shape:
+            raise TypeError("Both must be VectorBatch and same shape")
+
+        return bool((self._array == other._array).all())
+
+    def __repr__(self) -> str:
+        return f"VectorBatch({len(self)} vectors, {self.dimensions} dimensions)"
+
+    def plot(self, path: str = None, tails=None) -> None:
+        """Plots the vectors in a window, or in an image file if path is given (see PlotVectors)"""
+        PlotVectors(self, tails=tails).plot(path)
+
+    def _other_array(self, other, batch_only: bool = False) -> np.ndarray:
+        """ Validate that other is a VectorBatch (or a Vector) with same dimensions and return its array """
+        if isinstance(other, VectorBatch) and other._array.shape[1] == self.dimensions:
+            if not batch_only and len(other) != len(self):
+                raise TypeError("Both VectorBatch must have same number of vectors")
+            return other._array
+        if not batch_only and isinstance(other, Vector) and len(other) == self.dimensions:
+            return other.array
+        raise TypeError("Both must be VectorBatch (or Vector) and same dimensions")
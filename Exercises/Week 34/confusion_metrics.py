@@ -0,0 +1,168 @@
+import csv
+import itertools
+import numpy as np
+
+#Streaming versions of compute_accuracy (exercise00-2) and accuracy (exercise00-3): the counts are added up one chunk
+#of predictions at a time, so any number of predictions can be used, and the metrics can be read at any point.
+
+def compute_accuracy(correct, total):
+    """Arg 1 takes the number of correct predictions and arg 2 takes the total number of predictions.
+    The method returns the accuracy as a number between 0 (0%) and 1 (100%), or nan if there are no predictions."""
+    return correct/total if total else float("nan")
+
+def accuracy(tp, fp, fn, tn):
+    """Arg 1 takes the number of true positives. Arg 2 takes the number of false positives.
+    Arg 3 takes the number of false negatives. Arg 4 takes the number of true negatives.
+    The method returns the accuracy of the model."""
+    return compute_accuracy(tp + tn, tp + tn + fp + fn)
+
+def precision(tp, fp):
+    """Takes the number of true positives and false positives.
+    The method returns the share of the positive predictions that are correct (nan if there are none)."""
+    return compute_accuracy(tp, tp + fp)
+
+def recall(tp, fn):
+    """Takes the number of true positives and false negatives.
+    The method returns the share of the positives that are found (nan if there are none)."""
+    return compute_accuracy(tp, tp + fn)
+
+def f1(tp, fp, fn):
+    """Takes the number of true positives, false positives and false negatives.
+    The method returns the harmonic mean of precision and recall (nan if there are no positives at all)."""
+    return compute_accuracy(2*tp, 2*tp + fp + fn)
+
+
+class ConfusionMatrix:
+    """Counts the true/false positives and negatives of a binary model, one chunk of (y_true, y_pred) at a time.
+    Only the four counts are kept, so the memory is the same for a thousand or a billion predictions.
+    Matrices from different processes (e.g. one per file) can be added together with + or merge()."""
+
+    def __init__(self, positive=1):
+        """positive is the label of the positive class, all other labels are negative."""
+        self.positive = positive
+        self._counts = np.zeros(4, dtype=np.int64) #tn, fp, fn, tp (the index is 2*true + predicted)
+
+    @classmethod
+    def from_counts(cls, tp, fp, fn, tn, positive=1):
+        """Creates a matrix from counts that are already added up (like the arguments of accuracy)."""
+        matrix = cls(positive)
+        matrix._counts[:] = (tn, fp, fn, tp)
+        return matrix
+
+    @classmethod
+    def merge(cls, matrices):
+        """Returns one matrix with the counts of all matrices (e.g. the partial results of worker processes)."""
+        matrices = list(matrices)
+        if not matrices:
+            raise ValueError("There must be at least one matrix to merge.")
+        merged = cls(matrices[0].positive)
+        for matrix in matrices:
+            merged += matrix
+        return merged
+
+    def update(self, y_true, y_pred):
+        """Adds a chunk of true labels and predicted labels (arrays of the same length). Returns the matrix."""
+        y_true, y_pred = np.asarray(y_true), np.asarray(y_pred)
+        if y_true.shape != y_pred.shape:
+            raise ValueError(f"y_true and y_pred must have the same shape, not {y_true.shape} and {y_pred.shape}.")
+        #Text labels are never equal to a number (and the other way around), then every label would be counted as negative
+        kinds = "UO" if isinstance(self.positive, str) else "biufO"
+        for labels in (y_true, y_pred):
+            if labels.size and labels.dtype.kind not in kinds:
+                raise TypeError(f"The labels ({labels.dtype}) can not be equal to the positive label {self.positive!r}.")
+
+        #The comparisons give new bool arrays, which are changed in place into the index 2*true + predicted (0-3)
+        index = (y_true == self.positive).ravel().view(np.uint8)
+        index <<= 1
+        index |= (y_pred == self.positive).ravel().view(np.uint8)
+        self._counts += np.bincount(index, minlength=4)
+        return self
+
+    def update_csv(self, path, true_column="y_true", pred_column="y_pred", chunk_rows=1_000_000, delimiter=","):
+        """Adds the predictions in a CSV file, chunk_rows rows at a time. The columns are names in the first row
+        of the file, or numbers (then the file has no header). Quoted fields can be used and blank lines are skipped.
+        Returns the matrix."""
+        if not isinstance(chunk_rows, int) or isinstance(chunk_rows, bool) or chunk_rows <= 0:
+            raise ValueError(f"chunk_rows must be an int above 0, not {chunk_rows}.")
+        #Numeric labels are read as numbers (so "1" and "1.0" are the same), other labels as text
+        dtype = str if isinstance(self.positive, str) else float
+        with open(path, encoding="utf-8", newline="") as file:
+            reader = csv.reader(file, delimiter=delimiter)
+            if isinstance(true_column, str) or isinstance(pred_column, str):
+                header = next(reader, None)
+                if header is None:
+                    raise ValueError(f"The CSV file {path} is empty, so it has no header.")
+                header = [name.strip() for name in header]
+                true_column, pred_column = (header.index(column) if isinstance(column, str) else column for column in (true_column, pred_column))
+
+            while rows := list(itertools.islice(reader, chunk_rows)):
+                rows = [row for row in rows if any(field.strip() for field in row)]
+                if rows:
+                    self.update(*(np.array([row[column].strip() for row in rows], dtype=dtype) for column in (true_column, pred_column)))
+        return self
+
+    @property
+    def tp(self):
+        return int(self._counts[3])
+
+    @property
+    def fp(self):
+        return int(self._counts[1])
+
+    @property
+    def fn(self):
+        return int(self._counts[2])
+
+    @property
+    def tn(self):
+        return int(self._counts[0])
+
+    def __len__(self):
+        """Returns the number of predictions that have been added."""
+        return int(self._counts.sum())
+
+    def accuracy(self):
+        return accuracy(self.tp, self.fp, self.fn, self.tn)
+
+    def precision(self):
+        return precision(self.tp, self.fp)
+
+    def recall(self):
+        return recall(self.tp, self.fn)
+
+    def f1(self):
+        return f1(self.tp, self.fp, self.fn)
+
+    def metrics(self):
+        """Returns accuracy, precision, recall and f1 in a dict."""
+        return {"accuracy": self.accuracy(), "precision": self.precision(), "recall": self.recall(), "f1": self.f1()}
+
+    def __iadd__(self, other):
+        if not isinstance(other, ConfusionMatrix) or other.positive != self.positive:
+            raise TypeError("Only matrices with the same positive label can be added.")
+        self._counts += other._counts
+        return self
+
+    def __add__(self, other):
+        return ConfusionMatrix.merge([self, other])
+
+    def __eq__(self, other):
+        return isinstance(other, ConfusionMatrix) and other.positive == self.positive and bool((other._counts == self._counts).all())
+
+    def __repr__(self):
+        return f"ConfusionMatrix(tp={self.tp}, fp={self.fp}, fn={self.fn}, tn={self.tn})"
+
+
+if __name__ == "__main__":
+    #The fire prediction model of exercise00-3, with the predictions added in chunks
+    y_true = np.repeat([1, 0, 1, 0], [2, 2, 11, 985])
+    y_pred = np.repeat([1, 1, 0, 0], [2, 2, 11, 985])
+    matrix = ConfusionMatrix()
+    for start in range(0, len(y_true), 100):
+        matrix.update(y_true[start:start + 100], y_pred[start:start + 100])
+    print(matrix)
+    print(f"The accuracy of the fire prediction model is: {matrix.accuracy():.3f}, but the recall is only {matrix.recall():.3f}.")
+
+    #Partial results (e.g. from worker processes) are merged into the same counts
+    halves = [ConfusionMatrix().update(y_true[part], y_pred[part]) for part in (slice(0, 500), slice(500, None))]
+    print(f"The merged matrix is the same: {ConfusionMatrix.merge(halves) == matrix}.")
@@ -0,0 +1,138 @@
+import numpy as np
+
+#Batched versions of count_hypothenuse (exercise00-1), count_slope and count_m (exercise00-4) and eucl_dist (exercise00-5 and 00-6).
+#Every function takes arrays of many points (one point per row) and computes all of them in one call.
+
+def _points(points, name):
+    """Returns points as a 2D float array with one point per row (one point can be given as a 1D array)."""
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 1:
+        points = points[np.newaxis]
+    if points.ndim != 2 or points.shape[1] == 0:
+        raise ValueError(f"{name} must have one point per row, not the shape {points.shape}.")
+    return points
+
+def _pairs(points1, points2, dimensions=None):
+    """Returns two arrays of points with the same shape (and the number of dimensions if it is given)."""
+    points1, points2 = _points(points1, "points1"), _points(points2, "points2")
+    if points1.shape != points2.shape:
+        raise ValueError(f"points1 and points2 must have the same shape, not {points1.shape} and {points2.shape}.")
+    if dimensions is not None and points1.shape[1] != dimensions:
+        raise ValueError(f"The points must have {dimensions} coordinates, not {points1.shape[1]}.")
+    return points1, points2
+
+def hypothenuses(cathetus1, cathetus2):
+    """Arg 1 takes the lengths of cathetus 1. Arg 2 takes the lengths of cathetus 2 (arrays, or one number for all).
+    The method returns the lengths of the hypothenuses."""
+    return np.hypot(cathetus1, cathetus2) #No overflow for very large sides, which cathetus1**2 could give
+
+def row_distances(points1, points2):
+    """Takes two arrays with one point (2D, 3D or nD) per row.
+    The method returns the euclidean distance between the points in the same row."""
+    points1, points2 = _pairs(points1, points2)
+    difference = points2 - points1
+    return np.sqrt(np.einsum("ij,ij->i", difference, difference)) #Sums the squares of every row without another array
+
+def slopes(points1, points2):
+    """Takes two arrays with one point (x, y) per row.
+    The method returns the k-value/slope of the line through the points in the same row (inf or nan for vertical lines)."""
+    points1, points2 = _pairs(points1, points2, dimensions=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (points2[:, 1] - points1[:, 1])/(points2[:, 0] - points1[:, 0])
+
+def intercepts(points1, points2, slope=None):
+    """Takes two arrays with one point (x, y) per row, and the slopes if they are already computed.
+    The method returns the m-value of the line through the points in the same row."""
+    points1 = _points(points1, "points1")
+    if slope is None:
+        slope = slopes(points1, points2)
+    with np.errstate(invalid="ignore"):
+        return points1[:, 1] - slope*points1[:, 0]
+
+def lines(points1, points2):
+    """Takes two arrays with one point (x, y) per row.
+    The method returns (k-values, m-values), the slope is computed once and used for the m-value."""
+    slope = slopes(points1, points2)
+    return slope, intercepts(points1, points2, slope)
+
+def distance_blocks(points, other=None, block_size=None):
+    """Arg 1 takes an array with one point per row. Arg 2 takes another array of points (if None, points is used).
+    The method yields (start, block), where block has the distances from the rows start to start + block_size
+    of points to all the points in other (if block_size is None, it is chosen from the length of other).
+    Only one block is kept in memory (block_size*len(other) numbers),
+    the same array is used for every block, so it must be used (or copied) before the next block."""
+    points = _points(points, "points")
+    other = points if other is None else _points(other, "other")
+    if points.shape[1] != other.shape[1]:
+        raise ValueError(f"The points must have the same number of coordinates, not {points.shape[1]} and {other.shape[1]}.")
+    if block_size is None:
+        block_size = max(1, 2**18//max(len(other), 1)) #A block of about 2 MB fits in the cache of the processor
+    if not isinstance(block_size, int) or block_size <= 0:
+        raise ValueError(f"block_size must be an int above 0, not {block_size}.")
+
+    squared_other = np.einsum("ij,ij->i", other, other)
+    #The arrays are made once and used again for every block (a new array of this size for every block is slow)
+    buffer, difference_buffer = np.empty((min(block_size, len(points)), len(other))), np.empty((min(block_size, len(points)), len(other)))
+    for start in range(0, len(points), block_size):
+        block = points[start:start + block_size]
+        distances, difference = buffer[:len(block)], difference_buffer[:len(block)]
+        if points.shape[1] <= 3:
+            #Few coordinates: the differences are added one axis at a time, which is exact for points that are close
+            np.subtract.outer(block[:, 0], other[:, 0], out=distances)
+            distances *= distances
+            for axis in range(1, points.shape[1]):
+                np.subtract.outer(block[:, axis], other[:, axis], out=difference)
+                difference *= difference
+                distances += difference
+        else:
+            #Many coordinates: |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, where a.b for the whole block is one matrix product
+            np.matmul(block, other.T, out=distances)
+            distances *= -2
+            distances += np.einsum("ij,ij->i", block, block)[:, np.newaxis]
+            distances += squared_other
+            np.maximum(distances, 0, out=distances) #Rounding can give small negative numbers
+        yield start, np.sqrt(distances, out=distances)
+
+def distance_matrix(points, other=None, block_size=None, out=None):
+    """Arg 1 takes an array with one point per row. Arg 2 takes another array of points (if None, points is used).
+    The method returns the matrix of all distances, computed in blocks. For very many points (100 000 points are 80 GB),
+    out can be an array on the disk, e.g. np.lib.format.open_memmap, so that only one block is in memory."""
+    points = _points(points, "points")
+    columns = len(points) if other is None else len(_points(other, "other"))
+    if out is None:
+        out = np.empty((len(points), columns))
+    elif out.shape != (len(points), columns):
+        raise ValueError(f"out must have the shape {(len(points), columns)}, not {out.shape}.")
+    for start, block in distance_blocks(points, other, block_size):
+        out[start:start + len(block)] = block
+    return out
+
+def nearest_neighbours(points, other=None, block_size=None):
+    """Arg 1 takes an array with one point per row. Arg 2 takes another array of points (if None, the closest other
+    point in points is found). The method returns (indices, distances) of the closest point in other for every point,
+    without making the whole distance matrix."""
+    points = _points(points, "points")
+    if other is None and len(points) < 2:
+        raise ValueError(f"There must be at least 2 points to find the closest other point, not {len(points)}.")
+    if other is not None and len(_points(other, "other")) == 0:
+        raise ValueError("other must have at least one point.")
+    indices, distances = np.empty(len(points), dtype=np.int64), np.empty(len(points))
+    for start, block in distance_blocks(points, other, block_size):
+        if other is None:
+            block[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf #A point is not its own neighbour
+        indices[start:start + len(block)] = block.argmin(axis=1)
+        distances[start:start + len(block)] = block[np.arange(len(block)), indices[start:start + len(block)]]
+    return indices, distances
+
+
+if __name__ == "__main__":
+    #The examples of the exercises, as arrays
+    print(f"The lengths of the hypothenuses are {hypothenuses([3, 5], [4, 12])}.")
+    print(f"The k-value and m-value are: {lines([[4, 4]], [[0, 1]])}.")
+    print(f"The euclidean distances are: {row_distances([[3, 5], [2, 1]], [[-2, 4], [3, 1]])}.")
+    print(f"The euclidean distance in 3D is: {row_distances([2, 1, 4], [3, 1, 0])}.")
+
+    #Nearest neighbours in a point cloud, the memory is bounded by block_size
+    cloud = np.random.default_rng(0).uniform(0, 100, (20_000, 3))
+    indices, distances = nearest_neighbours(cloud)
+    print(f"The average distance to the nearest neighbour of {len(cloud)} points is: {distances.mean():.2f} length units.")
@@ -0,0 +1,90 @@
+from confusion_metrics import ConfusionMatrix
+import numpy as np
+import os
+import tempfile
+import unittest
+
+class TestConfusionMatrix(unittest.TestCase):
+    def setUp(self) -> None:
+        generator = np.random.default_rng(0)
+        self.y_true, self.y_pred = generator.integers(0, 2, 1_000), generator.integers(0, 2, 1_000)
+
+    def assertCounts(self, matrix:ConfusionMatrix, y_true, y_pred) -> None:
+        #The counts are compared with a plain count of every pair
+        y_true, y_pred = list(y_true), list(y_pred)
+        pairs = list(zip(y_true, y_pred))
+        self.assertEqual((matrix.tp, matrix.fp, matrix.fn, matrix.tn), (pairs.count((1, 1)), pairs.count((0, 1)), pairs.count((1, 0)), pairs.count((0, 0))))
+
+    def test_update(self):
+        matrix = ConfusionMatrix()
+        for start in range(0, len(self.y_true), 300):
+            matrix.update(self.y_true[start:start + 300], self.y_pred[start:start + 300])
+        self.assertCounts(matrix, self.y_true, self.y_pred)
+        self.assertEqual(len(matrix), len(self.y_true))
+
+    def test_update_with_text_labels(self):
+        matrix = ConfusionMatrix(positive="fire").update(["fire", "none", "fire"], ["fire", "fire", "none"])
+        self.assertEqual((matrix.tp, matrix.fp, matrix.fn, matrix.tn), (1, 1, 1, 0))
+
+    def test_labels_that_can_not_be_positive(self):
+        with self.assertRaises(TypeError):
+            ConfusionMatrix().update(["1", "0"], ["1", "1"])
+        with self.assertRaises(TypeError):
+            ConfusionMatrix(positive="1").update([1, 0], [1, 1])
+        with self.assertRaises(ValueError):
+            ConfusionMatrix().update([1, 0], [1])
+
+    def test_merge(self):
+        halves = [ConfusionMatrix().update(self.y_true[part], self.y_pred[part]) for part in (slice(0, 400), slice(400, None))]
+        self.assertEqual(ConfusionMatrix.merge(halves), ConfusionMatrix().update(self.y_true, self.y_pred))
+        self.assertEqual(halves[0] + halves[1], ConfusionMatrix.merge(halves))
+        with self.assertRaises(ValueError):
+            ConfusionMatrix.merge([])
+        with self.assertRaises(TypeError):
+            ConfusionMatrix.merge([halves[0], ConfusionMatrix(positive=0)])
+
+    def test_metrics(self):
+        #The fire prediction model of exercise00-3
+        matrix = ConfusionMatrix.from_counts(tp=2, fp=2, fn=11, tn=985)
+        self.assertAlmostEqual(matrix.accuracy(), 987/1000)
+        self.assertAlmostEqual(matrix.precision(), 0.5)
+        self.assertAlmostEqual(matrix.recall(), 2/13)
+        self.assertAlmostEqual(matrix.f1(), 4/17)
+        self.assertTrue(np.isnan(ConfusionMatrix().accuracy()))
+
+    def test_update_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "predictions.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("id,y_true,y_pred\n")
+                for number, (true, pred) in enumerate(zip(self.y_true, self.y_pred)):
+                    file.write(f"{number},{true},{pred:.1f}\n")
+                    if number % 100 == 0:
+                        file.write("\n") #Blank lines are skipped
+
+            matrix = ConfusionMatrix().update_csv(path, chunk_rows=128)
+            self.assertCounts(matrix, self.y_true, self.y_pred)
+            self.assertEqual(ConfusionMatrix().update_csv(path, true_column=1, pred_column="y_pred"), matrix)
+
+    def test_update_csv_invalid_values(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "empty.csv")
+            open(path, "w").close()
+            with self.assertRaises(ValueError):
+                ConfusionMatrix().update_csv(path)
+            self.assertEqual(len(ConfusionMatrix().update_csv(path, true_column=0, pred_column=1)), 0) #No header, so an empty file has no rows
+            for chunk_rows in (0, -1, 1.5, True):
+                with self.assertRaises(ValueError):
+                    ConfusionMatrix().update_csv(path, chunk_rows=chunk_rows)
+
+    def test_update_csv_with_quoted_text(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "predictions.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write('comment,y_true,y_pred\n"smoke, no fire",none,fire\n"fire, big",fire,fire\n')
+            matrix = ConfusionMatrix(positive="fire").update_csv(path)
+            self.assertEqual((matrix.tp, matrix.fp, matrix.fn, matrix.tn), (1, 1, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from point_kernels import hypothenuses, row_distances, lines, distance_blocks, distance_matrix, nearest_neighbours
+import numpy as np
+import unittest
+
+def brute_force_distances(points, other):
+    """The distances of all pairs, one pair at a time."""
+    return np.array([[np.sqrt(sum((a - b)**2 for a, b in zip(point, other_point))) for other_point in other] for point in points])
+
+class TestPointKernels(unittest.TestCase):
+    def setUp(self) -> None:
+        self.generator = np.random.default_rng(0)
+
+    def test_examples(self):
+        #The examples of the exercises
+        np.testing.assert_allclose(hypothenuses([3, 5], [4, 12]), [5, 13])
+        np.testing.assert_allclose(lines([[4, 4]], [[0, 1]]), [[0.75], [1]])
+        np.testing.assert_allclose(row_distances([[3, 5], [2, 1]], [[-2, 4], [3, 1]]), [np.sqrt(26), 1])
+        np.testing.assert_allclose(row_distances([2, 1, 4], [3, 1, 0]), [np.sqrt(17)])
+
+    def test_distance_blocks(self):
+        points, other = self.generator.uniform(-10, 10, (23, 2)), self.generator.uniform(-10, 10, (17, 2))
+        expected = brute_force_distances(points, other)
+        starts = []
+        for start, block in distance_blocks(points, other, block_size=5):
+            starts.append(start)
+            np.testing.assert_allclose(block, expected[start:start + 5])
+        self.assertEqual(starts, [0, 5, 10, 15, 20])
+        with self.assertRaises(ValueError):
+            list(distance_blocks(points, other, block_size=0))
+        with self.assertRaises(ValueError):
+            list(distance_blocks(points, self.generator.uniform(0, 1, (4, 3))))
+
+    def test_few_and_many_coordinates(self):
+        #Up to 3 coordinates are added one axis at a time, more coordinates use a matrix product
+        for dimensions in (1, 3, 4, 10):
+            points = self.generator.uniform(-10, 10, (30, dimensions))
+            with self.subTest(dimensions=dimensions):
+                np.testing.assert_allclose(distance_matrix(points, block_size=7), brute_force_distances(points, points), atol=1e-6)
+
+    def test_nearest_neighbours(self):
+        points, other = self.generator.uniform(0, 100, (40, 3)), self.generator.uniform(0, 100, (25, 3))
+        expected = brute_force_distances(points, other)
+        indices, distances = nearest_neighbours(points, other, block_size=6)
+        np.testing.assert_array_equal(indices, expected.argmin(axis=1))
+        np.testing.assert_allclose(distances, expected.min(axis=1))
+
+    def test_nearest_neighbour_is_not_itself(self):
+        points = self.generator.uniform(0, 100, (40, 5))
+        expected = brute_force_distances(points, points)
+        np.fill_diagonal(expected, np.inf)
+        indices, distances = nearest_neighbours(points, block_size=6)
+        self.assertTrue((indices != np.arange(len(points))).all())
+        np.testing.assert_array_equal(indices, expected.argmin(axis=1))
+        np.testing.assert_allclose(distances, expected.min(axis=1), atol=1e-6)
+
+    def test_nearest_neighbours_without_other_points(self):
+        with self.assertRaises(ValueError):
+            nearest_neighbours([[1, 2]])
+        with self.assertRaises(ValueError):
+            nearest_neighbours([[1, 2]], np.empty((0, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
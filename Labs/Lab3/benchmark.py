@@ -0,0 +1,352 @@
+from circle import Circle
+from rectangle import Rectangle
+from sphere import Sphere
+from cube import Cube
+from shape_array import CircleArray, RectangleArray
+from shape_index import ShapeIndex
+from frozen_shapes import FrozenCircle, group_congruent
+from monte_carlo import estimate_area
+from csg import Union, Difference
+from collisions import find_overlaps
+from shape_storage import save_shapes, load_shapes, load_shape_arrays
+from render import BatchRenderer, render_thumbnails
+from meshes import unit_sphere_grid, unit_sphere_mesh, combine_meshes, write_obj, write_ply
+import pickle
+import tempfile
+import os
+import numpy as np
+import subprocess
+import sys
+import time
+import tracemalloc
+
+
+#HELPERS
+
+def best_time(function, repeats:int=3) -> float:
+    """Returns the fastest of several runs of a function, in seconds."""
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def report(name:str, object_seconds:float, other_seconds:float, other_name:str="vectorized", object_name:str="objects") -> None:
+    """Prints the time of a per-object loop (or another baseline) next to the time of another implementation."""
+
+    print(f"{name:<40} {object_name}: {object_seconds*1000:9.2f} ms   {other_name}: {other_seconds*1000:9.2f} ms   speedup: {object_seconds/other_seconds:7.1f}x")
+
+
+#BENCHMARKS
+
+def benchmark_shape_array(size:int=200_000) -> None:
+    """Compares per-object loops over Circle and Rectangle objects with CircleArray and RectangleArray."""
+
+    print(f"\nShape arrays ({size} shapes)")
+    rng = np.random.default_rng(0)
+    radii, lengths, widths = rng.uniform(0.1, 5, (3, size))
+    x_coordinates, y_coordinates = rng.uniform(-100, 100, (2, size))
+
+    circles = [Circle(*values) for values in zip(radii.tolist(), x_coordinates.tolist(), y_coordinates.tolist())]
+    rectangles = [Rectangle(*values) for values in zip(lengths.tolist(), widths.tolist(), x_coordinates.tolist(), y_coordinates.tolist())]
+    circle_array = CircleArray(radii, x_coordinates, y_coordinates)
+    rectangle_array = RectangleArray(lengths, widths, x_coordinates, y_coordinates)
+
+    report("Circle.area", best_time(lambda: [circle.area() for circle in circles]), best_time(circle_array.area))
+    report("Circle.circumference", best_time(lambda: [circle.circumference() for circle in circles]), best_time(circle_array.circumference))
+    report("Circle.is_inside", best_time(lambda: [circle.is_inside(1, 2) for circle in circles]), best_time(lambda: circle_array.is_inside(1, 2)))
+    report("Rectangle.area", best_time(lambda: [rectangle.area() for rectangle in rectangles]), best_time(rectangle_array.area))
+    report("Rectangle.is_inside", best_time(lambda: [rectangle.is_inside(1, 2) for rectangle in rectangles]), best_time(lambda: rectangle_array.is_inside(1, 2)))
+    report("Circle.translate", best_time(lambda: [circle.translate(1, 2) for circle in circles]), best_time(lambda: circle_array.translate(1, 2)))
+    print(f"{'CircleArray.from_shapes':<40} {best_time(lambda: CircleArray.from_shapes(circles), 1)*1000:9.2f} ms")
+    print(f"{'CircleArray.to_shapes':<40} {best_time(circle_array.to_shapes, 1)*1000:9.2f} ms")
+
+    column_bytes = sum(getattr(circle_array, column).nbytes for column in circle_array.columns)
+    print(f"{'Memory of the CircleArray columns':<40} {column_bytes/size:.0f} bytes per circle")
+
+def benchmark_is_inside_points(size:int=1_000_000) -> None:
+    """Compares is_inside called once per point with is_inside_points called once for all points."""
+
+    print(f"\nBatch point queries ({size} points)")
+    rng = np.random.default_rng(0)
+    points_2d = rng.uniform(-10, 10, (size, 2))
+    points_3d = rng.uniform(-10, 10, (size, 3))
+    loop_size = min(size, 100_000) #The loop is timed on fewer points and scaled up, since it takes several seconds
+
+    for shape, points in ((Circle(3, 1, 1), points_2d), (Rectangle(4, 3, 1, 1), points_2d), (Sphere(3, 1, 1, 1), points_3d), (Cube(3, 1, 1, 1), points_3d)):
+        rows = points[:loop_size].tolist()
+        loop_seconds = best_time(lambda: [shape.is_inside(*row) for row in rows], 1)*size/loop_size
+        report(f"{type(shape).__name__}.is_inside", loop_seconds, best_time(lambda: shape.is_inside_points(points)))
+
+def benchmark_shape_index(size:int=20_000, queries:int=1_000) -> None:
+    """Compares looping over all shapes with ShapeIndex for point queries and nearest-shape queries."""
+
+    print(f"\nSpatial index ({size} shapes, {queries} queries)")
+    rng = np.random.default_rng(0)
+    sizes = rng.uniform(0.1, 2, size).tolist()
+    x_coordinates, y_coordinates = rng.uniform(-500, 500, (2, size)).tolist()
+    shapes = [Circle(values[0], values[1], values[2]) if i % 2 else Rectangle(values[0], values[0], values[1], values[2]) for i, values in enumerate(zip(sizes, x_coordinates, y_coordinates))]
+    points = rng.uniform(-500, 500, (queries, 2)).tolist()
+
+    start = time.perf_counter()
+    index = ShapeIndex(shapes) #Only one index is built, since every index registers itself as an observer of the shapes
+    print(f"{'ShapeIndex bulk load':<40} {(time.perf_counter() - start)*1000:9.2f} ms")
+
+    loop_points = points[:50] #The loops are timed on fewer queries and scaled up, since they take several seconds
+    report("Point queries", best_time(lambda: [[shape for shape in shapes if shape.is_inside(*point)] for point in loop_points], 1)*queries/len(loop_points), 
+           best_time(lambda: [index.query_point(point) for point in points]), "index")
+    report("Nearest-shape queries", best_time(lambda: [min(shapes, key=lambda shape: ShapeIndex._distance(shape, point)) for point in loop_points], 1)*queries/len(loop_points), 
+           best_time(lambda: [index.nearest(point) for point in points]), "index")
+
+def benchmark_imports(repeats:int=5) -> None:
+    """Measures the time and memory of importing every shape module in a new interpreter (and of the first plot import)."""
+
+    print(f"\nCold imports (best of {repeats} new interpreters)")
+    code = ("import resource, sys, time\n"
+            "before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+            "start = time.perf_counter()\n"
+            "import {module}\n"
+            "seconds = time.perf_counter() - start\n"
+            "after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+            "kilobytes = (after - before)/1024 if sys.platform == 'darwin' else after - before #ru_maxrss is in bytes on macOS\n"
+            "print(seconds, kilobytes/1024, 'matplotlib' in sys.modules, 'numpy' in sys.modules)")
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    for module in ("geometry", "circle", "rectangle", "sphere", "cube", "matplotlib.pyplot"):
+        runs = []
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, "-c", code.format(module=module)], cwd=directory, capture_output=True, text=True, check=True).stdout.split()
+            runs.append((float(output[0]), float(output[1]), output[2], output[3]))
+        seconds, megabytes, matplotlib_loaded, numpy_loaded = min(runs)
+        print(f"import {module:<33} {seconds*1000:9.2f} ms   +{megabytes:6.1f} MB RSS   matplotlib loaded: {matplotlib_loaded:<5}   numpy loaded: {numpy_loaded}")
+
+class DictCircle:
+    """A circle that stores its values in a __dict__, as the Geometry classes did before they used slots (used as a baseline)."""
+
+    def __init__(self, radius:float, x_coordinate:float=0, y_coordinate:float=0) -> None:
+        self._x_coordinate, self._y_coordinate, self._radius = x_coordinate, y_coordinate, radius
+
+def benchmark_compact_shapes(size:int=200_000) -> None:
+    """Compares construction throughput and memory per object of the validated constructors, from_trusted and a __dict__ baseline."""
+
+    print(f"\nCompact shapes ({size} objects)")
+    rng = np.random.default_rng(0)
+    radii, x_coordinates, y_coordinates = (column.tolist() for column in rng.uniform(0.1, 5, (3, size)))
+    rows = list(zip(radii, x_coordinates, y_coordinates))
+    rectangle_rows = list(zip(radii, radii, x_coordinates, y_coordinates))
+
+    report("Circle construction", best_time(lambda: [Circle(*row) for row in rows]), best_time(lambda: [Circle.from_trusted(*row) for row in rows]), "from_trusted", "constructor")
+    report("Rectangle construction", best_time(lambda: [Rectangle(*row) for row in rectangle_rows]), best_time(lambda: [Rectangle.from_trusted(*row) for row in rectangle_rows]), "from_trusted", "constructor")
+    report("Cube construction", best_time(lambda: [Cube(*row) for row in rows]), best_time(lambda: [Cube.from_trusted(*row) for row in rows]), "from_trusted", "constructor")
+
+    for name, create in (("DictCircle (baseline)", DictCircle), ("Circle (slots)", Circle.from_trusted), ("Cube (slots)", Cube.from_trusted)):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        shapes = [create(*row) for row in rows]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        #The floats are shared with the rows, so only the objects themselves (and the list) are measured
+        print(f"{'Memory per ' + name:<40} {(after - before)/size:6.1f} bytes")
+        del shapes
+
+def benchmark_group_congruent(size:int=1_000_000) -> None:
+    """Compares deduplicating congruent shapes with == in a double loop against group_congruent and sets of frozen shapes."""
+
+    print(f"\nCongruent shapes ({size} circles with 1000 different radii)")
+    rng = np.random.default_rng(0)
+    rows = list(zip(rng.integers(1, 1001, size).tolist(), rng.uniform(-100, 100, size).tolist(), rng.uniform(-100, 100, size).tolist()))
+    circles = [Circle.from_trusted(*row) for row in rows]
+
+    def unique_by_equality(shapes:list) -> list:
+        unique = []
+        for shape in shapes:
+            if not any(shape == other for other in unique):
+                unique.append(shape)
+        return unique
+
+    loop_size = 20_000 #The double loop is timed on fewer shapes and scaled up linearly (which underestimates it)
+    loop_seconds = best_time(lambda: unique_by_equality(circles[:loop_size]), 1)*size/loop_size
+    report("Deduplicate with group_congruent", loop_seconds, best_time(lambda: group_congruent(circles), 1), "group_congruent", "== loop")
+    frozen = [FrozenCircle(*row) for row in rows]
+    report("Deduplicate with a set of frozen shapes", loop_seconds, best_time(lambda: set(frozen), 1), "set", "== loop")
+
+def benchmark_monte_carlo(samples:int=10_000_000) -> None:
+    """Compares a Python loop over is_inside with the vectorized estimator, in one and in several processes."""
+
+    print(f"\nMonte Carlo area of 50 overlapping circles and rectangles ({samples} samples)")
+    rng = np.random.default_rng(0)
+    shapes = [Circle(*values) if i % 2 else Rectangle(values[0], values[0], values[1], values[2]) 
+              for i, values in enumerate(zip(rng.uniform(1, 3, 50).tolist(), rng.uniform(-10, 10, 50).tolist(), rng.uniform(-10, 10, 50).tolist()))]
+
+    def python_loop(size:int) -> int:
+        random_points = np.random.default_rng(0).uniform(-13, 13, (size, 2)).tolist()
+        return sum(any(shape.is_inside(*point) for shape in shapes) for point in random_points)
+
+    loop_size = 20_000 #The loop is timed on fewer samples and scaled up
+    loop_seconds = best_time(lambda: python_loop(loop_size), 1)*samples/loop_size
+    report("estimate_area, 1 process", loop_seconds, best_time(lambda: estimate_area(shapes, samples=samples, seed=1), 1), "estimator", "loop")
+    processes = os.cpu_count() or 1
+    report(f"estimate_area, {processes} processes", loop_seconds, best_time(lambda: estimate_area(shapes, samples=samples, seed=1, processes=processes), 1), "estimator", "loop")
+
+def benchmark_csg(size:int=1_000, queries:int=100_000) -> None:
+    """Compares nested any/all over is_inside with a CSG tree of the same figures, for single points and for arrays of points."""
+
+    print(f"\nCSG tree ({size} figures, {queries} points)")
+    rng = np.random.default_rng(0)
+    sizes = rng.uniform(0.5, 2, size).tolist()
+    x_coordinates, y_coordinates = rng.uniform(-100, 100, (2, size)).tolist()
+    figures = [Circle(values[0], values[1], values[2]) if i % 2 else Rectangle(values[0], values[0], values[1], values[2]) for i, values in enumerate(zip(sizes, x_coordinates, y_coordinates))]
+    holes = [Circle(values[0]/2, values[1], values[2]) for values in zip(sizes[:size//10], x_coordinates, y_coordinates)]
+    tree = Difference(Union(*figures), Union(*holes))
+    points = rng.uniform(-100, 100, (queries, 2))
+
+    def nested_is_inside(x_value:float, y_value:float) -> bool:
+        return any(figure.is_inside(x_value, y_value) for figure in figures) and not any(hole.is_inside(x_value, y_value) for hole in holes)
+
+    loop_points = points[:1_000].tolist() #The loop is timed on fewer points and scaled up
+    rows = points.tolist()
+    report("Single points", best_time(lambda: [nested_is_inside(*point) for point in loop_points], 1)*queries/len(loop_points), 
+           best_time(lambda: [tree.is_inside(*point) for point in rows], 1), "tree", "nested")
+    report("Array of points", best_time(lambda: [nested_is_inside(*point) for point in loop_points], 1)*queries/len(loop_points), 
+           best_time(lambda: tree.is_inside_points(points)), "tree", "nested")
+
+def benchmark_collisions(sizes:tuple=(10_000, 100_000, 1_000_000)) -> None:
+    """Compares a double loop over overlaps with find_overlaps, for growing numbers of evenly spread circles and rectangles."""
+
+    print("\nOverlapping pairs (evenly spread figures, about 1 overlap per figure)")
+    rng = np.random.default_rng(0)
+    seconds_per_pair = None
+    for size in sizes:
+        side = 3*size**0.5 #The density is the same for all sizes
+        rows = zip(rng.uniform(0.1, 2, size).tolist(), *rng.uniform(0, side, (2, size)).tolist())
+        shapes = [Circle.from_trusted(*row) if i % 2 else Rectangle.from_trusted(row[0], *row) for i, row in enumerate(rows)]
+
+        if seconds_per_pair is None: #The double loop is timed on 1000 figures and scaled up quadratically
+            loop_shapes = shapes[:1_000]
+            seconds_per_pair = best_time(lambda: [(first, second) for i, first in enumerate(loop_shapes) for second in loop_shapes[i + 1:] if first.overlaps(second)], 1)/(1_000*999/2)
+        report(f"{size} figures", seconds_per_pair*size*(size - 1)/2, best_time(lambda: find_overlaps(shapes), 1), "find_overlaps", "double loop")
+
+def benchmark_shape_storage(size:int=1_000_000) -> None:
+    """Compares pickling a list of figures with save_shapes, load_shapes and memory-mapped load_shape_arrays."""
+
+    print(f"\nStorage ({size} figures of all four types)")
+    rng = np.random.default_rng(0)
+    rows = list(zip(*rng.uniform(0.1, 5, (5, size)).tolist()))
+    types = (lambda row: Circle.from_trusted(*row[:3]), lambda row: Rectangle.from_trusted(*row[:4]), 
+             lambda row: Sphere.from_trusted(*row[:4]), lambda row: Cube.from_trusted(*row[:4]))
+    shapes = [types[i % 4](row) for i, row in enumerate(rows)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_path, npy_path = os.path.join(directory, "shapes.pickle"), os.path.join(directory, "shapes.npy")
+
+        def pickle_dump():
+            with open(pickle_path, "wb") as file:
+                pickle.dump(shapes, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        def pickle_load():
+            with open(pickle_path, "rb") as file:
+                return pickle.load(file)
+
+        report("Save", best_time(pickle_dump, 1), best_time(lambda: save_shapes(npy_path, shapes), 1), "save_shapes", "pickle")
+        report("Load as objects", best_time(pickle_load, 1), best_time(lambda: load_shapes(npy_path), 1), "load_shapes", "pickle")
+        report("Load as ShapeArrays (memory-mapped)", best_time(pickle_load, 1), best_time(lambda: load_shape_arrays(npy_path)), "load_shape_arrays", "pickle")
+        print(f"{'File size':<40} pickle: {os.path.getsize(pickle_path)/size:6.1f} bytes per figure   npy: {os.path.getsize(npy_path)/size:6.1f} bytes per figure")
+
+def benchmark_render(thumbnails:int=200, size:int=10_000) -> None:
+    """Compares one pyplot figure per image (as in plot_figure, but saved instead of shown) with BatchRenderer, in figures per second."""
+
+    import matplotlib
+    matplotlib.use("Agg") #No window is opened by the pyplot baseline
+    import matplotlib.pyplot as plt
+
+    print(f"\nHeadless rendering ({thumbnails} thumbnails, and one image of {size} figures)")
+    rng = np.random.default_rng(0)
+    shapes = [Circle(*row) if i % 2 else Rectangle(row[0], *row) for i, row in enumerate(zip(rng.uniform(0.5, 3, size).tolist(), *rng.uniform(-100, 100, (2, size)).tolist()))]
+
+    def pyplot_images(shapes_in_image:list, paths:list) -> None:
+        for path, shape in zip(paths, shapes_in_image):
+            fig = plt.figure(dpi=100, figsize=(2, 2))
+            ax = fig.add_subplot()
+            if isinstance(shape, Circle):
+                ax.add_patch(plt.Circle((shape.x_coordinate, shape.y_coordinate), shape.radius))
+            else:
+                ax.add_patch(plt.Rectangle(shape.bounding_box()[0], shape.length, shape.width))
+            (lowest_x, lowest_y), (highest_x, highest_y) = shape.bounding_box()
+            ax.set(xlim=(lowest_x - 1, highest_x + 1), ylim=(lowest_y - 1, highest_y + 1))
+            ax.set_aspect('equal', adjustable='box')
+            fig.savefig(path)
+            plt.close(fig)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"pyplot_{number}.png") for number in range(thumbnails)]
+        pyplot_seconds = best_time(lambda: pyplot_images(shapes[:thumbnails], paths), 1)
+        for processes, show_axes in ((1, True), (1, False), (os.cpu_count() or 1, False)):
+            seconds = best_time(lambda: render_thumbnails(shapes[:thumbnails], directory, processes=processes, show_axes=show_axes), 1)
+            print(f"{f'Thumbnails, {processes} processes, axes {show_axes}':<40} pyplot: {thumbnails/pyplot_seconds:7.1f} figures/s   BatchRenderer: {thumbnails/seconds:7.1f} figures/s")
+
+        def pyplot_patches() -> None:
+            fig = plt.figure(dpi=100)
+            ax = fig.add_subplot()
+            for shape in shapes:
+                if isinstance(shape, Circle):
+                    ax.add_patch(plt.Circle((shape.x_coordinate, shape.y_coordinate), shape.radius))
+                else:
+                    ax.add_patch(plt.Rectangle(shape.bounding_box()[0], shape.length, shape.width))
+            ax.set(xlim=(-105, 105), ylim=(-105, 105))
+            fig.savefig(os.path.join(directory, "patches.png"))
+            plt.close(fig)
+
+        renderer = BatchRenderer()
+        report(f"One image of {size} figures", best_time(pyplot_patches, 1), best_time(lambda: renderer.render(shapes, os.path.join(directory, "collections.png")), 1), "collections", "patches")
+
+def benchmark_meshes(size:int=10_000) -> None:
+    """Compares rebuilding the sphere grid for every sphere with the cached unit grid, and per-sphere meshes with combine_meshes."""
+
+    print(f"\nMeshes ({size} spheres)")
+    rng = np.random.default_rng(0)
+    spheres = [Sphere.from_trusted(*row) for row in zip(rng.uniform(0.1, 1, size).tolist(), *rng.uniform(-50, 50, (3, size)).tolist())]
+
+    def rebuilt_grids() -> list:
+        grids = []
+        for sphere in spheres: #As Sphere.plot_figure did before the grids were cached
+            u, v = np.mgrid[0:2*np.pi:20j, 0:np.pi:20j]
+            grids.append((sphere.x_coordinate + sphere.radius*np.cos(u)*np.sin(v), sphere.y_coordinate + sphere.radius*np.sin(u)*np.sin(v), sphere.z_coordinate + sphere.radius*np.cos(v)))
+        return grids
+
+    def cached_grids() -> list:
+        unit_x, unit_y, unit_z = unit_sphere_grid(20)
+        return [(sphere.x_coordinate + sphere.radius*unit_x, sphere.y_coordinate + sphere.radius*unit_y, sphere.z_coordinate + sphere.radius*unit_z) for sphere in spheres]
+
+    report("Surface grids (resolution 20)", best_time(rebuilt_grids, 1), best_time(cached_grids, 1), "cached", "rebuilt")
+
+    def mesh_per_sphere(resolution:int) -> tuple:
+        unit_vertices, unit_faces = unit_sphere_mesh(resolution)
+        meshes = [(np.array(sphere.bounding_box()[0]) + sphere.radius*(unit_vertices + 1), unit_faces + number*len(unit_vertices)) for number, sphere in enumerate(spheres)]
+        return np.concatenate([vertices for vertices, _ in meshes]), np.concatenate([faces for _, faces in meshes])
+
+    for resolution in (20, 8):
+        report(f"Combined mesh (resolution {resolution})", best_time(lambda: mesh_per_sphere(resolution), 1), best_time(lambda: combine_meshes(spheres, resolution)), "combine_meshes", "per sphere")
+
+    vertices, faces = combine_meshes(spheres, 8)
+    with tempfile.TemporaryDirectory() as directory:
+        for name, write in (("OBJ", write_obj), ("PLY", write_ply)):
+            path = os.path.join(directory, f"spheres.{name.lower()}")
+            seconds = best_time(lambda: write(path, vertices, faces), 1)
+            print(f"{'Export ' + name + ' (resolution 8)':<40} {seconds*1000:9.2f} ms   {os.path.getsize(path)/2**20:6.1f} MB")
+
+
+if __name__ == "__main__":
+    benchmark_imports()
+    benchmark_shape_array()
+    benchmark_is_inside_points()
+    benchmark_shape_index()
+    benchmark_compact_shapes()
+    benchmark_group_congruent()
+    benchmark_monte_carlo()
+    benchmark_csg()
+    benchmark_collisions()
+    benchmark_shape_storage()
+    benchmark_render()
+    benchmark_meshes()
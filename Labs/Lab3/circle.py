@@ -1,6 +1,5 @@
 from geometry import Geometry
 import math
-import matplotlib.pyplot as plt
 
 class Circle(Geometry):
     """
@@ -17,20 +16,28 @@ class Circle(Geometry):
     
     Methods
     -------
+    from_trusted(radius : float, x_coordinate : float = 0, y_coordinate : float = 0) -> Circle
+        Creates a Circle object without validating the values.
     area() -> float
         Calculates the area of a circle.
     circumference() -> float
         Calculates the circumference of a circle.
     is_inside(x_value : float, y_value : float) -> bool
         Checks if a point (x, y) is inside a circle.
+    is_inside_points(points : np.ndarray) -> np.ndarray
+        Checks which of many points (x, y) are inside a circle.
     plot_figure(fixed_scale10 : bool = False, point : tuple = None) -> None
         Plots a Circle object (and a point) in a coordinate system.
+    bounding_box() -> tuple
+        Returns the lowest and the highest corner of the box around a circle.
     __eq__(self, other) -> bool
         Checks if two circles are congruent.
     __repr__() -> str
         Returns information about the size and position of a circle.
     """
 
+    __slots__ = ("_radius",)
+
     def __init__(self, radius:float, x_coordinate:float=0, y_coordinate:float=0) -> None:
         """
         Parameters
@@ -46,6 +53,37 @@ class Circle(Geometry):
         super().__init__(x_coordinate, y_coordinate)
         self.radius = radius
 
+
+    #CLASS METHODS
+
+    @classmethod
+    def from_trusted(cls, radius:float, x_coordinate:float=0, y_coordinate:float=0) -> "Circle":
+        """
+        Creates a Circle object without validating the values, for values from an already validated source.
+
+        The setters are not called, so the values must be ints or floats (and the sizes above zero).
+        Use the normal constructor for all other values.
+
+        Parameters
+        ----------
+        radius : float
+            The radius of a circle.
+        x_coordinate : float
+            The x-coordinate at the centre of a circle (default 0).
+        y_coordinate : float
+            The y-coordinate at the centre of a circle (default 0).
+
+        Returns
+        -------
+        Circle
+            A new Circle object.
+        """
+
+        circle = cls.__new__(cls)
+        circle._observers = ()
+        circle._x_coordinate, circle._y_coordinate, circle._radius = x_coordinate, y_coordinate, radius
+        return circle
+
      
     #METHODS
 
@@ -85,12 +123,42 @@ class Circle(Geometry):
 
         Geometry.validation_numerical(x_value)
         Geometry.validation_numerical(y_value)
-        eucl_distance = math.sqrt((self.x_coordinate - x_value)**2 + (self.y_coordinate - y_value)**2)
-        if eucl_distance <= self.radius:
+        #Compares the squared distance with the squared radius, as is_inside_points and CircleArray.is_inside, so that they give the same
+        #answer on the edge (the squares are products, since x**2 of a float can round differently from x*x, which NumPy uses)
+        x_difference, y_difference = self.x_coordinate - x_value, self.y_coordinate - y_value
+        if x_difference*x_difference + y_difference*y_difference <= self.radius*self.radius:
             return True
         else: 
             return False
 
+    def is_inside_points(self, points:"np.ndarray") -> "np.ndarray":
+        """
+        Checks which of many points (x, y) are inside a circle.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            An N x 2 array with one point (x, y) per row.
+        
+        Raises
+        ------
+        TypeError
+            If the values in points are not int or float.
+        ValueError
+            If points is not an N x 2 array.
+        
+        Returns
+        -------
+        np.ndarray
+            A boolean mask that is True for the points in the circle (including the edges of the circle).
+        """
+
+        points = Geometry.validation_points(points, 2)
+        #Compares the squared distances with the squared radius, so that no square root has to be calculated
+        squared_distances = (points[:, 0] - self.x_coordinate)**2
+        squared_distances += (points[:, 1] - self.y_coordinate)**2
+        return squared_distances <= self.radius*self.radius
+
     def plot_figure(self, fixed_scale10:bool=False, point:tuple=None) -> None: #Reference: https://stackoverflow.com/questions/9215658/plot-a-circle-with-pyplot
         """
         Plots a Circle object (and a point) in a coordinate system.
@@ -111,6 +179,8 @@ class Circle(Geometry):
         None
         """
 
+        import matplotlib.pyplot as plt #Imported here, so that matplotlib is only loaded when a figure is plotted (and not when importing the shapes)
+
         #Sets up the figure and axes
         fig = plt.figure(dpi=100)
         ax = fig.add_subplot()
@@ -124,10 +194,7 @@ class Circle(Geometry):
             ax.plot(point[0], point[1], "ko")
         
         #Creates variables for the edges of the circle
-        lowest_x = self.x_coordinate-self.radius
-        highest_x = self.x_coordinate+self.radius
-        lowest_y = self.y_coordinate-self.radius
-        highest_y = self.y_coordinate+self.radius
+        (lowest_x, lowest_y), (highest_x, highest_y) = self.bounding_box()
 
         #Sets the scale, depending on the values of the circle and if fixed_scale10 is set to True
         if fixed_scale10 == True and lowest_x >= -10 and lowest_y >= -10 and highest_x <= 10 and highest_y <= 10:
@@ -141,6 +208,19 @@ class Circle(Geometry):
 
         plt.show() 
 
+    def bounding_box(self) -> tuple:
+        """
+        Returns the lowest and the highest corner of the box around a circle.
+
+        Returns
+        -------
+        tuple
+            ((lowest_x, lowest_y), (highest_x, highest_y))
+        """
+
+        return ((self.x_coordinate-self.radius, self.y_coordinate-self.radius), 
+                (self.x_coordinate+self.radius, self.y_coordinate+self.radius))
+
     def __eq__(self, other) -> bool:
         """
         Checks if two circles are congruent.
@@ -204,4 +284,5 @@ class Circle(Geometry):
         None
         """
         
-        self._radius = Geometry.validation_numerical_above_zero(radius)
\ No newline at end of file
+        self._radius = Geometry.validation_numerical_above_zero(radius)
+        self.notify_observers()
\ No newline at end of file
@@ -0,0 +1,243 @@
+from geometry import Geometry
+from circle import Circle
+from rectangle import Rectangle
+import math
+import numpy as np
+
+#A figure that would be stored in more grid cells than this (e.g. one huge figure among small ones) is not stored in
+#the grid, but compared with the bounding boxes of all figures instead (as the large figures of ShapeIndex)
+MAX_CELLS_PER_SHAPE = 64
+
+def overlaps(first:Geometry, second:Geometry) -> bool:
+    """
+    Checks if two geometrical figures overlap (including figures that only touch at the edges).
+
+    Circles and spheres are handled as balls (a centre and a radius), and rectangles and cubes as axis-aligned
+    boxes, so every pair of types has an exact test: ball-ball compares the distance between the centres with the
+    sum of the radii, ball-box compares the distance from the centre to the closest point of the box with the
+    radius, and box-box checks that the boxes overlap along every axis.
+
+    Parameters
+    ----------
+    first : Geometry
+        A Circle, Rectangle, Sphere or Cube object.
+    second : Geometry
+        A Circle, Rectangle, Sphere or Cube object, with the same number of dimensions as the first.
+
+    Raises
+    ------
+    TypeError
+        If a figure is not a Circle, Rectangle, Sphere or Cube.
+    ValueError
+        If the figures do not have the same number of dimensions.
+
+    Returns
+    -------
+    True
+        If the figures overlap or touch.
+    False
+        If the figures do not overlap.
+    """
+
+    first_is_ball, first_box = _describe(first)
+    second_is_ball, second_box = _describe(second)
+    if len(first_box[0]) != len(second_box[0]):
+        raise ValueError(f"The figures must have the same number of dimensions, not {len(first_box[0])} and {len(second_box[0])}.")
+
+    #The same formulas as in _exact_overlaps (the squares are added in the same order), so that overlaps and
+    #find_overlaps always give the same answer, also for figures that only touch
+    if not all(low <= other_high and other_low <= high for low, high, other_low, other_high in zip(*first_box, *second_box)):
+        return False #The bounding boxes do not overlap, so the figures can not overlap
+    if first_is_ball and second_is_ball:
+        return _length([a - b for a, b in zip(_centre(first), _centre(second))]) <= first.radius + second.radius
+    if first_is_ball:
+        return _distance_to_box(_centre(first), second_box) <= first.radius
+    if second_is_ball:
+        return _distance_to_box(_centre(second), first_box) <= second.radius
+    return True #Two boxes overlap if their bounding boxes (the boxes themselves) overlap
+
+def find_overlaps(shapes:list, other_shapes:list=None, cell_size:float=None) -> "np.ndarray":
+    """
+    Finds every pair of overlapping figures (including figures that only touch at the edges), in O(n log n) time for evenly spread figures.
+
+    A broad phase hashes the bounding boxes into a uniform grid, by sorting (cell, figure) rows, so that only
+    figures that share a cell become candidates. Every candidate pair is only created in the cell that contains
+    the lowest corner of the overlap of their boxes, so no pair has to be removed as a duplicate. Figures that would
+    overlap more than MAX_CELLS_PER_SHAPE cells are compared with the boxes of all figures instead. The exact
+    overlap tests (see overlaps) are then done for all candidates at once with NumPy.
+
+    Parameters
+    ----------
+    shapes : list
+        Circle, Rectangle, Sphere and Cube objects, with the same number of dimensions.
+    other_shapes : list
+        A second list of figures (default None). If given, only pairs with one figure from each list are found.
+        Otherwise all pairs of figures in shapes are found.
+    cell_size : float
+        The side of the grid cells (default None, which uses the 90th percentile of the largest side of the bounding boxes).
+
+    Raises
+    ------
+    TypeError
+        If a figure is not a Circle, Rectangle, Sphere or Cube.
+    ValueError
+        If the figures do not have the same number of dimensions, or if cell_size is 0 or below.
+
+    Returns
+    -------
+    np.ndarray
+        An M x 2 array of indices, sorted by row. Every row (i, j) is a pair of overlapping figures: shapes[i] and
+        other_shapes[j], or shapes[i] and shapes[j] with i < j if other_shapes is None.
+    """
+
+    shapes = list(shapes)
+    other_shapes = None if other_shapes is None else list(other_shapes)
+    is_ball, lowest_corners, highest_corners, centres, radii = _columns(shapes + (other_shapes or []))
+    if cell_size is not None:
+        Geometry.validation_numerical_above_zero(cell_size)
+    if len(is_ball) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    if cell_size is None:
+        #Most figures then overlap at most 2 cells along every axis, and a few large figures overlap more
+        cell_size = float(np.percentile((highest_corners - lowest_corners).max(axis=1), 90)) or 1.0 #1.0 if the figures are very small
+
+    first, second = _candidate_pairs(lowest_corners, highest_corners, cell_size)
+    if other_shapes is not None:
+        #Only the pairs with one figure from each list are kept, with the figure from shapes first
+        first, second = np.minimum(first, second), np.maximum(first, second)
+        keep = (first < len(shapes)) & (second >= len(shapes))
+        first, second = first[keep], second[keep] - len(shapes)
+        other_offset = len(shapes)
+    else:
+        first, second = np.minimum(first, second), np.maximum(first, second)
+        other_offset = 0
+
+    keep = _exact_overlaps(is_ball, lowest_corners, highest_corners, centres, radii, first, second + other_offset)
+    pairs = np.column_stack((first[keep], second[keep]))
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+#HELPERS
+
+def _describe(shape:Geometry) -> tuple:
+    """Returns (True if the figure is a ball, its bounding box), or raises a TypeError for figures without an exact overlap test."""
+
+    if isinstance(shape, Circle): #Also handles Sphere, which is a subclass of Circle
+        return True, shape.bounding_box()
+    if isinstance(shape, Rectangle): #Also handles Cube, which is a subclass of Rectangle
+        return False, shape.bounding_box()
+    raise TypeError(f"Please enter a Circle, Rectangle, Sphere or Cube, not a {type(shape)}.")
+
+def _centre(ball:Circle) -> tuple:
+    """Returns the centre of a circle or sphere."""
+
+    return (ball.x_coordinate, ball.y_coordinate, ball.z_coordinate) if hasattr(ball, "z_coordinate") else (ball.x_coordinate, ball.y_coordinate)
+
+def _length(differences:list) -> float:
+    """Returns the length of a vector, with the squares added from the first axis to the last (as NumPy does for 2 or 3 axes)."""
+
+    squared_sum = 0.0
+    for difference in differences:
+        squared_sum += difference*difference
+    return math.sqrt(squared_sum)
+
+def _distance_to_box(point:tuple, box:tuple) -> float:
+    """Returns the distance from a point to the closest point of a box (0 if the point is inside)."""
+
+    return _length([max(low - value, 0, value - high) for value, low, high in zip(point, *box)])
+
+def _columns(shapes:list) -> tuple:
+    """Returns the figures as columns: a boolean array that is True for balls, the lowest and highest corners of their boxes,
+    and the centres and radii of the balls (read from the figures, the radius is 0 for boxes)."""
+
+    is_ball, boxes, centres, radii = [], [], [], []
+    for shape in shapes:
+        shape_is_ball, box = _describe(shape)
+        if boxes and 2*len(box[0]) != len(boxes[0]):
+            raise ValueError(f"All figures must have the same number of dimensions, not {len(boxes[0])//2} and {len(box[0])}.")
+        is_ball.append(shape_is_ball)
+        boxes.append(box[0] + box[1])
+        if shape_is_ball:
+            centres.append(_centre(shape))
+            radii.append(shape.radius)
+        else:
+            centres.append(tuple((low + high)/2 for low, high in zip(*box)))
+            radii.append(0)
+
+    dimensions = len(boxes[0])//2 if boxes else 2
+    corners = np.array(boxes, dtype=float).reshape(len(boxes), 2*dimensions)
+    centres = np.array(centres, dtype=float).reshape(len(boxes), dimensions)
+    return np.array(is_ball, dtype=bool), corners[:, :dimensions], corners[:, dimensions:], centres, np.array(radii, dtype=float)
+
+def _candidate_pairs(lowest_corners:"np.ndarray", highest_corners:"np.ndarray", cell_size:float) -> tuple:
+    """Returns the indices (first, second) of every pair of figures that share a grid cell (or whose boxes overlap,
+    for figures that overlap too many cells), each pair once."""
+
+    dimensions = lowest_corners.shape[1]
+    lowest_cells = np.floor(lowest_corners/cell_size).astype(np.int64)
+    spans = np.floor(highest_corners/cell_size).astype(np.int64) - lowest_cells + 1
+    #The spans are limited before they are multiplied, so that the number of cells of a huge figure can not overflow
+    large = np.minimum(spans, MAX_CELLS_PER_SHAPE + 1).prod(axis=1) > MAX_CELLS_PER_SHAPE
+    large_first, large_second = _large_pairs(lowest_corners, highest_corners, large)
+    counts = np.where(large, 0, spans.prod(axis=1)) #The large figures get no rows in the grid
+
+    #One row for every cell that a figure overlaps: the offset of the cell is found from the row number in mixed radix
+    figures = np.repeat(np.arange(len(counts)), counts)
+    remainders = np.arange(len(figures)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cells = np.empty((len(figures), dimensions), dtype=np.int64)
+    for axis in range(dimensions):
+        axis_spans = spans[figures, axis]
+        cells[:, axis] = lowest_cells[figures, axis] + remainders % axis_spans
+        remainders //= axis_spans
+
+    #Rows in the same cell are next to each other after sorting, and form groups
+    order = np.lexsort(cells.T[::-1])
+    cells, figures = cells[order], figures[order]
+    new_group = np.ones(len(figures), dtype=bool)
+    new_group[1:] = (cells[1:] != cells[:-1]).any(axis=1)
+    group_starts = np.flatnonzero(new_group)
+    group_ends = np.append(group_starts[1:], len(figures))
+
+    #Every row is paired with the rows after it in the same group
+    later_rows = np.repeat(group_ends, group_ends - group_starts) - np.arange(len(figures)) - 1
+    first_rows = np.repeat(np.arange(len(figures)), later_rows)
+    second_rows = first_rows + 1 + np.arange(len(first_rows)) - np.repeat(np.cumsum(later_rows) - later_rows, later_rows)
+    first, second = figures[first_rows], figures[second_rows]
+
+    #A pair is only kept in the cell with the lowest corner of the overlap of the boxes, so that it is found once
+    overlap_cells = np.floor(np.maximum(lowest_corners[first], lowest_corners[second])/cell_size).astype(np.int64)
+    keep = (overlap_cells == cells[first_rows]).all(axis=1)
+    return np.concatenate((first[keep], large_first)), np.concatenate((second[keep], large_second))
+
+def _large_pairs(lowest_corners:"np.ndarray", highest_corners:"np.ndarray", large:"np.ndarray") -> tuple:
+    """Returns the indices (first, second) of every pair of a large figure and another figure whose boxes overlap, each pair once."""
+
+    first, second = [], []
+    for figure in np.flatnonzero(large):
+        overlapping = ((lowest_corners <= highest_corners[figure]) & (lowest_corners[figure] <= highest_corners)).all(axis=1)
+        overlapping[:figure + 1] &= ~large[:figure + 1] #A pair of two large figures is only found from the first of them
+        overlapping[figure] = False
+        others = np.flatnonzero(overlapping)
+        first.append(np.full(len(others), figure))
+        second.append(others)
+    return (np.concatenate(first), np.concatenate(second)) if first else (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+def _exact_overlaps(is_ball:"np.ndarray", lowest_corners:"np.ndarray", highest_corners:"np.ndarray", centres:"np.ndarray", radii:"np.ndarray",
+                    first:"np.ndarray", second:"np.ndarray") -> "np.ndarray":
+    """Returns a boolean mask that is True for the pairs (first, second) that overlap, with the same formulas as overlaps."""
+
+    #Figures whose bounding boxes do not overlap can not overlap, and two boxes overlap if their bounding boxes do
+    overlapping = ((lowest_corners[first] <= highest_corners[second]) & (lowest_corners[second] <= highest_corners[first])).all(axis=1)
+
+    #Ball-ball pairs: the distance between the centres compared with the sum of the radii
+    both = np.flatnonzero(overlapping & is_ball[first] & is_ball[second])
+    distances = np.sqrt(((centres[first[both]] - centres[second[both]])**2).sum(axis=1))
+    overlapping[both] = distances <= radii[first[both]] + radii[second[both]]
+
+    #Ball-box pairs (in both orders): the distance from the centre to the closest point of the box compared with the radius
+    for balls, boxes in ((first, second), (second, first)):
+        mixed = np.flatnonzero(overlapping & is_ball[balls] & ~is_ball[boxes])
+        ball_centres, box_lows, box_highs = centres[balls[mixed]], lowest_corners[boxes[mixed]], highest_corners[boxes[mixed]]
+        distances = np.sqrt((np.maximum(np.maximum(box_lows - ball_centres, 0), ball_centres - box_highs)**2).sum(axis=1))
+        overlapping[mixed] = distances <= radii[balls[mixed]]
+    return overlapping
@@ -0,0 +1,624 @@
+from geometry import Geometry
+from monte_carlo import estimate_area, estimate_volume, estimate_boundary
+from abc import abstractmethod
+import numpy as np
+
+class CSGNode(Geometry):
+    """
+    An abstract class for constructive solid geometry (CSG): geometrical figures that are combinations of other figures.
+
+    The children can be Circle, Rectangle, Sphere and Cube objects, or other CSG nodes, with the same number of
+    dimensions. The x, y (and z) coordinates of a node move the whole tree: the children are placed relative to
+    the node, and are not changed when the node is translated. The bounding box of every child is cached, so that
+    a point only is checked against the children whose boxes contain it. The node registers itself as an observer
+    of its children, so the cached boxes are updated when a child is moved or resized.
+
+    Nodes are compared with == (congruence), but are not hashable (as the other Geometry classes), since a node
+    changes when a child is moved, and its hash would then change while it is in a set or dict. Use id(node) as key.
+
+    Attributes
+    ----------
+    children : tuple
+        The combined geometrical figures.
+    dimensions : int
+        The number of dimensions of the children (2 or 3).
+    x_coordinate : float
+        The offset of the node along the x-axis (default 0).
+    y_coordinate : float
+        The offset of the node along the y-axis (default 0).
+    z_coordinate : float
+        The offset of the node along the z-axis, only for 3D nodes (default 0).
+
+    Methods
+    -------
+    translate(x_new_value : float, y_new_value : float, z_new_value : float = None) -> None
+        Sets the offset of the node to new values.
+    area(samples : int = 1000000, seed : int = None) -> float
+        Estimates the area of a 2D node, or the surface area of a 3D node, by random sampling.
+    volume(samples : int = 1000000, seed : int = None) -> float
+        Estimates the volume of a 3D node by random sampling (0 for a 2D node).
+    circumference(samples : int = 1000000, seed : int = None) -> float
+        Estimates the circumference of a 2D node (or of the middle cross-section of a 3D node) by random sampling.
+    is_inside(x_value : float, y_value : float, z_value : float = None) -> bool
+        Checks if a point is inside a node.
+    is_inside_points(points : np.ndarray) -> np.ndarray
+        Checks which of many points are inside a node.
+    plot_figure(fixed_scale10 : bool = False, point : tuple = None) -> None
+        Plots a node (and a point) in a coordinate system, by sampling it on a grid.
+    bounding_box() -> tuple
+        Returns the lowest and the highest corner of the box around a node.
+    shape_changed(shape : Geometry) -> None
+        Updates the cached bounding box of a child (called by the child when it changes).
+    __eq__(other) -> bool
+        Checks if two nodes are congruent.
+    __repr__() -> str
+        Returns information about the children and the position of a node.
+    """
+
+    __hash__ = None #Set on purpose, see above (defining __eq__ would also set it, but without saying why)
+
+    __slots__ = ("_z_coordinate", "_children", "_dimensions", "_child_boxes", "_box", "_positions", "_box_arrays")
+
+    #The largest number of children whose boxes are checked in a Python loop in is_inside (above it NumPy is faster)
+    LOOP_LIMIT = 16
+
+    def __init__(self, *children:Geometry, x_coordinate:float=0, y_coordinate:float=0, z_coordinate:float=0) -> None:
+        """
+        Parameters
+        ----------
+        children : Geometry
+            The geometrical figures to combine, with the same number of dimensions.
+        x_coordinate : float
+            The offset of the node along the x-axis (default 0).
+        y_coordinate : float
+            The offset of the node along the y-axis (default 0).
+        z_coordinate : float
+            The offset of the node along the z-axis, only for 3D nodes (default 0).
+
+        Raises
+        ------
+        TypeError
+            If a child is not a Geometry object, or if a coordinate is not int or float.
+        ValueError
+            If there are no children, if the children do not have the same number of dimensions,
+            or if a 2D node gets a z-coordinate.
+        """
+
+        self._observers = ()
+        self._set_children(children)
+        super().__init__(x_coordinate, y_coordinate)
+        self.z_coordinate = z_coordinate
+
+
+    #METHODS
+
+    def translate(self, x_new_value:float, y_new_value:float, z_new_value:float=None) -> None:
+        """
+        Sets the offset of the node (and so the position of all children) to new values.
+
+        Parameters
+        ----------
+        x_new_value : float
+            The new value for the x-coordinate.
+        y_new_value : float
+            The new value for the y-coordinate.
+        z_new_value : float
+            The new value for the z-coordinate, only for 3D nodes (default None, which keeps the z-coordinate).
+
+        Raises
+        ------
+        TypeError
+            If value is not int or float.
+        ValueError
+            If a 2D node gets a z-coordinate.
+
+        Returns
+        -------
+        None
+        """
+
+        if z_new_value is not None:
+            self._z_coordinate = self._validate_z(z_new_value) #The z-coordinate is set first, since the observers are notified by super().translate
+        super().translate(x_new_value, y_new_value)
+
+    def area(self, samples:int=1_000_000, seed:int=None) -> float:
+        """
+        Estimates the area of a 2D node (see monte_carlo.estimate_area), or the surface area of a 3D node
+        (see monte_carlo.estimate_boundary), by random sampling.
+
+        Parameters
+        ----------
+        samples : int
+            The number of random points (default 1 000 000).
+        seed : int
+            The seed of the random points (default None).
+
+        Returns
+        -------
+        float
+            The estimated area.
+        """
+
+        if self._dimensions == 2:
+            return estimate_area(self, samples=samples, seed=seed).estimate
+        return estimate_boundary(self, samples=samples, seed=seed).estimate
+
+    def volume(self, samples:int=1_000_000, seed:int=None) -> float:
+        """
+        Estimates the volume of a 3D node by random sampling (see monte_carlo.estimate_volume). A 2D node has the volume 0.
+
+        Parameters
+        ----------
+        samples : int
+            The number of random points (default 1 000 000).
+        seed : int
+            The seed of the random points (default None).
+
+        Returns
+        -------
+        float
+            The estimated volume.
+        """
+
+        if self._dimensions == 2:
+            return 0.0
+        return estimate_volume(self, samples=samples, seed=seed).estimate
+
+    def circumference(self, samples:int=1_000_000, seed:int=None) -> float:
+        """
+        Estimates the circumference of a 2D node by counting how often random lines cross its edge (see monte_carlo.estimate_boundary).
+        For a 3D node, it is the circumference of the cross-section in the middle of the bounding box along the z-axis
+        (like the great circle of a Sphere and a face of a Cube).
+
+        Parameters
+        ----------
+        samples : int
+            The number of random points (default 1 000 000).
+        seed : int
+            The seed of the random points (default None).
+
+        Returns
+        -------
+        float
+            The estimated circumference.
+        """
+
+        if self._dimensions == 2:
+            return estimate_boundary(self, samples=samples, seed=seed).estimate
+        lowest_corner, highest_corner = self.bounding_box()
+        return estimate_boundary(self, samples=samples, seed=seed, z_value=(lowest_corner[2] + highest_corner[2])/2).estimate
+
+    def is_inside(self, x_value:float, y_value:float, z_value:float=None) -> bool:
+        """
+        Checks if a point (x, y) or (x, y, z) is inside a node.
+
+        Parameters
+        ----------
+        x_value : float
+            The x-value of the point.
+        y_value : float
+            The y-value of the point.
+        z_value : float
+            The z-value of the point, only for 3D nodes (default None).
+
+        Raises
+        ------
+        TypeError
+            If value is not int or float.
+        ValueError
+            If the point does not have the same number of dimensions as the node.
+
+        Returns
+        -------
+        True
+            If the point is in the node (including the edges).
+        False
+            If the point is not in the node.
+        """
+
+        values = (x_value, y_value) if z_value is None else (x_value, y_value, z_value)
+        if len(values) != self._dimensions:
+            raise ValueError(f"Please enter a point with {self._dimensions} values, not {len(values)}.")
+        point = tuple(Geometry.validation_numerical(value) - offset for value, offset in zip(values, self._offset()))
+
+        if not CSGNode._box_contains(self._box, point):
+            return False
+        return self._contains(point)
+
+    def is_inside_points(self, points:"np.ndarray") -> "np.ndarray":
+        """
+        Checks which of many points are inside a node.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            An N x 2 (2D node) or N x 3 (3D node) array with one point per row.
+
+        Raises
+        ------
+        TypeError
+            If the values in points are not int or float.
+        ValueError
+            If points does not have the same number of dimensions as the node.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean mask that is True for the points in the node (including the edges).
+        """
+
+        points = Geometry.validation_points(points, self._dimensions) - self._offset()
+        inside = np.zeros(len(points), dtype=bool)
+        candidates = np.flatnonzero(CSGNode._in_box(points, *self._box))
+        if len(candidates):
+            inside[self._contains_points(points, candidates)] = True
+        return inside
+
+    def plot_figure(self, fixed_scale10:bool=False, point:tuple=None, resolution:int=None) -> None:
+        """
+        Plots a node (and a point) in a coordinate system, by checking which points of a grid are inside it.
+
+        Arguments
+        ---------
+        fixed_scale10 : bool
+            If True and if the node is located between -10 and 10 on all axes, the node will be shown in a
+            coordinate system scaled between -10 and 10. Otherwise the plot will zoom in on the node (default False).
+        point : tuple
+            Plots a point (x, y) or (x, y, z) in the coordinate system (default None).
+        resolution : int
+            The number of grid points along every axis (default None, which is 400 in 2D and 40 in 3D).
+
+        Returns
+        -------
+        None
+        """
+
+        import matplotlib.pyplot as plt #Imported here, so that matplotlib is only loaded when a figure is plotted
+
+        lowest_corner, highest_corner = self.bounding_box()
+        if fixed_scale10 == True and min(lowest_corner) >= -10 and max(highest_corner) <= 10:
+            limits = [(-10, 10)]*self._dimensions
+        else:
+            #Some space on the sides of the node
+            margins = [(high - low)/4 or 1 for low, high in zip(lowest_corner, highest_corner)]
+            limits = [(low - margin, high + margin) for low, high, margin in zip(lowest_corner, highest_corner, margins)]
+        resolution = resolution or (400 if self._dimensions == 2 else 40)
+        edges = [np.linspace(low, high, resolution + 1) for low, high in limits]
+        centres = [(edge[:-1] + edge[1:])/2 for edge in edges]
+        grid = np.meshgrid(*centres, indexing="ij")
+        filled = self.is_inside_points(np.column_stack([axis.ravel() for axis in grid])).reshape(grid[0].shape)
+
+        fig = plt.figure(dpi=100)
+        if self._dimensions == 2:
+            from matplotlib.colors import ListedColormap
+            ax = fig.add_subplot()
+            ax.imshow(filled.T, origin="lower", extent=(*limits[0], *limits[1]), cmap=ListedColormap(["white", "cornflowerblue"]))
+            ax.set_aspect('equal', adjustable='box')
+        else:
+            ax = fig.add_subplot(projection="3d")
+            x_edges, y_edges, z_edges = np.meshgrid(*edges, indexing="ij")
+            ax.voxels(x_edges, y_edges, z_edges, filled, facecolor="cornflowerblue", edgecolor="none")
+            ax.set(zlabel="z")
+
+        if point != None:
+            ax.plot(*([value] for value in point), "ko")
+        ax.set(title=f"{type(self).__name__} of {len(self._children)} figures", xlabel="x", ylabel="y")
+
+        plt.show()
+
+    def bounding_box(self) -> tuple:
+        """
+        Returns the lowest and the highest corner of the box around a node.
+
+        Returns
+        -------
+        tuple
+            ((lowest_x, lowest_y), (highest_x, highest_y)) or ((lowest_x, lowest_y, lowest_z), (highest_x, highest_y, highest_z)).
+            If the node can not contain any point (e.g. an intersection of figures that do not overlap), both corners are the same point.
+        """
+
+        offset = self._offset()
+        lowest_corner, highest_corner = self._box
+        if not CSGNode._box_contains(self._box, lowest_corner):
+            highest_corner = lowest_corner
+        return (tuple(low + value for low, value in zip(lowest_corner, offset)),
+                tuple(high + value for high, value in zip(highest_corner, offset)))
+
+    def shape_changed(self, shape:Geometry) -> None:
+        """
+        Updates the cached bounding box of a child, and notifies the observers of the node (called by the child when it changes).
+
+        Parameters
+        ----------
+        shape : Geometry
+            The child that has been moved or resized.
+
+        Returns
+        -------
+        None
+        """
+
+        box = shape.bounding_box()
+        for position in self._positions.get(id(shape), ()):
+            self._child_boxes[position] = box
+            if self._box_arrays is not None:
+                self._box_arrays[0][position], self._box_arrays[1][position] = box
+        self._box = self._combine_boxes()
+        self.notify_observers()
+
+    def __eq__(self, other) -> bool:
+        """
+        Checks if two nodes are congruent.
+
+        Returns
+        -------
+        True
+            If the other object is a node of the same type, with congruent children at the same positions relative to the node.
+        False
+            If the other object is not a node of the same type.
+            If the children are not congruent, or are at different positions relative to the node.
+        """
+
+        if type(self) != type(other) or len(self._children) != len(other._children):
+            return False
+        return self._child_boxes == other._child_boxes and all(child == other_child for child, other_child in zip(self._children, other._children))
+
+    def __repr__(self) -> str:
+        """Returns information about the children and the position of a node."""
+
+        return f"{type(self).__name__} of {len(self._children)} figures: {list(self._children)}. The offset is: {self._offset()}."
+
+    def __getstate__(self) -> dict:
+        """Returns the values to pickle: the children and the offset (the caches are created again when unpickled)."""
+
+        return {"children": self._children, "offset": self._offset()}
+
+    def __setstate__(self, state:dict) -> None:
+        """Restores an unpickled node, and registers it as an observer of its (unpickled) children again."""
+
+        self._observers = ()
+        self._set_children(state["children"])
+        self._x_coordinate, self._y_coordinate, *z_coordinate = state["offset"]
+        self._z_coordinate = z_coordinate[0] if z_coordinate else 0
+
+
+    #ABSTRACT METHODS
+
+    @abstractmethod
+    def _contains(self, point:tuple) -> bool:
+        """Checks if a point inside the bounding box of the node (relative to the node) is inside the node."""
+
+        pass
+
+    @abstractmethod
+    def _contains_points(self, points:"np.ndarray", candidates:"np.ndarray") -> "np.ndarray":
+        """Returns the indices of the candidate points (inside the bounding box of the node) that are inside the node."""
+
+        pass
+
+    @abstractmethod
+    def _combine_boxes(self) -> tuple:
+        """Returns the bounding box of the node, relative to the node, from the cached boxes of the children."""
+
+        pass
+
+
+    #HELPERS
+
+    def _candidates(self, point:tuple, first:int=0) -> list:
+        """Returns the children (from the index first) whose cached bounding boxes contain a point."""
+
+        if len(self._children) - first <= CSGNode.LOOP_LIMIT:
+            return [child for child, box in zip(self._children[first:], self._child_boxes[first:]) if CSGNode._box_contains(box, point)]
+        lowest_corners, highest_corners = self._arrays()
+        #One axis at a time, comparing with Python floats, is faster than broadcasting the point over all axes
+        inside = np.ones(len(self._children) - first, dtype=bool)
+        for axis, value in enumerate(point):
+            inside &= lowest_corners[first:, axis] <= value
+            inside &= highest_corners[first:, axis] >= value
+        hits = np.flatnonzero(inside)
+        return [self._children[first + position] for position in hits.tolist()]
+
+    def _filter_by_children(self, points:"np.ndarray", candidates:"np.ndarray", children:slice, keep_inside:bool) -> "np.ndarray":
+        """
+        Checks the candidate points against a range of children, and returns the candidates that are inside a child
+        (keep_inside=True) or inside none of them (keep_inside=False).
+
+        The candidates are sorted along the x-axis once, so that every child only checks the points between the
+        x-values of its cached bounding box (found with a binary search), which are not inside an earlier child.
+        """
+
+        if len(candidates) == 0:
+            return candidates
+        lowest_corners, highest_corners = (corners[children] for corners in self._arrays())
+        candidate_points = points[candidates]
+        order = np.argsort(candidate_points[:, 0], kind="stable")
+        sorted_x = candidate_points[order, 0]
+        starts = np.searchsorted(sorted_x, lowest_corners[:, 0], side="left").tolist()
+        ends = np.searchsorted(sorted_x, highest_corners[:, 0], side="right").tolist()
+
+        found = np.zeros(len(candidates), dtype=bool)
+        for child, lowest_corner, highest_corner, start, end in zip(self._children[children], lowest_corners, highest_corners, starts, ends):
+            if start == end:
+                continue
+            near = order[start:end]
+            near = near[~found[near] & CSGNode._in_box(candidate_points[near], lowest_corner, highest_corner)]
+            if len(near):
+                found[near[child.is_inside_points(candidate_points[near])]] = True
+        return candidates[found] if keep_inside else candidates[~found]
+
+    def _set_children(self, children:tuple) -> None:
+        """Validates the children, caches their bounding boxes and registers the node as their observer."""
+
+        if not children:
+            raise ValueError(f"A {type(self).__name__} needs at least one figure.")
+
+        boxes = []
+        for child in children:
+            if not isinstance(child, Geometry):
+                raise TypeError(f"Please enter Geometry objects, not a {type(child)}.")
+            boxes.append(child.bounding_box())
+            if len(boxes[-1][0]) != len(boxes[0][0]):
+                raise ValueError(f"All figures must have the same number of dimensions, not {len(boxes[0][0])} and {len(boxes[-1][0])}.")
+
+        self._children, self._child_boxes, self._dimensions = tuple(children), boxes, len(boxes[0][0])
+        self._box_arrays = None
+        self._positions = {}
+        for position, child in enumerate(self._children):
+            self._positions.setdefault(id(child), []).append(position)
+            child.add_observer(self)
+        self._box = self._combine_boxes()
+
+    def _arrays(self) -> tuple:
+        """Returns the cached bounding boxes of the children as two arrays (lowest and highest corners), created when first needed."""
+
+        if self._box_arrays is None:
+            self._box_arrays = (np.array([box[0] for box in self._child_boxes], dtype=float),
+                                np.array([box[1] for box in self._child_boxes], dtype=float))
+        return self._box_arrays
+
+    def _offset(self) -> tuple:
+        """Returns the offset of the node, (x, y) or (x, y, z)."""
+
+        if self._dimensions == 2:
+            return (self._x_coordinate, self._y_coordinate)
+        return (self._x_coordinate, self._y_coordinate, self._z_coordinate)
+
+    def _validate_z(self, z_coordinate:float) -> float:
+        """Validates that the z-coordinate is numerical, and that it is 0 for 2D nodes."""
+
+        Geometry.validation_numerical(z_coordinate)
+        if self._dimensions == 2 and z_coordinate != 0:
+            raise ValueError("A 2D node has no z-coordinate.")
+        return z_coordinate
+
+    @staticmethod
+    def _box_contains(box:tuple, point:tuple) -> bool:
+        """Checks if a point is inside a box (including the edges)."""
+
+        return all(low <= value <= high for value, low, high in zip(point, box[0], box[1]))
+
+    @staticmethod
+    def _in_box(points:"np.ndarray", lowest_corner, highest_corner) -> "np.ndarray":
+        """Returns a boolean mask that is True for the points inside a box (including the edges)."""
+
+        return ((points >= lowest_corner) & (points <= highest_corner)).all(axis=1)
+
+
+    #GETTERS AND SETTERS
+
+    @property
+    def children(self) -> tuple:
+        """Returns the combined geometrical figures."""
+
+        return self._children
+
+    @property
+    def dimensions(self) -> int:
+        """Returns the number of dimensions of the children (2 or 3)."""
+
+        return self._dimensions
+
+    @property
+    def z_coordinate(self) -> float:
+        """Returns the offset along the z-axis (always 0 for 2D nodes)."""
+
+        return self._z_coordinate
+
+    @z_coordinate.setter
+    def z_coordinate(self, z_coordinate:float) -> None:
+        """
+        Validates that the z-coordinate is numerical (and 0 for 2D nodes), and assigns it to a private variable.
+
+        Parameters
+        ----------
+        z_coordinate : float
+            The offset of the node along the z-axis.
+
+        Raises
+        ------
+        TypeError
+            If z-coordinate is not int or float.
+        ValueError
+            If a 2D node gets a z-coordinate other than 0.
+
+        Returns
+        -------
+        None
+        """
+
+        self._z_coordinate = self._validate_z(z_coordinate)
+        self.notify_observers()
+
+
+class Union(CSGNode):
+    """The points inside any of the children: Union(child, child, ..., x_coordinate=0, y_coordinate=0, z_coordinate=0)."""
+
+    __slots__ = ()
+
+    def _contains(self, point:tuple) -> bool:
+        """Checks the children whose boxes contain the point, and stops at the first child that contains it."""
+
+        return any(child.is_inside(*point) for child in self._candidates(point))
+
+    def _contains_points(self, points:"np.ndarray", candidates:"np.ndarray") -> "np.ndarray":
+        """Checks the points that are not inside a child yet against the next child."""
+
+        return self._filter_by_children(points, candidates, slice(None), keep_inside=True)
+
+    def _combine_boxes(self) -> tuple:
+        """Returns the box around all children."""
+
+        lowest_corners, highest_corners = zip(*self._child_boxes)
+        return tuple(map(min, zip(*lowest_corners))), tuple(map(max, zip(*highest_corners)))
+
+
+class Intersection(CSGNode):
+    """The points inside all children: Intersection(child, child, ..., x_coordinate=0, y_coordinate=0, z_coordinate=0)."""
+
+    __slots__ = ()
+
+    def _contains(self, point:tuple) -> bool:
+        """Checks the children in order, and stops at the first child that does not contain the point."""
+
+        #The point is inside the overlap of all child boxes, so no box has to be checked
+        return all(child.is_inside(*point) for child in self._children)
+
+    def _contains_points(self, points:"np.ndarray", candidates:"np.ndarray") -> "np.ndarray":
+        """Checks the points that are inside all children so far against the next child."""
+
+        for child in self._children:
+            if len(candidates) == 0:
+                break
+            candidates = candidates[child.is_inside_points(points[candidates])]
+        return candidates
+
+    def _combine_boxes(self) -> tuple:
+        """Returns the overlap of the boxes of the children (the lowest corner is above the highest corner if they do not overlap)."""
+
+        lowest_corners, highest_corners = zip(*self._child_boxes)
+        return tuple(map(max, zip(*lowest_corners))), tuple(map(min, zip(*highest_corners)))
+
+
+class Difference(CSGNode):
+    """The points inside the first child but not inside any of the others: Difference(base, subtracted, ..., x_coordinate=0, y_coordinate=0, z_coordinate=0)."""
+
+    __slots__ = ()
+
+    def _contains(self, point:tuple) -> bool:
+        """Checks the first child, and then only the subtracted children whose boxes contain the point."""
+
+        if not self._children[0].is_inside(*point):
+            return False
+        return not any(child.is_inside(*point) for child in self._candidates(point, first=1))
+
+    def _contains_points(self, points:"np.ndarray", candidates:"np.ndarray") -> "np.ndarray":
+        """Keeps the points inside the first child, and removes the points inside any of the subtracted children."""
+
+        candidates = candidates[self._children[0].is_inside_points(points[candidates])]
+        return self._filter_by_children(points, candidates, slice(1, None), keep_inside=False)
+
+    def _combine_boxes(self) -> tuple:
+        """Returns the box of the first child (the subtracted children can only make the node smaller)."""
+
+        return self._child_boxes[0]
@@ -1,7 +1,4 @@
 from rectangle import Rectangle
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-import numpy as np
 
 class Cube(Rectangle):
     """
@@ -20,6 +17,8 @@ class Cube(Rectangle):
     
     Methods
     -------
+    from_trusted(side : float, x_coordinate : float = 0, y_coordinate : float = 0, z_coordinate : float = 0) -> Cube
+        Creates a Cube object without validating the values.
     translate(x_new_value : float, y_new_value : float, z_new_value : float) -> None:
         Sets the x, y and z-coordinates to new values.
     area() -> float
@@ -28,12 +27,18 @@ class Cube(Rectangle):
         Calculates the volume of a cube.
     is_inside(x_value : float, y_value : float, z_value : float) -> bool
         Checks if a point (x, y, z) is inside a cube.
+    is_inside_points(points : np.ndarray) -> np.ndarray
+        Checks which of many points (x, y, z) are inside a cube.
     plot_figure(fixed_scale10 : bool = False, point : tuple = None) -> None
         Creates a Cube object (and plots a point) in 3D, in a coordinate system.
+    bounding_box() -> tuple
+        Returns the lowest and the highest corner of the box around a cube.
     __repr__() -> str
         Returns information about the size and position of a cube.
     """
 
+    __slots__ = ("_side", "_z_coordinate")
+
     def __init__(self, side:float, x_coordinate:float=0, y_coordinate:float=0, z_coordinate:float=0) -> None: 
         """
         Parameters
@@ -53,6 +58,38 @@ class Cube(Rectangle):
         self.z_coordinate = z_coordinate
 
 
+    #CLASS METHODS
+
+    @classmethod
+    def from_trusted(cls, side:float, x_coordinate:float=0, y_coordinate:float=0, z_coordinate:float=0) -> "Cube":
+        """
+        Creates a Cube object without validating the values, for values from an already validated source.
+
+        The setters are not called, so the values must be ints or floats (and the sizes above zero).
+        Use the normal constructor for all other values.
+
+        Parameters
+        ----------
+        side : float
+            The length of the side of the cube.
+        x_coordinate : float
+            The x-coordinate at the centre of a cube (default 0).
+        y_coordinate : float
+            The y-coordinate at the centre of a cube (default 0).
+        z_coordinate : float
+            The z-coordinate at the centre of a cube (default 0).
+
+        Returns
+        -------
+        Cube
+            A new Cube object.
+        """
+
+        cube = super().from_trusted(side, side, x_coordinate, y_coordinate)
+        cube._side, cube._z_coordinate = side, z_coordinate
+        return cube
+
+
     #METHODS
 
     def translate(self, x_new_value:float, y_new_value:float, z_new_value:float) -> None:
@@ -78,8 +115,8 @@ class Cube(Rectangle):
         None
         """
 
+        self._z_coordinate = Rectangle.validation_numerical(z_new_value) #The z-coordinate is set first, since the observers are notified by super().translate
         super().translate(x_new_value, y_new_value) #Inherits the translate-method from the Rectangle class  - validates and sets the x and y-coordinates. Reference: https://www.geeksforgeeks.org/python-call-parent-class-method/
-        self._z_coordinate = Rectangle.validation_numerical(z_new_value)
         
     def area(self) -> float:
         """Calculates the surface area of a cube."""
@@ -127,6 +164,36 @@ class Cube(Rectangle):
         else:
             return False
 
+    def is_inside_points(self, points:"np.ndarray") -> "np.ndarray":
+        """
+        Checks which of many points (x, y, z) are inside a cube.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            An N x 3 array with one point (x, y, z) per row.
+        
+        Raises
+        ------
+        TypeError
+            If the values in points are not int or float.
+        ValueError
+            If points is not an N x 3 array.
+        
+        Returns
+        -------
+        np.ndarray
+            A boolean mask that is True for the points in the cube (including the edges of the cube).
+        """
+
+        points = Rectangle.validation_points(points, 3)
+        #The same bounds as is_inside, so that points on the edges give the same answer (abs(p - x) <= side/2 can round differently)
+        x_values, y_values, z_values = points[:, 0], points[:, 1], points[:, 2]
+        inside = ((self.x_coordinate-self.side/2) <= x_values) & (x_values <= (self.x_coordinate+self.side/2))
+        inside &= ((self.y_coordinate-self.side/2) <= y_values) & (y_values <= (self.y_coordinate+self.side/2))
+        inside &= ((self.z_coordinate-self.side/2) <= z_values) & (z_values <= (self.z_coordinate+self.side/2))
+        return inside
+
     def plot_figure(self, fixed_scale10:bool=False, point:tuple=None) -> None: #Reference: https://stackoverflow.com/questions/33540109/plot-surfaces-on-a-cube/33542678
         """
         Creates a Cube object (and plots a point) in 3D, in a coordinate system. 
@@ -147,16 +214,19 @@ class Cube(Rectangle):
         None
         """
 
+        import matplotlib.pyplot as plt #Imported here, so that matplotlib is only loaded when a figure is plotted (and not when importing the shapes)
+        from mpl_toolkits.mplot3d import Axes3D
+        from meshes import unit_cube_grid
+
         #Sets up the figure and axes
         fig = plt.figure(dpi=100)
         ax = fig.add_subplot(projection="3d")
 
-        #Returns three arrays of spherical coordinates, for the X, Y and Z-axis
-        phi = np.arange(1, 10, 2) * np.pi / 4
-        Phi, Theta = np.meshgrid(phi, phi)
-        X = (np.cos(Phi) * np.sin(Theta)) * self.side + self.x_coordinate
-        Y = (np.sin(Phi) * np.sin(Theta)) * self.side + self.y_coordinate
-        Z = (np.cos(Theta) / np.sqrt(2)) * self.side + self.z_coordinate
+        #Scales and translates the cached grids of a unit cube, for the X, Y and Z-axis
+        unit_x, unit_y, unit_z = unit_cube_grid()
+        X = unit_x * self.side + self.x_coordinate
+        Y = unit_y * self.side + self.y_coordinate
+        Z = unit_z * self.side + self.z_coordinate
 
         #Plots the surface of the cube
         ax.plot_surface(X, Y, Z, cmap="Greens", alpha=0.3)
@@ -166,12 +236,7 @@ class Cube(Rectangle):
             ax.plot(point[0], point[1], point[2], "ko")
         
         #Creates variables for the edges of the cube
-        lowest_x = self.x_coordinate-self.side/2
-        highest_x = self.x_coordinate+self.side/2
-        lowest_y = self.y_coordinate-self.side/2
-        highest_y = self.y_coordinate+self.side/2
-        lowest_z = self.z_coordinate-self.side/2
-        highest_z = self.z_coordinate+self.side/2
+        (lowest_x, lowest_y, lowest_z), (highest_x, highest_y, highest_z) = self.bounding_box()
 
         #Sets the scale, depending on the values of the cube and if fixed_scale10 is set to True
         if fixed_scale10 == True and lowest_x >= -10 and lowest_y >= -10 and lowest_z >= -10 and highest_x <= 10 and highest_y <= 10 and highest_z <= 10:
@@ -182,6 +247,19 @@ class Cube(Rectangle):
 
         plt.show()
 
+    def bounding_box(self) -> tuple:
+        """
+        Returns the lowest and the highest corner of the box around a cube.
+
+        Returns
+        -------
+        tuple
+            ((lowest_x, lowest_y, lowest_z), (highest_x, highest_y, highest_z))
+        """
+
+        return ((self.x_coordinate-self.side/2, self.y_coordinate-self.side/2, self.z_coordinate-self.side/2), 
+                (self.x_coordinate+self.side/2, self.y_coordinate+self.side/2, self.z_coordinate+self.side/2))
+
     def __repr__(self) -> str:
         """Returns information about the size and position of a cube."""
 
@@ -225,6 +303,7 @@ class Cube(Rectangle):
         """
 
         self._side = Rectangle.validation_numerical_above_zero(side)
+        self.notify_observers()
 
     @z_coordinate.setter
     def z_coordinate(self, z_coordinate:float) -> None:
@@ -246,4 +325,5 @@ class Cube(Rectangle):
         None
         """
 
-        self._z_coordinate = Rectangle.validation_numerical(z_coordinate)
\ No newline at end of file
+        self._z_coordinate = Rectangle.validation_numerical(z_coordinate)
+        self.notify_observers()
\ No newline at end of file
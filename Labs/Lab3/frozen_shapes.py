@@ -0,0 +1,256 @@
+from geometry import Geometry
+from circle import Circle
+from rectangle import Rectangle
+from sphere import Sphere
+from cube import Cube
+
+#The fields that decide if two shapes are congruent (the same fields that are compared by __eq__ in every Geometry subclass)
+SIZE_FIELDS = {Circle: ("radius",), Rectangle: ("length", "width"), Sphere: ("radius",), Cube: ("side",)}
+
+def congruence_key(shape, ignore_orientation:bool=False) -> tuple:
+    """
+    Returns a hashable key that is equal for two shapes if and only if they are congruent.
+
+    By default the key follows __eq__ of the Geometry classes: shapes of different types are never congruent,
+    and Rectangle(2, 3) is not congruent with Rectangle(3, 2), since the length is along the x-axis and the
+    width along the y-axis (is_inside gives different answers for them). With ignore_orientation=True the
+    length and width are sorted first, so that rectangles that only differ by a rotation of 90 degrees get the same key.
+
+    Parameters
+    ----------
+    shape : Geometry | FrozenShape
+        A Circle, Rectangle, Sphere or Cube object, or one of the frozen shapes.
+    ignore_orientation : bool
+        If True, the key of a rectangle does not depend on which side is along the x-axis (default False).
+
+    Raises
+    ------
+    TypeError
+        If the shape is not a Circle, Rectangle, Sphere or Cube (or a frozen version of them).
+
+    Returns
+    -------
+    tuple
+        (shape type, sizes), e.g. (Rectangle, (2, 3)).
+    """
+
+    shape_type = shape.shape_type if isinstance(shape, FrozenShape) else type(shape)
+    if shape_type not in SIZE_FIELDS:
+        raise TypeError(f"Please enter a Circle, Rectangle, Sphere or Cube, not a {type(shape)}.")
+
+    sizes = tuple(getattr(shape, field) for field in SIZE_FIELDS[shape_type])
+    if ignore_orientation:
+        sizes = tuple(sorted(sizes))
+    return shape_type, sizes
+
+def group_congruent(shapes, ignore_orientation:bool=False) -> dict:
+    """
+    Groups shapes that are congruent with each other, in one pass over the shapes (linear time).
+
+    Parameters
+    ----------
+    shapes : list
+        Circle, Rectangle, Sphere and Cube objects (or frozen versions of them, which are grouped with the mutable ones).
+    ignore_orientation : bool
+        If True, rectangles that only differ by a rotation of 90 degrees are grouped together (default False).
+
+    Raises
+    ------
+    TypeError
+        If a shape is not a Circle, Rectangle, Sphere or Cube (or a frozen version of them).
+
+    Returns
+    -------
+    dict
+        The congruence keys (see congruence_key), mapped to lists of the shapes with that key, in the order of the input.
+    """
+
+    groups = {}
+    for shape in shapes:
+        groups.setdefault(congruence_key(shape, ignore_orientation), []).append(shape)
+    return groups
+
+
+class FrozenShape:
+    """
+    A base class for immutable and hashable versions of the Geometry classes, to use as dict keys or in sets.
+
+    Two frozen shapes are equal when they are congruent, in the same way as the Geometry classes (the position
+    is not compared), and the hash only depends on the values that are compared. Since the values can not be
+    changed, the hash of a frozen shape never changes. Rectangles are not normalized, so FrozenRectangle(2, 3)
+    and FrozenRectangle(3, 2) are not equal (see congruence_key).
+
+    Class Methods
+    -------------
+    from_shape(shape : Geometry) -> FrozenShape
+        Creates a frozen shape from a Circle, Rectangle, Sphere or Cube object.
+
+    Instance Methods
+    ----------------
+    to_shape() -> Geometry
+        Creates a mutable Geometry object with the same values.
+    __eq__(other) -> bool
+        Checks if two frozen shapes are congruent.
+    __hash__() -> int
+        Returns a hash that is equal for congruent frozen shapes.
+    __repr__() -> str
+        Returns the values of a frozen shape, in the form of a call to the constructor.
+    """
+
+    __slots__ = ("_hash",)
+
+    #The Geometry subclass, the fields that are validated to be above zero, and all fields in the order of its constructor
+    shape_type = None
+    size_fields = ()
+    fields = ()
+
+    def __init__(self, *values:float) -> None:
+        """
+        Parameters
+        ----------
+        values : float
+            The values in the order of the fields (the coordinates default to 0).
+
+        Raises
+        ------
+        TypeError
+            If a value is not int or float, or if too many values are given.
+        ValueError
+            If a size is 0 or below.
+        """
+
+        if len(values) > len(self.fields):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.fields)} values, not {len(values)}.")
+        values = values + (0,)*(len(self.fields) - len(values))
+
+        for field, value in zip(self.fields, values):
+            if field in self.size_fields:
+                value = Geometry.validation_numerical_above_zero(value)
+            else:
+                value = Geometry.validation_numerical(value)
+            object.__setattr__(self, field, value) #__setattr__ is overridden to make the object immutable
+
+        #The values can not change, so the hash is calculated once
+        object.__setattr__(self, "_hash", hash(congruence_key(self)))
+
+
+    #CLASS METHODS
+
+    @classmethod
+    def from_shape(cls, shape:Geometry) -> "FrozenShape":
+        """
+        Creates a frozen shape from a Circle, Rectangle, Sphere or Cube object.
+
+        When called on FrozenShape, the frozen class is chosen from the type of the shape.
+
+        Parameters
+        ----------
+        shape : Geometry
+            The shape to copy the values from.
+
+        Raises
+        ------
+        TypeError
+            If there is no frozen version of the type of the shape.
+
+        Returns
+        -------
+        FrozenShape
+            A new frozen shape with the same values.
+        """
+
+        frozen_type = FROZEN_TYPES.get(type(shape)) if cls is FrozenShape else cls
+        if frozen_type is None or type(shape) != frozen_type.shape_type:
+            raise TypeError(f"Can not create a {cls.__name__} from a {type(shape)}.")
+        return frozen_type(*(getattr(shape, field) for field in frozen_type.fields))
+
+
+    #INSTANCE METHODS
+
+    def to_shape(self) -> Geometry:
+        """Creates a mutable Geometry object with the same values."""
+
+        return self.shape_type.from_trusted(*(getattr(self, field) for field in self.fields))
+
+    def __eq__(self, other) -> bool:
+        """
+        Checks if two frozen shapes are congruent.
+
+        Returns
+        -------
+        True
+            If the other object is a frozen shape of the same type, with the same size.
+        False
+            If the other object is not a frozen shape of the same type.
+            If the size of the two frozen shapes is not the same.
+        """
+
+        if type(self) != type(other):
+            return False
+        return all(getattr(self, field) == getattr(other, field) for field in self.size_fields)
+
+    def __hash__(self) -> int:
+        """Returns a hash that is equal for congruent frozen shapes (it does not depend on the position)."""
+
+        return self._hash
+
+    def __setattr__(self, name:str, value) -> None:
+        """Raises an AttributeError, since frozen shapes are immutable."""
+
+        raise AttributeError(f"{type(self).__name__} objects are immutable.")
+
+    def __delattr__(self, name:str) -> None:
+        """Raises an AttributeError, since frozen shapes are immutable."""
+
+        raise AttributeError(f"{type(self).__name__} objects are immutable.")
+
+    def __reduce__(self) -> tuple:
+        """Returns the constructor and its values, so that frozen shapes can be pickled and copied."""
+
+        return type(self), tuple(getattr(self, field) for field in self.fields)
+
+    def __repr__(self) -> str:
+        """Returns the values of a frozen shape, in the form of a call to the constructor."""
+
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.fields)
+        return f"{type(self).__name__}({values})"
+
+
+class FrozenCircle(FrozenShape):
+    """An immutable and hashable circle. Takes the same values as Circle: (radius, x_coordinate=0, y_coordinate=0)."""
+
+    __slots__ = ("radius", "x_coordinate", "y_coordinate")
+    shape_type = Circle
+    size_fields = ("radius",)
+    fields = ("radius", "x_coordinate", "y_coordinate")
+
+
+class FrozenRectangle(FrozenShape):
+    """An immutable and hashable rectangle. Takes the same values as Rectangle: (length, width, x_coordinate=0, y_coordinate=0)."""
+
+    __slots__ = ("length", "width", "x_coordinate", "y_coordinate")
+    shape_type = Rectangle
+    size_fields = ("length", "width")
+    fields = ("length", "width", "x_coordinate", "y_coordinate")
+
+
+class FrozenSphere(FrozenShape):
+    """An immutable and hashable sphere. Takes the same values as Sphere: (radius, x_coordinate=0, y_coordinate=0, z_coordinate=0)."""
+
+    __slots__ = ("radius", "x_coordinate", "y_coordinate", "z_coordinate")
+    shape_type = Sphere
+    size_fields = ("radius",)
+    fields = ("radius", "x_coordinate", "y_coordinate", "z_coordinate")
+
+
+class FrozenCube(FrozenShape):
+    """An immutable and hashable cube. Takes the same values as Cube: (side, x_coordinate=0, y_coordinate=0, z_coordinate=0)."""
+
+    __slots__ = ("side", "x_coordinate", "y_coordinate", "z_coordinate")
+    shape_type = Cube
+    size_fields = ("side",)
+    fields = ("side", "x_coordinate", "y_coordinate", "z_coordinate")
+
+
+#The frozen version of every Geometry subclass, used by FrozenShape.from_shape
+FROZEN_TYPES = {frozen_type.shape_type: frozen_type for frozen_type in (FrozenCircle, FrozenRectangle, FrozenSphere, FrozenCube)}
@@ -15,6 +15,18 @@ class Geometry(ABC):
     ----------------
     translate(x_new_value : float, y_new_value : float) -> None
         Sets the x-coordinate and the y-coordinate to new values.
+    add_observer(observer) -> None
+        Registers an object that is notified when the position or size of a geometrical figure changes.
+    remove_observer(observer) -> None
+        Unregisters an object that was registered with add_observer.
+    overlaps(other : Geometry) -> bool
+        Checks if two geometrical figures overlap (including touching edges).
+    notify_observers() -> None
+        Calls shape_changed on every registered observer.
+    __getstate__() -> dict
+        Returns the values to pickle (without the observers).
+    __setstate__(state : dict) -> None
+        Restores the values of an unpickled geometrical figure.
     
     Abstract Methods
     ----------------
@@ -24,8 +36,12 @@ class Geometry(ABC):
         Calculates the circumference of a geometrical figure.
     is_inside(x_value : float, y_value : float) -> bool
         Checks if a point (x, y) is inside a geometrical figure.
+    is_inside_points(points : np.ndarray) -> np.ndarray
+        Checks which of many points are inside a geometrical figure.
     plot_figure(fixed_scale10 : bool = False, point : tuple = None) -> None
         Plots a geometrical figure (and a point) in a coordinate system. 
+    bounding_box() -> tuple
+        Returns the lowest and the highest corner of the box around a geometrical figure.
     __eq__(self, other) -> bool
         Checks if two geometrical figures are congruent.
     __repr__() -> str
@@ -37,8 +53,13 @@ class Geometry(ABC):
         Validates that a value is numerical.
     validation_numerical_above_zero(value : float) -> float
         Validates that a value is numerical and above zero.
+    validation_points(points : np.ndarray, dimensions : int) -> np.ndarray
+        Validates that points are numerical and have the correct number of dimensions.
     """
 
+    #The attributes are stored in slots instead of in a __dict__, which makes every object smaller
+    __slots__ = ("_x_coordinate", "_y_coordinate", "_observers")
+
     def __init__(self, x_coordinate:float=0, y_coordinate:float=0) -> None:
         """
         Parameters
@@ -49,6 +70,7 @@ class Geometry(ABC):
             The y-coordinate at the centre of a geometrical figure (default 0).
         """
 
+        self._observers = () #Objects (e.g. a ShapeIndex) that are notified when the figure is moved or resized
         self.x_coordinate = x_coordinate
         self.y_coordinate  = y_coordinate
 
@@ -78,6 +100,86 @@ class Geometry(ABC):
 
         self._x_coordinate = Geometry.validation_numerical(x_new_value)
         self._y_coordinate = Geometry.validation_numerical(y_new_value)
+        self.notify_observers()
+
+    def add_observer(self, observer) -> None:
+        """
+        Registers an object that is notified when the position or size of a geometrical figure changes.
+
+        Parameters
+        ----------
+        observer
+            An object with a method shape_changed(shape), that is called with the geometrical figure after every change.
+
+        Returns
+        -------
+        None
+        """
+
+        if not any(registered is observer for registered in self._observers):
+            self._observers += (observer,)
+
+    def remove_observer(self, observer) -> None:
+        """
+        Unregisters an object that was registered with add_observer.
+
+        Parameters
+        ----------
+        observer
+            The object to unregister. Nothing happens if it is not registered.
+
+        Returns
+        -------
+        None
+        """
+
+        self._observers = tuple(registered for registered in self._observers if registered is not observer)
+
+    def overlaps(self, other:"Geometry") -> bool:
+        """
+        Checks if two geometrical figures overlap (including figures that only touch at the edges).
+
+        Parameters
+        ----------
+        other : Geometry
+            A Circle, Rectangle, Sphere or Cube object, with the same number of dimensions.
+
+        Raises
+        ------
+        TypeError
+            If a figure is not a Circle, Rectangle, Sphere or Cube.
+        ValueError
+            If the figures do not have the same number of dimensions.
+
+        Returns
+        -------
+        True
+            If the figures overlap or touch.
+        False
+            If the figures do not overlap.
+        """
+
+        from collisions import overlaps #Imported here, since the collisions module imports the subclasses of Geometry
+        return overlaps(self, other)
+
+    def __getstate__(self) -> dict:
+        """Returns the values to pickle. The observers are left out, since they only belong to the running program."""
+
+        names = (name for cls in type(self).__mro__ for name in getattr(cls, "__slots__", ()))
+        return {name: getattr(self, name) for name in names if name != "_observers" and hasattr(self, name)}
+
+    def __setstate__(self, state:dict) -> None:
+        """Restores the values of an unpickled geometrical figure, without any observers."""
+
+        self._observers = ()
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def notify_observers(self) -> None:
+        """Calls shape_changed on every registered observer. Used by the setters and translate, after a value has changed."""
+
+        for observer in self._observers:
+            observer.shape_changed(self)
 
 
     #ABSTRACT METHODS
@@ -100,12 +202,24 @@ class Geometry(ABC):
 
         pass
 
+    @abstractmethod
+    def is_inside_points(self, points:"np.ndarray") -> "np.ndarray":
+        """Checks which of many points are inside a geometrical figure."""
+
+        pass
+
     @abstractmethod
     def plot_figure(self, fixed_scale10:bool=False, point:tuple=None) -> None:
         "Plots a geometrical figure (and a point) in a coordinate system."
 
         pass
 
+    @abstractmethod
+    def bounding_box(self) -> tuple:
+        """Returns the lowest and the highest corner of the box around a geometrical figure."""
+
+        pass
+
     @abstractmethod
     def __eq__(self, other) -> bool:
         """Checks if two geometrical figures are congruent."""
@@ -177,6 +291,42 @@ class Geometry(ABC):
         else:
             return value    
 
+    @staticmethod
+    def validation_points(points:"np.ndarray", dimensions:int) -> "np.ndarray":
+        """
+        Validates that points are numerical and have the correct number of dimensions.
+        
+        Parameters
+        -----------
+        points : np.ndarray
+            The points to validate, one point per row. Expected to be an N x dimensions array of ints or floats 
+            (any object supporting the buffer protocol, or a nested sequence, is also accepted).
+        dimensions : int
+            The number of coordinates in every point (2 for a point (x, y) and 3 for a point (x, y, z)).
+        
+        Raises
+        ------
+        TypeError
+            If the values in points are not int or float.
+        ValueError
+            If points is not an N x dimensions array.
+
+        Returns
+        -------
+        points : np.ndarray
+            If no error has occured, the points are returned as a float64 array (without copying when possible).
+        """
+
+        import numpy as np #Imported here, so that NumPy is only loaded when points are validated (and not when importing the shapes)
+
+        points = np.asarray(points)
+        if points.dtype.kind not in "iuf":
+            raise TypeError(f"Please enter points with ints or floats, not {points.dtype}.")
+        elif points.ndim != 2 or points.shape[1] != dimensions:
+            raise ValueError(f"Please enter the points as an N x {dimensions} array, not an array with shape {points.shape}.")
+        else:
+            return np.asarray(points, dtype=np.float64)
+
 
     #GETTERS AND SETTERS
 
@@ -213,6 +363,7 @@ class Geometry(ABC):
         """
 
         self._x_coordinate = Geometry.validation_numerical(x_coordinate)
+        self.notify_observers()
     
     @y_coordinate.setter
     def y_coordinate(self, y_coordinate:float) -> None:
@@ -234,4 +385,5 @@ class Geometry(ABC):
         None
         """
 
-        self._y_coordinate = Geometry.validation_numerical(y_coordinate)
\ No newline at end of file
+        self._y_coordinate = Geometry.validation_numerical(y_coordinate)
+        self.notify_observers()
\ No newline at end of file
@@ -0,0 +1,333 @@
+from sphere import Sphere
+from cube import Cube
+from functools import lru_cache
+import numpy as np
+
+#The sphere resolutions that combine_meshes chooses from, from the finest to the coarsest (the level of detail)
+SPHERE_RESOLUTIONS = (32, 20, 12, 8, 6, 4)
+
+#UNIT GRIDS (used by plot_figure)
+
+@lru_cache(maxsize=None)
+def unit_sphere_grid(resolution:int=20) -> tuple:
+    """
+    Returns the X, Y and Z grids of a sphere with radius 1 at (0, 0, 0), for plot_surface.
+
+    The grids are calculated once for every resolution and then reused, so they are read-only:
+    scale and translate them into new arrays (e.g. x_coordinate + radius*X).
+
+    Parameters
+    ----------
+    resolution : int
+        The number of grid lines along every angle (default 20).
+
+    Returns
+    -------
+    tuple
+        (X, Y, Z), three resolution x resolution arrays.
+    """
+
+    u, v = np.mgrid[0:2*np.pi:resolution*1j, 0:np.pi:resolution*1j]
+    return _read_only(np.cos(u)*np.sin(v), np.sin(u)*np.sin(v), np.cos(v))
+
+@lru_cache(maxsize=None)
+def unit_cube_grid() -> tuple:
+    """
+    Returns the X, Y and Z grids of a cube with side 1 at (0, 0, 0), for plot_surface (calculated once and read-only).
+
+    Returns
+    -------
+    tuple
+        (X, Y, Z), three 5 x 5 arrays.
+    """
+
+    #The corners are at the angles pi/4, 3pi/4, ..., which gives the values -0.5 and 0.5 on every axis
+    phi = np.arange(1, 10, 2)*np.pi/4
+    Phi, Theta = np.meshgrid(phi, phi)
+    return _read_only(np.cos(Phi)*np.sin(Theta), np.sin(Phi)*np.sin(Theta), np.cos(Theta)/np.sqrt(2))
+
+
+#UNIT MESHES
+
+@lru_cache(maxsize=None)
+def unit_sphere_mesh(resolution:int=20) -> tuple:
+    """
+    Returns a triangle mesh of a sphere with radius 1 at (0, 0, 0), calculated once for every resolution (read-only).
+
+    Parameters
+    ----------
+    resolution : int
+        The number of vertices around the equator, at least 3 (default 20). The number of rings between the poles is resolution//2.
+
+    Raises
+    ------
+    ValueError
+        If resolution is not an int of at least 3.
+
+    Returns
+    -------
+    tuple
+        (vertices, faces): a V x 3 float64 array of points and an F x 3 int64 array of vertex indices, one triangle per row.
+    """
+
+    if not isinstance(resolution, int) or resolution < 3:
+        raise ValueError(f"resolution has to be an int of at least 3, not {resolution}.")
+
+    rings = max(2, resolution//2)
+    u = np.linspace(0, 2*np.pi, resolution, endpoint=False)
+    v = np.linspace(0, np.pi, rings + 1)[1:-1] #The poles are added separately, as one vertex each
+    U, V = np.meshgrid(u, v)
+    ring_vertices = np.column_stack((np.cos(U).ravel()*np.sin(V).ravel(), np.sin(U).ravel()*np.sin(V).ravel(), np.cos(V).ravel()))
+    vertices = np.vstack(([0, 0, 1], ring_vertices, [0, 0, -1]))
+
+    #The vertex number of (ring, segment), where the segments wrap around
+    ring, segment = np.meshgrid(np.arange(rings - 2), np.arange(resolution), indexing="ij")
+    ring, segment = ring.ravel(), segment.ravel()
+    next_segment = (segment + 1) % resolution
+    top_left, top_right = 1 + ring*resolution + segment, 1 + ring*resolution + next_segment
+    bottom_left, bottom_right = top_left + resolution, top_right + resolution
+    bottom_pole = len(vertices) - 1
+    last_ring = 1 + (rings - 2)*resolution
+    segments = np.arange(resolution)
+    #The vertices of every triangle are counter-clockwise seen from outside, so that the normals point outwards
+    faces = np.vstack((np.column_stack((np.zeros(resolution, dtype=np.int64), 1 + segments, 1 + (segments + 1) % resolution)),
+                       np.column_stack((top_left, bottom_left, top_right)),
+                       np.column_stack((top_right, bottom_left, bottom_right)),
+                       np.column_stack((last_ring + segments, np.full(resolution, bottom_pole), last_ring + (segments + 1) % resolution))))
+    return _read_only(vertices, faces.astype(np.int64))
+
+@lru_cache(maxsize=None)
+def unit_cube_mesh() -> tuple:
+    """
+    Returns a triangle mesh of a cube with side 1 at (0, 0, 0), calculated once (read-only).
+
+    Returns
+    -------
+    tuple
+        (vertices, faces): an 8 x 3 float64 array of corners and a 12 x 3 int64 array of vertex indices.
+    """
+
+    vertices = np.array([[x, y, z] for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)], dtype=np.float64)
+    #The vertex number is 4*x + 2*y + z (with 0 for -0.5 and 1 for 0.5), and the triangles are counter-clockwise seen from outside
+    faces = np.array([[0, 1, 2], [1, 3, 2], [4, 6, 5], [5, 6, 7],  #x = -0.5 and x = 0.5
+                      [0, 4, 1], [1, 4, 5], [2, 3, 6], [3, 7, 6],  #y = -0.5 and y = 0.5
+                      [0, 2, 4], [2, 6, 4], [1, 5, 3], [3, 5, 7]], #z = -0.5 and z = 0.5
+                     dtype=np.int64)
+    return _read_only(vertices, faces)
+
+
+#SCENES
+
+def choose_resolution(spheres:int, triangle_budget:int=500_000) -> int:
+    """
+    Returns the finest resolution in SPHERE_RESOLUTIONS that keeps all spheres within a number of triangles (the level of detail).
+
+    Parameters
+    ----------
+    spheres : int
+        The number of spheres in the scene.
+    triangle_budget : int
+        The largest number of triangles for all spheres together (default 500 000).
+
+    Returns
+    -------
+    int
+        A resolution for unit_sphere_mesh (the coarsest resolution if no resolution is within the budget).
+    """
+
+    for resolution in SPHERE_RESOLUTIONS:
+        if spheres*len(unit_sphere_mesh(resolution)[1]) <= triangle_budget:
+            return resolution
+    return SPHERE_RESOLUTIONS[-1]
+
+def combine_meshes(shapes:list, resolution:int=None, triangle_budget:int=500_000) -> tuple:
+    """
+    Combines the meshes of many spheres and cubes into one vertex array and one face array.
+
+    Every figure is the cached unit mesh, scaled and translated for all figures of a type at once.
+    The vertices of a figure come after the vertices of the figure before it, in the order of shapes.
+
+    Parameters
+    ----------
+    shapes : list
+        Sphere and Cube objects.
+    resolution : int
+        The resolution of the spheres (default None, which chooses it with choose_resolution).
+    triangle_budget : int
+        The largest number of triangles for the spheres, when the resolution is chosen (default 500 000).
+
+    Raises
+    ------
+    TypeError
+        If a figure is not a Sphere or a Cube.
+
+    Returns
+    -------
+    tuple
+        (vertices, faces): a V x 3 float64 array and an F x 3 int64 array of indices into vertices.
+    """
+
+    shapes = list(shapes)
+    is_sphere = np.array([_mesh_kind(shape) for shape in shapes], dtype=bool)
+    values = np.array([(shape.radius if sphere else shape.side, shape.x_coordinate, shape.y_coordinate, shape.z_coordinate)
+                       for shape, sphere in zip(shapes, is_sphere)], dtype=np.float64).reshape(-1, 4)
+    if resolution is None:
+        resolution = choose_resolution(int(is_sphere.sum()), triangle_budget)
+
+    #The number of vertices of every figure, and the first vertex of every figure in the combined array
+    sphere_vertices, sphere_faces = unit_sphere_mesh(resolution)
+    cube_vertices, cube_faces = unit_cube_mesh()
+    vertex_counts = np.where(is_sphere, len(sphere_vertices), len(cube_vertices))
+    first_vertices = np.cumsum(vertex_counts) - vertex_counts
+    face_counts = np.where(is_sphere, len(sphere_faces), len(cube_faces))
+    first_faces = np.cumsum(face_counts) - face_counts
+
+    vertices = np.empty((vertex_counts.sum(), 3), dtype=np.float64)
+    faces = np.empty((face_counts.sum(), 3), dtype=np.int64)
+    for mask, (unit_vertices, unit_faces) in ((is_sphere, (sphere_vertices, sphere_faces)), (~is_sphere, (cube_vertices, cube_faces))):
+        if not mask.any():
+            continue
+        sizes, centres = values[mask, 0], values[mask, 1:]
+        if mask.all():
+            #Only one type, so the rows of the figures are the whole arrays
+            vertex_rows, face_rows = slice(None), slice(None)
+        else:
+            #Row numbers of every vertex and face of the figures of this type, in the combined arrays
+            vertex_rows = (first_vertices[mask][:, None] + np.arange(len(unit_vertices))).ravel()
+            face_rows = (first_faces[mask][:, None] + np.arange(len(unit_faces))).ravel()
+        vertices[vertex_rows] = (centres[:, None, :] + sizes[:, None, None]*unit_vertices).reshape(-1, 3)
+        faces[face_rows] = (first_vertices[mask][:, None, None] + unit_faces).reshape(-1, 3)
+    return vertices, faces
+
+def plot_meshes(shapes:list, resolution:int=None, triangle_budget:int=100_000, path:str=None) -> None:
+    """
+    Plots many spheres and cubes as one Poly3DCollection of their combined meshes, instead of one surface per figure.
+
+    Parameters
+    ----------
+    shapes : list
+        Sphere and Cube objects.
+    resolution : int
+        The resolution of the spheres (default None, which chooses it with choose_resolution).
+    triangle_budget : int
+        The largest number of triangles for the spheres, when the resolution is chosen (default 100 000).
+    path : str
+        If given, the plot is saved to this file without opening a window (default None, which shows the plot).
+
+    Returns
+    -------
+    None
+    """
+
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection #Imported here, so that matplotlib is only loaded when a figure is plotted
+
+    vertices, faces = combine_meshes(shapes, resolution, triangle_budget)
+    if path is None:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(dpi=100)
+    else:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(dpi=100)
+        FigureCanvasAgg(fig)
+    ax = fig.add_subplot(projection="3d")
+    ax.add_collection3d(Poly3DCollection(vertices[faces], facecolor="cornflowerblue", edgecolor="none", alpha=0.5))
+    if len(vertices):
+        ax.set(xlim=(vertices[:, 0].min(), vertices[:, 0].max()), ylim=(vertices[:, 1].min(), vertices[:, 1].max()), 
+               zlim=(vertices[:, 2].min(), vertices[:, 2].max()))
+    ax.set(title=f"{len(shapes)} figures, {len(faces)} triangles", xlabel="x", ylabel="y", zlabel="z")
+
+    if path is None:
+        plt.show()
+    else:
+        fig.savefig(path)
+
+
+#EXPORT
+
+def write_obj(path, vertices:"np.ndarray", faces:"np.ndarray") -> None:
+    """
+    Writes a triangle mesh to a Wavefront OBJ text file.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The file to write.
+    vertices : np.ndarray
+        A V x 3 array of points.
+    faces : np.ndarray
+        An F x 3 array of indices into vertices (starting at 0, they are written starting at 1 as OBJ requires).
+
+    Returns
+    -------
+    None
+    """
+
+    vertices, faces = _validate_mesh(vertices, faces)
+    with open(path, "w") as file:
+        file.write(f"# {len(vertices)} vertices, {len(faces)} faces\n")
+        #The rows are formatted with one % operation per chunk, which is much faster than one per row (as in np.savetxt)
+        for rows, line in ((vertices, "v %.9g %.9g %.9g\n"), (faces + 1, "f %d %d %d\n")):
+            for start in range(0, len(rows), 100_000):
+                chunk = rows[start:start + 100_000]
+                file.write(line*len(chunk) % tuple(chunk.ravel().tolist()))
+
+def write_ply(path, vertices:"np.ndarray", faces:"np.ndarray") -> None:
+    """
+    Writes a triangle mesh to a binary (little-endian) PLY file, with float64 vertices and int32 vertex indices.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The file to write.
+    vertices : np.ndarray
+        A V x 3 array of points.
+    faces : np.ndarray
+        An F x 3 array of indices into vertices.
+
+    Returns
+    -------
+    None
+    """
+
+    vertices, faces = _validate_mesh(vertices, faces)
+    header = ("ply\nformat binary_little_endian 1.0\n"
+              f"element vertex {len(vertices)}\nproperty double x\nproperty double y\nproperty double z\n"
+              f"element face {len(faces)}\nproperty list uchar int vertex_indices\nend_header\n")
+
+    #Every face is stored as the number of vertices (3) followed by the indices
+    face_rows = np.empty(len(faces), dtype=[("count", "u1"), ("indices", "<i4", (3,))])
+    face_rows["count"], face_rows["indices"] = 3, faces
+    with open(path, "wb") as file:
+        file.write(header.encode("ascii"))
+        file.write(vertices.astype("<f8").tobytes())
+        file.write(face_rows.tobytes())
+
+
+#HELPERS
+
+def _mesh_kind(shape) -> bool:
+    """Returns True for a Sphere and False for a Cube, or raises a TypeError for other figures."""
+
+    if type(shape) == Sphere:
+        return True
+    if type(shape) == Cube:
+        return False
+    raise TypeError(f"Please enter Sphere or Cube objects, not a {type(shape)}.")
+
+def _read_only(*arrays:"np.ndarray") -> tuple:
+    """Makes cached arrays read-only, so that they can not be changed by mistake, and returns them as a tuple."""
+
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+def _validate_mesh(vertices:"np.ndarray", faces:"np.ndarray") -> tuple:
+    """Validates that vertices is a V x 3 array of numbers and faces an F x 3 array of indices into vertices."""
+
+    vertices, faces = np.asarray(vertices, dtype=np.float64), np.asarray(faces)
+    if vertices.ndim != 2 or vertices.shape[1] != 3 or faces.ndim != 2 or faces.shape[1] != 3:
+        raise ValueError(f"Please enter V x 3 vertices and F x 3 faces, not arrays with shapes {vertices.shape} and {faces.shape}.")
+    if faces.dtype.kind not in "iu" or (len(faces) and (faces.min() < 0 or faces.max() >= len(vertices))):
+        raise ValueError("The faces have to be integer indices into the vertices.")
+    return vertices, faces
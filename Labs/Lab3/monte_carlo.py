@@ -0,0 +1,292 @@
+from geometry import Geometry
+from collections import namedtuple
+from multiprocessing import Pool
+from statistics import NormalDist
+import math
+import numpy as np
+
+#The result of an estimation: the estimated area/volume, its standard error, the confidence interval (low, high) and the number of samples
+MonteCarloEstimate = namedtuple("MonteCarloEstimate", ["estimate", "standard_error", "confidence_interval", "samples"])
+
+def estimate_area(shapes, combine:str="union", samples:int=1_000_000, confidence:float=0.95, seed:int=None,
+                  chunk_size:int=1_000_000, processes:int=1) -> MonteCarloEstimate:
+    """
+    Estimates the area of the union or the intersection of 2D shapes (e.g. Circle and Rectangle), by random sampling.
+
+    Points are sampled uniformly in the bounding box of the combined shapes, and the area is the share of the points
+    that are inside, times the area of the box. See estimate_measure for the parameters.
+
+    Returns
+    -------
+    MonteCarloEstimate
+        (estimate, standard_error, confidence_interval, samples)
+    """
+
+    return estimate_measure(shapes, 2, combine, samples, confidence, seed, chunk_size, processes)
+
+def estimate_volume(shapes, combine:str="union", samples:int=1_000_000, confidence:float=0.95, seed:int=None,
+                    chunk_size:int=1_000_000, processes:int=1) -> MonteCarloEstimate:
+    """
+    Estimates the volume of the union or the intersection of 3D shapes (e.g. Sphere and Cube), by random sampling.
+
+    Points are sampled uniformly in the bounding box of the combined shapes, and the volume is the share of the points
+    that are inside, times the volume of the box. See estimate_measure for the parameters.
+
+    Returns
+    -------
+    MonteCarloEstimate
+        (estimate, standard_error, confidence_interval, samples)
+    """
+
+    return estimate_measure(shapes, 3, combine, samples, confidence, seed, chunk_size, processes)
+
+def estimate_measure(shapes, dimensions:int, combine:str="union", samples:int=1_000_000, confidence:float=0.95, seed:int=None,
+                     chunk_size:int=1_000_000, processes:int=1) -> MonteCarloEstimate:
+    """
+    Estimates the area (2D) or volume (3D) of the union or the intersection of shapes, by random sampling.
+
+    The samples are drawn in chunks of at most chunk_size points, so the memory use does not depend on the
+    number of samples. Every chunk gets its own random generator, spawned from the seed, so the result for a
+    seed and a chunk_size is the same for any number of processes.
+
+    Parameters
+    ----------
+    shapes : Geometry | list
+        A geometrical figure, or a list of geometrical figures with the same number of dimensions.
+    dimensions : int
+        The number of dimensions of the shapes (2 for an area and 3 for a volume).
+    combine : str
+        "union" for the points inside any of the shapes, or "intersection" for the points inside all of them (default "union").
+    samples : int
+        The number of random points (default 1 000 000).
+    confidence : float
+        The confidence level of the confidence interval, between 0 and 1 (default 0.95).
+    seed : int
+        The seed of the random points (default None, which gives different points every time).
+    chunk_size : int
+        The largest number of points that are sampled at the same time (default 1 000 000).
+    processes : int
+        The number of processes that sample chunks in parallel (default 1, which samples in this process).
+
+    Raises
+    ------
+    TypeError
+        If a shape is not a Geometry object.
+    ValueError
+        If the shapes do not have the given number of dimensions, if combine is not "union" or "intersection",
+        or if samples, confidence, chunk_size or processes are out of range.
+
+    Returns
+    -------
+    MonteCarloEstimate
+        (estimate, standard_error, confidence_interval, samples)
+    """
+
+    shapes = [shapes] if isinstance(shapes, Geometry) else list(shapes)
+    lowest_corner, highest_corner = sampling_box(shapes, dimensions, combine)
+    for name, value in (("samples", samples), ("chunk_size", chunk_size), ("processes", processes)):
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"{name} has to be an int above 0, not {value}.")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence has to be between 0 and 1, not {confidence}.")
+
+    box_measure = math.prod(high - low for low, high in zip(lowest_corner, highest_corner))
+    if box_measure == 0:
+        #The shapes do not overlap (intersection), so every point would be outside
+        return MonteCarloEstimate(0.0, 0.0, (0.0, 0.0), samples)
+
+    chunk_sizes = [chunk_size]*(samples//chunk_size) + ([samples % chunk_size] if samples % chunk_size else [])
+    tasks = [(seed_sequence, size, lowest_corner, highest_corner)
+             for seed_sequence, size in zip(np.random.SeedSequence(seed).spawn(len(chunk_sizes)), chunk_sizes)]
+
+    if processes == 1:
+        _initialise_worker(shapes, combine)
+        hits = sum(map(_count_hits, tasks))
+    else:
+        #The shapes are sent once to every process, instead of once for every chunk
+        with Pool(processes, initializer=_initialise_worker, initargs=(shapes, combine)) as pool:
+            hits = sum(pool.imap_unordered(_count_hits, tasks))
+
+    share = hits/samples
+    estimate = share*box_measure
+    standard_error = box_measure*math.sqrt(share*(1 - share)/samples)
+    z_value = NormalDist().inv_cdf((1 + confidence)/2)
+    return MonteCarloEstimate(estimate, standard_error, (estimate - z_value*standard_error, estimate + z_value*standard_error), samples)
+
+def estimate_boundary(shape:Geometry, samples:int=1_000_000, steps:int=500, confidence:float=0.95, seed:int=None,
+                      z_value:float=None, chunk_size:int=1_000_000) -> MonteCarloEstimate:
+    """
+    Estimates the circumference (2D) or the surface area (3D) of a shape, by counting how often random lines cross its edge.
+
+    The lines are uniformly random lines through the ball around the bounding box, and every line is sampled in
+    steps points. By the Cauchy-Crofton formula, the circumference is pi*R times the average number of crossings
+    per line (2D), and the surface area is 2*pi*R**2 times the average number of crossings (3D), where R is the
+    radius of the ball. Parts of the edge that are closer together than one step can be missed.
+
+    Parameters
+    ----------
+    shape : Geometry
+        A geometrical figure with 2 or 3 dimensions.
+    samples : int
+        The number of points, samples//steps lines are used (default 1 000 000).
+    steps : int
+        The number of points on every line (default 500).
+    confidence : float
+        The confidence level of the confidence interval, between 0 and 1 (default 0.95).
+    seed : int
+        The seed of the random lines (default None, which gives different lines every time).
+    z_value : float
+        For a 3D shape, the circumference of the cross-section in the plane z = z_value is estimated instead of the surface area (default None).
+    chunk_size : int
+        The largest number of points that are checked at the same time (default 1 000 000).
+
+    Raises
+    ------
+    TypeError
+        If shape is not a Geometry object.
+    ValueError
+        If samples is smaller than steps, if steps or chunk_size are not above 1 and 0, or if confidence is out of range.
+
+    Returns
+    -------
+    MonteCarloEstimate
+        (estimate, standard_error, confidence_interval, samples)
+    """
+
+    if not isinstance(shape, Geometry):
+        raise TypeError(f"Please enter a Geometry object, not a {type(shape)}.")
+    if not isinstance(steps, int) or steps <= 1:
+        raise ValueError(f"steps has to be an int above 1, not {steps}.")
+    if not isinstance(samples, int) or samples < steps:
+        raise ValueError(f"samples has to be an int of at least steps ({steps}), not {samples}.")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError(f"chunk_size has to be an int above 0, not {chunk_size}.")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence has to be between 0 and 1, not {confidence}.")
+
+    lowest_corner, highest_corner = (np.array(corner, dtype=float) for corner in shape.bounding_box())
+    dimensions = 2 if z_value is not None else len(lowest_corner)
+    lowest_corner, highest_corner = lowest_corner[:dimensions], highest_corner[:dimensions]
+    center = (lowest_corner + highest_corner)/2
+    radius = 1.01*math.hypot(*(highest_corner - lowest_corner))/2 #A little larger, so that the lines start and end outside the shape
+    if radius == 0:
+        return MonteCarloEstimate(0.0, 0.0, (0.0, 0.0), samples)
+
+    rng = np.random.default_rng(seed)
+    lines = samples//steps
+    crossings = np.empty(lines, dtype=np.int64)
+    fractions = np.linspace(-1, 1, steps)
+    for start in range(0, lines, max(1, chunk_size//steps)):
+        count = min(max(1, chunk_size//steps), lines - start)
+        if dimensions == 2:
+            angles = rng.uniform(0, math.pi, count)
+            directions = np.column_stack((np.cos(angles), np.sin(angles)))
+            offsets = rng.uniform(-radius, radius, count)[:, np.newaxis]*np.column_stack((-directions[:, 1], directions[:, 0]))
+        else:
+            directions = rng.normal(size=(count, 3))
+            directions /= np.linalg.norm(directions, axis=1)[:, np.newaxis]
+            #Two directions at right angles to every line, and a uniform point in the disk of radius R that they span
+            first = np.cross(directions, np.where(np.abs(directions[:, :1]) < 0.9, [[1.0, 0, 0]], [[0, 1.0, 0]]))
+            first /= np.linalg.norm(first, axis=1)[:, np.newaxis]
+            second = np.cross(directions, first)
+            distances, angles = radius*np.sqrt(rng.uniform(0, 1, count)), rng.uniform(0, 2*math.pi, count)
+            offsets = (distances*np.cos(angles))[:, np.newaxis]*first + (distances*np.sin(angles))[:, np.newaxis]*second
+
+        #The part of every line that is inside the ball, sampled in steps points
+        half_lengths = np.sqrt(np.maximum(radius**2 - np.einsum("ij,ij->i", offsets, offsets), 0))
+        points = center + offsets[:, np.newaxis, :] + (half_lengths[:, np.newaxis]*fractions)[:, :, np.newaxis]*directions[:, np.newaxis, :]
+        points = points.reshape(-1, dimensions)
+        if z_value is not None:
+            points = np.column_stack((points, np.full(len(points), float(z_value))))
+        inside = shape.is_inside_points(points).reshape(count, steps)
+        crossings[start:start + count] = np.count_nonzero(inside[:, 1:] != inside[:, :-1], axis=1)
+
+    constant = math.pi*radius if dimensions == 2 else 2*math.pi*radius**2
+    estimate = constant*crossings.mean()
+    standard_error = constant*crossings.std(ddof=1)/math.sqrt(lines) if lines > 1 else math.inf
+    z = NormalDist().inv_cdf((1 + confidence)/2)
+    return MonteCarloEstimate(estimate, standard_error, (estimate - z*standard_error, estimate + z*standard_error), samples)
+
+def sampling_box(shapes:list, dimensions:int, combine:str) -> tuple:
+    """
+    Returns the box that the points are sampled in: the box around all shapes (union) or the overlap of their boxes (intersection).
+
+    Parameters
+    ----------
+    shapes : list
+        Geometrical figures with the same number of dimensions.
+    dimensions : int
+        The number of dimensions of the shapes.
+    combine : str
+        "union" or "intersection".
+
+    Raises
+    ------
+    TypeError
+        If a shape is not a Geometry object.
+    ValueError
+        If there are no shapes, if a shape does not have the given number of dimensions, or if combine is not "union" or "intersection".
+
+    Returns
+    -------
+    tuple
+        (lowest_corner, highest_corner). For an intersection without overlap, both corners are the same point.
+    """
+
+    if combine not in ("union", "intersection"):
+        raise ValueError(f'combine has to be "union" or "intersection", not {combine!r}.')
+    if not shapes:
+        raise ValueError("Please enter at least one shape.")
+
+    boxes = []
+    for shape in shapes:
+        if not isinstance(shape, Geometry):
+            raise TypeError(f"Please enter Geometry objects, not a {type(shape)}.")
+        box = shape.bounding_box()
+        if len(box[0]) != dimensions:
+            raise ValueError(f"All shapes must have {dimensions} dimensions, not {len(box[0])}.")
+        boxes.append(box)
+
+    lowest_values, highest_values = zip(*((box[0], box[1]) for box in boxes))
+    if combine == "union":
+        return tuple(map(min, zip(*lowest_values))), tuple(map(max, zip(*highest_values)))
+
+    lowest_corner, highest_corner = tuple(map(max, zip(*lowest_values))), tuple(map(min, zip(*highest_values)))
+    if any(low >= high for low, high in zip(lowest_corner, highest_corner)):
+        return lowest_corner, lowest_corner
+    return lowest_corner, highest_corner
+
+
+#WORKERS
+
+#The shapes and the way they are combined, set once in every process by _initialise_worker
+_worker_state = {}
+
+def _initialise_worker(shapes:list, combine:str) -> None:
+    """Stores the shapes in the process, so that they are not sent with every chunk."""
+
+    _worker_state["shapes"], _worker_state["combine"] = shapes, combine
+
+def _count_hits(task:tuple) -> int:
+    """Samples one chunk of points and returns how many of them are inside the combined shapes."""
+
+    seed_sequence, size, lowest_corner, highest_corner = task
+    points = np.random.default_rng(seed_sequence).uniform(lowest_corner, highest_corner, (size, len(lowest_corner)))
+
+    if _worker_state["combine"] == "union":
+        #Only the points that are not inside any shape yet have to be checked against the next shape
+        inside = np.zeros(size, dtype=bool)
+        for shape in _worker_state["shapes"]:
+            undecided = np.flatnonzero(~inside)
+            if len(undecided) == 0:
+                break
+            inside[undecided] = shape.is_inside_points(points[undecided])
+    else:
+        #Only the points that are inside all shapes so far have to be checked against the next shape
+        inside = np.ones(size, dtype=bool)
+        for shape in _worker_state["shapes"]:
+            candidates = np.flatnonzero(inside)
+            if len(candidates) == 0:
+                break
+            inside[candidates] = shape.is_inside_points(points[candidates])
+    return int(np.count_nonzero(inside))
@@ -1,6 +1,4 @@
 from geometry import Geometry
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle as plt_rect
 
 class Rectangle(Geometry):
     """
@@ -19,20 +17,28 @@ class Rectangle(Geometry):
     
     Methods
     -------
+    from_trusted(length : float, width : float, x_coordinate : float = 0, y_coordinate : float = 0) -> Rectangle
+        Creates a Rectangle object without validating the values.
     area() -> float
         Calculates the area of a rectangle.
     circumference() -> float
         Calculates the circumference of a rectangle.
     is_inside(x_value : float, y_value : float) -> bool
         Checks if a point (x, y) is inside a rectangle.
+    is_inside_points(points : np.ndarray) -> np.ndarray
+        Checks which of many points (x, y) are inside a rectangle.
     plot_figure(fixed_scale10 : bool = False, point : tuple = None) -> None
         Plots a Rectangle object (and a point) in a coordinate system.
+    bounding_box() -> tuple
+        Returns the lowest and the highest corner of the box around a rectangle.
     __eq__(self, other) -> bool
         Checks if two rectangles are congruent.
     __repr__() -> str
         Returns information about the size and position of a rectangle.
     """
 
+    __slots__ = ("_length", "_width")
+
     def __init__(self, length:float, width:float, x_coordinate:float=0, y_coordinate:float=0) -> None:
         """
         Parameters
@@ -50,6 +56,39 @@ class Rectangle(Geometry):
         super().__init__(x_coordinate, y_coordinate)
         self.length = length
         self.width = width
+
+
+    #CLASS METHODS
+
+    @classmethod
+    def from_trusted(cls, length:float, width:float, x_coordinate:float=0, y_coordinate:float=0) -> "Rectangle":
+        """
+        Creates a Rectangle object without validating the values, for values from an already validated source.
+
+        The setters are not called, so the values must be ints or floats (and the sizes above zero).
+        Use the normal constructor for all other values.
+
+        Parameters
+        ----------
+        length : float
+            The length of a rectangle (along the x-axis.)
+        width : float
+            The width of a rectangle (along the y-axis.)
+        x_coordinate : float
+            The x-coordinate at the centre of a rectangle (default 0).
+        y_coordinate : float
+            The y-coordinate at the centre of a rectangle (default 0).
+
+        Returns
+        -------
+        Rectangle
+            A new Rectangle object.
+        """
+
+        rectangle = cls.__new__(cls)
+        rectangle._observers = ()
+        rectangle._x_coordinate, rectangle._y_coordinate, rectangle._length, rectangle._width = x_coordinate, y_coordinate, length, width
+        return rectangle
     
 
     #METHODS
@@ -97,6 +136,35 @@ class Rectangle(Geometry):
         else:
             return False
     
+    def is_inside_points(self, points:"np.ndarray") -> "np.ndarray":
+        """
+        Checks which of many points (x, y) are inside a rectangle.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            An N x 2 array with one point (x, y) per row.
+        
+        Raises
+        ------
+        TypeError
+            If the values in points are not int or float.
+        ValueError
+            If points is not an N x 2 array.
+        
+        Returns
+        -------
+        np.ndarray
+            A boolean mask that is True for the points in the rectangle (including the edges of the rectangle).
+        """
+
+        points = Geometry.validation_points(points, 2)
+        #The same bounds as is_inside, so that points on the edges give the same answer (abs(p - x) <= l/2 can round differently)
+        x_values, y_values = points[:, 0], points[:, 1]
+        inside = ((self.x_coordinate-self.length/2) <= x_values) & (x_values <= (self.x_coordinate+self.length/2))
+        inside &= ((self.y_coordinate-self.width/2) <= y_values) & (y_values <= (self.y_coordinate+self.width/2))
+        return inside
+
     def plot_figure(self, fixed_scale10:bool=False, point:tuple=None) -> None: #https://www.geeksforgeeks.org/matplotlib-patches-rectangle-in-python/
         """
         Plots a Rectangle object in a coordinate system.
@@ -117,6 +185,9 @@ class Rectangle(Geometry):
         None
         """
 
+        import matplotlib.pyplot as plt #Imported here, so that matplotlib is only loaded when a figure is plotted (and not when importing the shapes)
+        from matplotlib.patches import Rectangle as plt_rect
+
         #Sets up the figure and axes
         fig = plt.figure(dpi=100)
         ax = fig.add_subplot()
@@ -126,10 +197,7 @@ class Rectangle(Geometry):
             ax.plot(point[0], point[1], "ko")
 
         #Creates variables for the edges of the rectangle
-        lowest_x = self.x_coordinate-self.length/2
-        highest_x = self.x_coordinate+self.length/2 
-        lowest_y = self.y_coordinate-self.width/2
-        highest_y = self.y_coordinate+self.width/2
+        (lowest_x, lowest_y), (highest_x, highest_y) = self.bounding_box()
 
         #Creates a rectangle and adds the Patch to the axis
         rectangle_figure = plt_rect((lowest_x, lowest_y), self.length, self.width, facecolor="forestgreen", edgecolor="black")
@@ -147,6 +215,19 @@ class Rectangle(Geometry):
         
         plt.show()
 
+    def bounding_box(self) -> tuple:
+        """
+        Returns the lowest and the highest corner of the box around a rectangle.
+
+        Returns
+        -------
+        tuple
+            ((lowest_x, lowest_y), (highest_x, highest_y))
+        """
+
+        return ((self.x_coordinate-self.length/2, self.y_coordinate-self.width/2), 
+                (self.x_coordinate+self.length/2, self.y_coordinate+self.width/2))
+
     def __eq__(self, other) -> bool:
         """
         Checks if two rectangles are congruent.
@@ -216,6 +297,7 @@ class Rectangle(Geometry):
         """
 
         self._length = Geometry.validation_numerical_above_zero(length)
+        self.notify_observers()
 
     @width.setter
     def width(self, width:float) -> None:
@@ -239,4 +321,5 @@ class Rectangle(Geometry):
         None
         """
         
-        self._width = Geometry.validation_numerical_above_zero(width)
\ No newline at end of file
+        self._width = Geometry.validation_numerical_above_zero(width)
+        self.notify_observers()
\ No newline at end of file
@@ -0,0 +1,230 @@
+from circle import Circle
+from rectangle import Rectangle
+from multiprocessing import Pool
+import os
+import numpy as np
+
+class BatchRenderer:
+    """
+    A class used for drawing many geometrical figures to image files, without a window (and without plt.show()).
+
+    One matplotlib Figure with an Agg canvas (which does not need a display) is created once and reused for
+    every image: only the drawn collections are replaced. All circles (and spheres) of an image are drawn as one
+    EllipseCollection and all rectangles (and cubes) as one PolyCollection, instead of one artist per figure.
+    Spheres and cubes are drawn from above, as their projection on the xy-plane.
+
+    Attributes
+    ----------
+    size : tuple
+        The (width, height) of the images in inches (default (4, 4)).
+    dpi : int
+        The dots per inch of raster images (default 100).
+    show_axes : bool
+        If False, the axes (ticks, labels and frame) are not drawn, which is about twice as fast (default True).
+
+    Methods
+    -------
+    render(shapes : list, path : str, point : tuple = None, title : str = None, limits : tuple = None) -> str
+        Draws geometrical figures (and a point) to one image file.
+    """
+
+    def __init__(self, size:tuple=(4, 4), dpi:int=100, show_axes:bool=True) -> None:
+        """
+        Parameters
+        ----------
+        size : tuple
+            The (width, height) of the images in inches (default (4, 4)).
+        dpi : int
+            The dots per inch of raster images (default 100).
+        show_axes : bool
+            If False, the axes (ticks, labels and frame) are not drawn (default True).
+        """
+
+        #Imported here, so that matplotlib is only loaded when a renderer is created (pyplot is never imported)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.size, self.dpi, self.show_axes = size, dpi, show_axes
+        self._figure = Figure(figsize=size, dpi=dpi)
+        FigureCanvasAgg(self._figure)
+        self._axes = self._figure.add_subplot()
+        self._axes.set_aspect('equal', adjustable='box')
+        self._axes.set(xlabel="x", ylabel="y")
+        if not show_axes:
+            self._axes.set_axis_off()
+        self._artists = []
+
+
+    #METHODS
+
+    def render(self, shapes:list, path:str, point:tuple=None, title:str=None, limits:tuple=None) -> str:
+        """
+        Draws geometrical figures (and a point) to one image file.
+
+        Parameters
+        ----------
+        shapes : list
+            Circle, Rectangle, Sphere and Cube objects (a single figure is also accepted).
+        path : str
+            The file to write. The format is chosen from the extension (e.g. ".png" or ".svg").
+        point : tuple
+            Draws a point (x, y) in the image (default None).
+        title : str
+            The title of the image (default None, which is the type of a single figure and the number of figures otherwise).
+        limits : tuple
+            ((lowest_x, highest_x), (lowest_y, highest_y)) of the axes (default None, which zooms in on the figures).
+
+        Raises
+        ------
+        TypeError
+            If a figure is not a Circle, Rectangle, Sphere or Cube.
+
+        Returns
+        -------
+        str
+            The path of the written file.
+        """
+
+        from matplotlib.collections import EllipseCollection, PolyCollection
+
+        if isinstance(shapes, (Circle, Rectangle)):
+            shapes = [shapes]
+        is_ball, lowest_corners, highest_corners = BatchRenderer._columns(shapes)
+        for artist in self._artists:
+            artist.remove()
+        self._artists = []
+
+        centres, sides = (lowest_corners + highest_corners)/2, highest_corners - lowest_corners
+        #The same colours as in plot_figure: circles (and spheres) are blue, rectangles (and cubes) are green
+        if is_ball.any():
+            self._artists.append(self._axes.add_collection(EllipseCollection(
+                sides[is_ball, 0], sides[is_ball, 1], np.zeros(is_ball.sum()), units="xy", offsets=centres[is_ball],
+                offset_transform=self._axes.transData, facecolor="cornflowerblue", edgecolor="black")))
+        if not is_ball.all():
+            low, high = lowest_corners[~is_ball], highest_corners[~is_ball]
+            corners = np.stack([low, np.column_stack((high[:, 0], low[:, 1])), high, np.column_stack((low[:, 0], high[:, 1]))], axis=1)
+            self._artists.append(self._axes.add_collection(PolyCollection(corners, facecolor="forestgreen", edgecolor="black")))
+        if point != None:
+            self._artists.extend(self._axes.plot(point[0], point[1], "ko"))
+
+        if limits is None and len(shapes):
+            #Some space on the sides of the figures, as in plot_figure
+            margin = (highest_corners.max(axis=0) - lowest_corners.min(axis=0)).max()/4
+            limits = ((lowest_corners[:, 0].min() - margin, highest_corners[:, 0].max() + margin),
+                      (lowest_corners[:, 1].min() - margin, highest_corners[:, 1].max() + margin))
+        if limits is not None:
+            self._axes.set(xlim=limits[0], ylim=limits[1])
+        if title is None:
+            title = type(shapes[0]).__name__ if len(shapes) == 1 else f"{len(shapes)} figures"
+        self._axes.set_title(title, fontsize="small")
+
+        self._figure.savefig(path)
+        return path
+
+
+    #HELPERS
+
+    @staticmethod
+    def _columns(shapes:list) -> tuple:
+        """Returns a boolean array that is True for circles and spheres, and the lowest and highest (x, y) corners of the figures."""
+
+        is_ball, corners = [], []
+        for shape in shapes:
+            if not isinstance(shape, (Circle, Rectangle)): #Sphere and Cube are subclasses of Circle and Rectangle
+                raise TypeError(f"Please enter Circle, Rectangle, Sphere or Cube objects, not a {type(shape)}.")
+            lowest_corner, highest_corner = shape.bounding_box()
+            is_ball.append(isinstance(shape, Circle))
+            corners.append(lowest_corner[:2] + highest_corner[:2])
+        corners = np.array(corners, dtype=float).reshape(-1, 4)
+        return np.array(is_ball, dtype=bool), corners[:, :2], corners[:, 2:]
+
+
+def render_files(jobs:list, processes:int=1, size:tuple=(4, 4), dpi:int=100, show_axes:bool=True) -> list:
+    """
+    Draws many images, in parallel in several processes, with one reused BatchRenderer in every process.
+
+    Parameters
+    ----------
+    jobs : list
+        (path, shapes) pairs, one for every image (shapes can be a list of figures or a single figure).
+    processes : int
+        The number of processes that draw images in parallel (default 1, which draws in this process).
+    size : tuple
+        The (width, height) of the images in inches (default (4, 4)).
+    dpi : int
+        The dots per inch of raster images (default 100).
+    show_axes : bool
+        If False, the axes (ticks, labels and frame) are not drawn (default True).
+
+    Raises
+    ------
+    TypeError
+        If a figure is not a Circle, Rectangle, Sphere or Cube.
+    ValueError
+        If processes is not an int above 0.
+
+    Returns
+    -------
+    list
+        The paths of the written files, in the order of the jobs.
+    """
+
+    if not isinstance(processes, int) or processes <= 0:
+        raise ValueError(f"processes has to be an int above 0, not {processes}.")
+    jobs = list(jobs)
+    if processes == 1:
+        renderer = BatchRenderer(size, dpi, show_axes)
+        return [renderer.render(shapes, path) for path, shapes in jobs]
+
+    #The jobs are sent in chunks, so that every process draws many images with the same renderer
+    chunk_size = max(1, len(jobs)//(processes*4))
+    chunks = [jobs[start:start + chunk_size] for start in range(0, len(jobs), chunk_size)]
+    with Pool(processes, initializer=_initialise_worker, initargs=(size, dpi, show_axes)) as pool:
+        return [path for paths in pool.imap(_render_chunk, chunks) for path in paths]
+
+def render_thumbnails(shapes:list, directory:str, file_format:str="png", processes:int=1, size:tuple=(2, 2), dpi:int=100, show_axes:bool=False) -> list:
+    """
+    Draws one image file (a thumbnail) for every geometrical figure.
+
+    Parameters
+    ----------
+    shapes : list
+        Circle, Rectangle, Sphere and Cube objects.
+    directory : str
+        The directory of the files, which are named shape_0.png, shape_1.png, ... (it is created if it does not exist).
+    file_format : str
+        The file format, e.g. "png" or "svg" (default "png").
+    processes : int
+        The number of processes that draw images in parallel (default 1).
+    size : tuple
+        The (width, height) of the images in inches (default (2, 2)).
+    dpi : int
+        The dots per inch of raster images (default 100).
+    show_axes : bool
+        If True, the axes (ticks, labels and frame) are drawn (default False).
+
+    Returns
+    -------
+    list
+        The paths of the written files, in the order of the figures.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    jobs = [(os.path.join(directory, f"shape_{number}.{file_format}"), shape) for number, shape in enumerate(shapes)]
+    return render_files(jobs, processes, size, dpi, show_axes)
+
+
+#WORKERS
+
+#The renderer of a worker process, created once by _initialise_worker
+_worker_state = {}
+
+def _initialise_worker(size:tuple, dpi:int, show_axes:bool) -> None:
+    """Creates the renderer that is reused for all images drawn by the process."""
+
+    _worker_state["renderer"] = BatchRenderer(size, dpi, show_axes)
+
+def _render_chunk(jobs:list) -> list:
+    """Draws a chunk of (path, shapes) jobs and returns their paths."""
+
+    return [_worker_state["renderer"].render(shapes, path) for path, shapes in jobs]
@@ -0,0 +1,779 @@
+from abc import ABC, abstractmethod
+from circle import Circle
+from rectangle import Rectangle
+from sphere import Sphere
+from cube import Cube
+import numpy as np
+
+class ShapeArray(ABC):
+    """
+    An abstract class, used for representing many geometrical figures of the same type as NumPy columns.
+
+    Every field of the figures (e.g. the radius or the x-coordinate) is kept in its own contiguous
+    float64 array, so that calculations are done for all figures at once instead of one object at a time.
+
+    Attributes
+    ----------
+    x_coordinates : np.ndarray
+        The x-coordinates at the centre of the geometrical figures.
+    y_coordinates : np.ndarray
+        The y-coordinates at the centre of the geometrical figures.
+
+    Class Methods
+    -------------
+    from_shapes(shapes : list) -> ShapeArray
+        Creates a ShapeArray from a list of Geometry objects.
+    from_trusted(*columns : np.ndarray) -> ShapeArray
+        Creates a ShapeArray from float64 columns without validating (or reading) the values.
+
+    Instance Methods
+    ----------------
+    to_shapes() -> list
+        Converts the ShapeArray to a list of Geometry objects.
+    translate(x_new_values : np.ndarray, y_new_values : np.ndarray) -> None
+        Sets the x-coordinates and the y-coordinates to new values.
+    __len__() -> int
+        Returns the number of geometrical figures.
+    __getitem__(item) -> Geometry | ShapeArray
+        Returns one geometrical figure (int) or a new ShapeArray (slice, index array or boolean mask).
+
+    Abstract Methods
+    ----------------
+    area() -> np.ndarray
+        Calculates the area of every geometrical figure.
+    circumference() -> np.ndarray
+        Calculates the circumference of every geometrical figure.
+    is_inside(x_value : float, y_value : float) -> np.ndarray
+        Checks which geometrical figures a point (x, y) is inside.
+
+    Static Methods
+    --------------
+    validation_numerical(values) -> np.ndarray
+        Validates that values are numerical, and returns them as a float64 array.
+    validation_numerical_above_zero(values) -> np.ndarray
+        Validates that values are numerical and above zero, and returns them as a float64 array.
+    """
+
+    #The Geometry subclass that is stored, the names of its fields in the order of its constructor and the matching column properties
+    shape_type = None
+    fields = ()
+    columns = ()
+
+    def __init__(self, x_coordinates=0, y_coordinates=0, size:int=None) -> None:
+        """
+        Parameters
+        ----------
+        x_coordinates : np.ndarray
+            The x-coordinates at the centre of the geometrical figures (default 0).
+        y_coordinates : np.ndarray
+            The y-coordinates at the centre of the geometrical figures (default 0).
+        size : int
+            The number of geometrical figures. Scalar coordinates are broadcast to this size.
+        """
+
+        self._size = size
+        self._x_coordinates = self._column(x_coordinates)
+        self._y_coordinates = self._column(y_coordinates)
+
+
+    #CLASS METHODS
+
+    @classmethod
+    def from_shapes(cls, shapes:list) -> "ShapeArray":
+        """
+        Creates a ShapeArray from a list of Geometry objects.
+
+        Parameters
+        ----------
+        shapes : list
+            Geometry objects of exactly the type stored by the ShapeArray (e.g. Circle for a CircleArray).
+
+        Raises
+        ------
+        TypeError
+            If a shape is not of the type stored by the ShapeArray.
+
+        Returns
+        -------
+        ShapeArray
+            A new ShapeArray holding the values of the shapes.
+        """
+
+        for shape in shapes:
+            if type(shape) != cls.shape_type: #Sphere is a subclass of Circle, so isinstance would drop the z-coordinate
+                raise TypeError(f"Please enter {cls.shape_type.__name__} objects, not a {type(shape)}.")
+
+        columns = np.array([[getattr(shape, field) for field in cls.fields] for shape in shapes], dtype=np.float64).reshape(-1, len(cls.fields))
+        return cls(*columns.T)
+
+    @classmethod
+    def from_trusted(cls, *columns:np.ndarray) -> "ShapeArray":
+        """
+        Creates a ShapeArray without validating the values, for columns from an already validated source.
+
+        The columns are used as they are (without copying), and no value is read, so a memory-mapped column
+        stays on the disk until it is used. The columns must be one-dimensional float64 arrays of the same
+        length, in the order of columns (and the sizes above zero). Use the normal constructor for all other values.
+
+        Parameters
+        ----------
+        *columns : np.ndarray
+            One array for every column of the ShapeArray (e.g. radii, x_coordinates and y_coordinates for a CircleArray).
+
+        Returns
+        -------
+        ShapeArray
+            A new ShapeArray holding the columns.
+        """
+
+        array = cls.__new__(cls)
+        array._size = len(columns[0])
+        for column, values in zip(cls.columns, columns):
+            setattr(array, "_" + column, values)
+        return array
+
+
+    #INSTANCE METHODS
+
+    def to_shapes(self) -> list:
+        """Converts the ShapeArray to a list of Geometry objects."""
+
+        #The columns have already been validated, so the objects are created without validating every value again
+        columns = [getattr(self, column).tolist() for column in self.columns]
+        return [self.shape_type.from_trusted(*values) for values in zip(*columns)]
+
+    def translate(self, x_new_values, y_new_values) -> None:
+        """
+        Sets the x-coordinates and the y-coordinates to new values.
+
+        Parameters
+        ----------
+        x_new_values : np.ndarray
+            The new values for the x-coordinates (a scalar is used for every figure).
+        y_new_values : np.ndarray
+            The new values for the y-coordinates (a scalar is used for every figure).
+
+        Raises
+        ------
+        TypeError
+            If values are not int or float.
+        ValueError
+            If the number of values does not match the number of figures.
+
+        Returns
+        -------
+        None
+        """
+
+        x_new_values = self._column(x_new_values)
+        y_new_values = self._column(y_new_values)
+        self._x_coordinates, self._y_coordinates = x_new_values, y_new_values
+
+    def __len__(self) -> int:
+        """Returns the number of geometrical figures."""
+
+        return self._size
+
+    def __getitem__(self, item):
+        """Returns one geometrical figure (int) or a new ShapeArray (slice, index array or boolean mask)."""
+
+        if isinstance(item, (int, np.integer)):
+            return self.shape_type.from_trusted(*(getattr(self, column)[item].item() for column in self.columns))
+        return type(self)(*(getattr(self, column)[item] for column in self.columns))
+
+    def __repr__(self) -> str:
+        """Returns information about the number and type of the stored figures."""
+
+        return f"{type(self).__name__} with {len(self)} {self.shape_type.__name__.lower()} objects."
+
+
+    #ABSTRACT METHODS
+
+    @abstractmethod
+    def area(self) -> np.ndarray:
+        """Calculates the area of every geometrical figure."""
+
+        pass
+
+    @abstractmethod
+    def circumference(self) -> np.ndarray:
+        """Calculates the circumference of every geometrical figure."""
+
+        pass
+
+    @abstractmethod
+    def is_inside(self, x_value:float, y_value:float) -> np.ndarray:
+        """Checks which geometrical figures a point (x, y) is inside."""
+
+        pass
+
+
+    #STATIC METHODS
+
+    @staticmethod
+    def validation_numerical(values) -> np.ndarray:
+        """
+        Validates that values are numerical, and returns them as a float64 array.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The values to validate. Expected to be int or float (or an array/sequence of them).
+
+        Raises
+        ------
+        TypeError
+            If values are not int or float.
+
+        Returns
+        -------
+        values : np.ndarray
+            If no error has occured, the values are returned as a float64 array (without copying when possible).
+        """
+
+        array = np.asarray(values)
+        if array.dtype.kind not in "iuf": #Arrays of bools are rejected, since they are most likely masks and not coordinates
+            raise TypeError(f"Please enter ints or floats, not {array.dtype}.")
+        return np.asarray(array, dtype=np.float64)
+
+    @staticmethod
+    def validation_numerical_above_zero(values) -> np.ndarray:
+        """
+        Validates that values are numerical and above 0, and returns them as a float64 array.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The values to validate. Expected to be int or float (or an array/sequence of them).
+
+        Raises
+        ------
+        TypeError
+            If values are not int or float.
+        ValueError
+            If a value is 0 or below.
+
+        Returns
+        -------
+        values : np.ndarray
+            If no error has occured, the values are returned as a float64 array (without copying when possible).
+        """
+
+        array = ShapeArray.validation_numerical(values)
+        if not np.all(array > 0): #Written as "not all above" so that NaN is rejected as well
+            raise ValueError("The values have to be above 0.")
+        return array
+
+
+    #HELPERS
+
+    def _column(self, values, above_zero:bool=False) -> np.ndarray:
+        """Validates a column and broadcasts scalars to the number of figures (the first column sets the number)."""
+
+        if above_zero:
+            column = ShapeArray.validation_numerical_above_zero(values)
+        else:
+            column = ShapeArray.validation_numerical(values)
+
+        if column.ndim > 1:
+            raise ValueError(f"Please enter a one-dimensional array, not an array with shape {column.shape}.")
+        if column.ndim == 0:
+            if self._size is None:
+                self._size = 1
+            return np.full(self._size, column.item())
+        if self._size is None:
+            self._size = len(column)
+        elif len(column) != self._size:
+            raise ValueError(f"All columns must have the same length ({len(column)} is not {self._size}).")
+        return column
+
+    #GETTERS
+
+    @property
+    def x_coordinates(self) -> np.ndarray:
+        """Returns the x-coordinates, as a private variable."""
+
+        return self._x_coordinates
+
+    @property
+    def y_coordinates(self) -> np.ndarray:
+        """Returns the y-coordinates, as a private variable."""
+
+        return self._y_coordinates
+
+
+class CircleArray(ShapeArray):
+    """
+    A class used for representing many circles as NumPy columns.
+
+    Attributes
+    ----------
+    radii : np.ndarray
+        The radii of the circles.
+    x_coordinates : np.ndarray
+        The x-coordinates at the centre of the circles (default 0).
+    y_coordinates : np.ndarray
+        The y-coordinates at the centre of the circles (default 0).
+
+    Methods
+    -------
+    area() -> np.ndarray
+        Calculates the area of every circle.
+    circumference() -> np.ndarray
+        Calculates the circumference of every circle.
+    is_inside(x_value : float, y_value : float) -> np.ndarray
+        Checks which circles a point (x, y) is inside.
+    """
+
+    shape_type = Circle
+    fields = ("radius", "x_coordinate", "y_coordinate")
+    columns = ("radii", "x_coordinates", "y_coordinates")
+
+    def __init__(self, radii, x_coordinates=0, y_coordinates=0) -> None:
+        """
+        Parameters
+        ----------
+        radii : np.ndarray
+            The radii of the circles.
+        x_coordinates : np.ndarray
+            The x-coordinates at the centre of the circles (default 0).
+        y_coordinates : np.ndarray
+            The y-coordinates at the centre of the circles (default 0).
+        """
+
+        self._size = None
+        self._radii = self._column(radii, above_zero=True)
+        super().__init__(x_coordinates, y_coordinates, self._size)
+
+
+    #METHODS
+
+    def area(self) -> np.ndarray:
+        """Calculates the area of every circle."""
+
+        return np.pi*(self._radii**2)
+
+    def circumference(self) -> np.ndarray:
+        """Calculates the circumference of every circle."""
+
+        return 2*np.pi*self._radii
+
+    def is_inside(self, x_value:float, y_value:float) -> np.ndarray:
+        """
+        Checks which circles a point (x, y) is inside.
+
+        Parameters
+        ----------
+        x_value : float
+            The x-value of the point.
+        y_value : float
+            The y-value of the point.
+
+        Raises
+        ------
+        TypeError
+            If value is not int or float.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean mask that is True for the circles that contain the point (including the edges of the circles).
+        """
+
+        Circle.validation_numerical(x_value)
+        Circle.validation_numerical(y_value)
+
+        #Compares squared distances, as Circle.is_inside, so that no square root has to be calculated and a point on the edge gets the same answer
+        return (self._x_coordinates - x_value)**2 + (self._y_coordinates - y_value)**2 <= self._radii**2
+
+
+    #GETTERS
+
+    @property
+    def radii(self) -> np.ndarray:
+        """Returns the radii, as a private variable."""
+
+        return self._radii
+
+
+class RectangleArray(ShapeArray):
+    """
+    A class used for representing many rectangles as NumPy columns.
+
+    Attributes
+    ----------
+    lengths : np.ndarray
+        The lengths of the rectangles (along the x-axis).
+    widths : np.ndarray
+        The widths of the rectangles (along the y-axis).
+    x_coordinates : np.ndarray
+        The x-coordinates at the centre of the rectangles (default 0).
+    y_coordinates : np.ndarray
+        The y-coordinates at the centre of the rectangles (default 0).
+
+    Methods
+    -------
+    area() -> np.ndarray
+        Calculates the area of every rectangle.
+    circumference() -> np.ndarray
+        Calculates the circumference of every rectangle.
+    is_inside(x_value : float, y_value : float) -> np.ndarray
+        Checks which rectangles a point (x, y) is inside.
+    """
+
+    shape_type = Rectangle
+    fields = ("length", "width", "x_coordinate", "y_coordinate")
+    columns = ("lengths", "widths", "x_coordinates", "y_coordinates")
+
+    def __init__(self, lengths, widths, x_coordinates=0, y_coordinates=0) -> None:
+        """
+        Parameters
+        ----------
+        lengths : np.ndarray
+            The lengths of the rectangles (along the x-axis).
+        widths : np.ndarray
+            The widths of the rectangles (along the y-axis).
+        x_coordinates : np.ndarray
+            The x-coordinates at the centre of the rectangles (default 0).
+        y_coordinates : np.ndarray
+            The y-coordinates at the centre of the rectangles (default 0).
+        """
+
+        self._size = None
+        self._lengths = self._column(lengths, above_zero=True)
+        self._widths = self._column(widths, above_zero=True)
+        super().__init__(x_coordinates, y_coordinates, self._size)
+
+
+    #METHODS
+
+    def area(self) -> np.ndarray:
+        """Calculates the area of every rectangle."""
+
+        return self._lengths*self._widths
+
+    def circumference(self) -> np.ndarray:
+        """Calculates the circumference of every rectangle."""
+
+        return (self._lengths*2)+(self._widths*2)
+
+    def is_inside(self, x_value:float, y_value:float) -> np.ndarray:
+        """
+        Checks which rectangles a point (x, y) is inside.
+
+        Parameters
+        ----------
+        x_value : float
+            The x-value of the point.
+        y_value : float
+            The y-value of the point.
+
+        Raises
+        ------
+        TypeError
+            If value is not int or float.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean mask that is True for the rectangles that contain the point (including the edges of the rectangles).
+        """
+
+        Rectangle.validation_numerical(x_value)
+        Rectangle.validation_numerical(y_value)
+
+        #The same bounds as Rectangle.is_inside, so that points on the edges give the same answer
+        return (((self._x_coordinates - self._lengths/2) <= x_value) & (x_value <= (self._x_coordinates + self._lengths/2))
+                & ((self._y_coordinates - self._widths/2) <= y_value) & (y_value <= (self._y_coordinates + self._widths/2)))
+
+
+    #GETTERS
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Returns the lengths, as a private variable."""
+
+        return self._lengths
+
+    @property
+    def widths(self) -> np.ndarray:
+        """Returns the widths, as a private variable."""
+
+        return self._widths
+
+
+class SphereArray(CircleArray):
+    """
+    A class used for representing many spheres as NumPy columns.
+
+    Attributes
+    ----------
+    radii : np.ndarray
+        The radii of the spheres.
+    x_coordinates : np.ndarray
+        The x-coordinates at the centre of the spheres (default 0).
+    y_coordinates : np.ndarray
+        The y-coordinates at the centre of the spheres (default 0).
+    z_coordinates : np.ndarray
+        The z-coordinates at the centre of the spheres (default 0).
+
+    Methods
+    -------
+    translate(x_new_values : np.ndarray, y_new_values : np.ndarray, z_new_values : np.ndarray) -> None
+        Sets the x, y and z-coordinates to new values.
+    area() -> np.ndarray
+        Calculates the surface area of every sphere.
+    volume() -> np.ndarray
+        Calculates the volume of every sphere.
+    is_inside(x_value : float, y_value : float, z_value : float) -> np.ndarray
+        Checks which spheres a point (x, y, z) is inside.
+    """
+
+    shape_type = Sphere
+    fields = ("radius", "x_coordinate", "y_coordinate", "z_coordinate")
+    columns = ("radii", "x_coordinates", "y_coordinates", "z_coordinates")
+
+    def __init__(self, radii, x_coordinates=0, y_coordinates=0, z_coordinates=0) -> None:
+        """
+        Parameters
+        ----------
+        radii : np.ndarray
+            The radii of the spheres.
+        x_coordinates : np.ndarray
+            The x-coordinates at the centre of the spheres (default 0).
+        y_coordinates : np.ndarray
+            The y-coordinates at the centre of the spheres (default 0).
+        z_coordinates : np.ndarray
+            The z-coordinates at the centre of the spheres (default 0).
+        """
+
+        super().__init__(radii, x_coordinates, y_coordinates)
+        self._z_coordinates = self._column(z_coordinates)
+
+
+    #METHODS
+
+    def translate(self, x_new_values, y_new_values, z_new_values) -> None:
+        """
+        Sets the x, y and z-coordinates to new values.
+
+        Parameters
+        ----------
+        x_new_values : np.ndarray
+            The new values for the x-coordinates (a scalar is used for every sphere).
+        y_new_values : np.ndarray
+            The new values for the y-coordinates (a scalar is used for every sphere).
+        z_new_values : np.ndarray
+            The new values for the z-coordinates (a scalar is used for every sphere).
+
+        Raises
+        ------
+        TypeError
+            If values are not int or float.
+        ValueError
+            If the number of values does not match the number of spheres.
+
+        Returns
+        -------
+        None
+        """
+
+        z_new_values = self._column(z_new_values)
+        super().translate(x_new_values, y_new_values)
+        self._z_coordinates = z_new_values
+
+    def area(self) -> np.ndarray:
+        """Calculates the surface area of every sphere."""
+
+        return 4*np.pi*(self._radii**2)
+
+    def volume(self) -> np.ndarray:
+        """Calculates the volume of every sphere."""
+
+        return 4/3*np.pi*(self._radii**3)
+
+    def is_inside(self, x_value:float, y_value:float, z_value:float) -> np.ndarray:
+        """
+        Checks which spheres a point (x, y, z) is inside.
+
+        Parameters
+        ----------
+        x_value : float
+            The x-value of the point.
+        y_value : float
+            The y-value of the point.
+        z_value : float
+            The z-value of the point.
+
+        Raises
+        ------
+        TypeError
+            If value is not int or float.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean mask that is True for the spheres that contain the point (including the edges of the spheres).
+        """
+
+        Sphere.validation_numerical(x_value)
+        Sphere.validation_numerical(y_value)
+        Sphere.validation_numerical(z_value)
+
+        #Compares squared distances, as Sphere.is_inside, so that a point on the edge gets the same answer
+        return ((self._x_coordinates - x_value)**2 + (self._y_coordinates - y_value)**2 
+                + (self._z_coordinates - z_value)**2 <= self._radii**2)
+
+
+    #GETTERS
+
+    @property
+    def z_coordinates(self) -> np.ndarray:
+        """Returns the z-coordinates, as a private variable."""
+
+        return self._z_coordinates
+
+
+class CubeArray(RectangleArray):
+    """
+    A class used for representing many cubes as NumPy columns.
+
+    Attributes
+    ----------
+    sides : np.ndarray
+        The lengths of the sides of the cubes (also returned as lengths and widths).
+    x_coordinates : np.ndarray
+        The x-coordinates at the centre of the cubes (default 0).
+    y_coordinates : np.ndarray
+        The y-coordinates at the centre of the cubes (default 0).
+    z_coordinates : np.ndarray
+        The z-coordinates at the centre of the cubes (default 0).
+
+    Methods
+    -------
+    translate(x_new_values : np.ndarray, y_new_values : np.ndarray, z_new_values : np.ndarray) -> None
+        Sets the x, y and z-coordinates to new values.
+    area() -> np.ndarray
+        Calculates the surface area of every cube.
+    volume() -> np.ndarray
+        Calculates the volume of every cube.
+    is_inside(x_value : float, y_value : float, z_value : float) -> np.ndarray
+        Checks which cubes a point (x, y, z) is inside.
+    """
+
+    shape_type = Cube
+    fields = ("side", "x_coordinate", "y_coordinate", "z_coordinate")
+    columns = ("sides", "x_coordinates", "y_coordinates", "z_coordinates")
+
+    def __init__(self, sides, x_coordinates=0, y_coordinates=0, z_coordinates=0) -> None:
+        """
+        Parameters
+        ----------
+        sides : np.ndarray
+            The lengths of the sides of the cubes.
+        x_coordinates : np.ndarray
+            The x-coordinates at the centre of the cubes (default 0).
+        y_coordinates : np.ndarray
+            The y-coordinates at the centre of the cubes (default 0).
+        z_coordinates : np.ndarray
+            The z-coordinates at the centre of the cubes (default 0).
+        """
+
+        super().__init__(sides, sides, x_coordinates, y_coordinates) #The same column is used as both lengths and widths, as in the Cube class
+        self._z_coordinates = self._column(z_coordinates)
+
+    @classmethod
+    def from_trusted(cls, sides:np.ndarray, x_coordinates:np.ndarray, y_coordinates:np.ndarray, z_coordinates:np.ndarray) -> "CubeArray":
+        """Creates a CubeArray without validating the values (see ShapeArray.from_trusted), with the sides as both lengths and widths."""
+
+        cube_array = cls.__new__(cls)
+        cube_array._size = len(sides)
+        cube_array._lengths = cube_array._widths = sides
+        cube_array._x_coordinates, cube_array._y_coordinates, cube_array._z_coordinates = x_coordinates, y_coordinates, z_coordinates
+        return cube_array
+
+
+    #METHODS
+
+    def translate(self, x_new_values, y_new_values, z_new_values) -> None:
+        """
+        Sets the x, y and z-coordinates to new values.
+
+        Parameters
+        ----------
+        x_new_values : np.ndarray
+            The new values for the x-coordinates (a scalar is used for every cube).
+        y_new_values : np.ndarray
+            The new values for the y-coordinates (a scalar is used for every cube).
+        z_new_values : np.ndarray
+            The new values for the z-coordinates (a scalar is used for every cube).
+
+        Raises
+        ------
+        TypeError
+            If values are not int or float.
+        ValueError
+            If the number of values does not match the number of cubes.
+
+        Returns
+        -------
+        None
+        """
+
+        z_new_values = self._column(z_new_values)
+        super().translate(x_new_values, y_new_values)
+        self._z_coordinates = z_new_values
+
+    def area(self) -> np.ndarray:
+        """Calculates the surface area of every cube."""
+
+        return 6*(self._lengths**2)
+
+    def volume(self) -> np.ndarray:
+        """Calculates the volume of every cube."""
+
+        return self._lengths**3
+
+    def is_inside(self, x_value:float, y_value:float, z_value:float) -> np.ndarray:
+        """
+        Checks which cubes a point (x, y, z) is inside.
+
+        Parameters
+        ----------
+        x_value : float
+            The x-value of the point.
+        y_value : float
+            The y-value of the point.
+        z_value : float
+            The z-value of the point.
+
+        Raises
+        ------
+        TypeError
+            If value is not int or float.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean mask that is True for the cubes that contain the point (including the edges of the cubes).
+        """
+
+        Cube.validation_numerical(z_value)
+
+        return (super().is_inside(x_value, y_value)
+                & ((self._z_coordinates - self._lengths/2) <= z_value) & (z_value <= (self._z_coordinates + self._lengths/2)))
+
+
+    #GETTERS
+
+    @property
+    def sides(self) -> np.ndarray:
+        """Returns the sides, as a private variable."""
+
+        return self._lengths
+
+    @property
+    def z_coordinates(self) -> np.ndarray:
+        """Returns the z-coordinates, as a private variable."""
+
+        return self._z_coordinates
@@ -0,0 +1,433 @@
+from geometry import Geometry
+from circle import Circle
+from itertools import product
+import math
+
+class ShapeIndex:
+    """
+    A class used for finding geometrical figures by position, using a uniform grid over their bounding boxes.
+
+    Every figure is stored in the grid cells that its bounding box overlaps, so a query only has to look at the
+    figures in the cells around the query, instead of at every figure. A figure that would cover more than
+    MAX_CELLS_PER_SHAPE cells (e.g. one huge figure among small ones) is kept in a separate list, which every
+    query checks directly, so that it does not fill the grid. The index registers itself as an observer
+    of the figures, so that it is updated when a figure is moved (with translate) or resized.
+    All figures in an index must have the same number of dimensions (2D: Circle/Rectangle, 3D: Sphere/Cube).
+
+    Attributes
+    ----------
+    MAX_CELLS_PER_SHAPE : int
+        The largest number of grid cells that a figure is stored in.
+    cell_size : float
+        The side of the grid cells. If None, it is set from the sizes of the figures in the first bulk load.
+    dimensions : int
+        The number of dimensions of the figures in the index (None while the index is empty).
+
+    Methods
+    -------
+    bulk_load(shapes : list) -> None
+        Adds many geometrical figures to the index.
+    insert(shape : Geometry) -> None
+        Adds a geometrical figure to the index.
+    remove(shape : Geometry) -> None
+        Removes a geometrical figure from the index.
+    query_point(point : tuple) -> list
+        Returns the geometrical figures that a point is inside.
+    query_box(lowest_corner : tuple, highest_corner : tuple) -> list
+        Returns the geometrical figures whose bounding boxes overlap a box.
+    nearest(point : tuple) -> tuple
+        Returns the geometrical figure that is closest to a point, and the distance to it.
+    shape_changed(shape : Geometry) -> None
+        Updates the position of a geometrical figure in the grid (called by the figure when it changes).
+    __len__() -> int
+        Returns the number of geometrical figures in the index.
+    __contains__(shape : Geometry) -> bool
+        Checks if a geometrical figure is in the index.
+    __iter__()
+        Iterates over the geometrical figures in the index.
+    """
+
+    MAX_CELLS_PER_SHAPE = 64
+
+    def __init__(self, shapes:list=(), cell_size:float=None) -> None:
+        """
+        Parameters
+        ----------
+        shapes : list
+            Geometrical figures to bulk load into the index (default empty).
+        cell_size : float
+            The side of the grid cells (default None, which sets it from the sizes of the figures).
+        """
+
+        self._cell_size = None if cell_size is None else Geometry.validation_numerical_above_zero(cell_size)
+        self.dimensions = None
+
+        #The figures are not hashable (they overload == without __hash__), so they are stored by id
+        self._shapes = {}
+        self._cells_of_shape = {}
+        self._cells = {}
+        self._large_shapes = {} #Figures that cover too many cells to be stored in the grid
+
+        self.bulk_load(shapes)
+
+
+    #METHODS
+
+    def bulk_load(self, shapes:list) -> None:
+        """
+        Adds many geometrical figures to the index.
+
+        If no cell size has been set, it is set to the median of the largest side of the bounding boxes,
+        so that a typical figure covers one or two cells along every axis.
+
+        Parameters
+        ----------
+        shapes : list
+            The geometrical figures to add.
+
+        Raises
+        ------
+        TypeError
+            If a figure is not a Geometry object.
+        ValueError
+            If the figures do not have the same number of dimensions as the figures in the index.
+
+        Returns
+        -------
+        None
+        """
+
+        shapes = list(shapes)
+        boxes = [self._bounding_box(shape) for shape in shapes]
+        dimensions = {len(box[0]) for box in boxes}
+        if len(dimensions) > 1:
+            raise ValueError("All figures in the index must have the same number of dimensions.")
+
+        if self._cell_size is None and boxes:
+            extents = sorted(max(high - low for low, high in zip(*box)) for box in boxes)
+            self._cell_size = extents[len(extents)//2] or 1.0
+
+        for shape, box in zip(shapes, boxes):
+            self._add(shape, box)
+
+    def insert(self, shape:Geometry) -> None:
+        """
+        Adds a geometrical figure to the index. Nothing happens if the figure already is in the index.
+
+        Parameters
+        ----------
+        shape : Geometry
+            The geometrical figure to add.
+
+        Raises
+        ------
+        TypeError
+            If the figure is not a Geometry object.
+        ValueError
+            If the figure does not have the same number of dimensions as the figures in the index.
+
+        Returns
+        -------
+        None
+        """
+
+        self.bulk_load([shape])
+
+    def remove(self, shape:Geometry) -> None:
+        """
+        Removes a geometrical figure from the index.
+
+        Parameters
+        ----------
+        shape : Geometry
+            The geometrical figure to remove.
+
+        Raises
+        ------
+        KeyError
+            If the figure is not in the index.
+
+        Returns
+        -------
+        None
+        """
+
+        if id(shape) not in self._shapes:
+            raise KeyError(f"{shape!r} is not in the index.")
+
+        self._clear_cells(shape)
+        del self._shapes[id(shape)]
+        shape.remove_observer(self)
+        if not self._shapes:
+            self.dimensions = None
+
+    def query_point(self, point:tuple) -> list:
+        """
+        Returns the geometrical figures that a point is inside (including the edges of the figures).
+
+        Parameters
+        ----------
+        point : tuple
+            The point (x, y) or (x, y, z).
+
+        Raises
+        ------
+        TypeError
+            If a value in the point is not int or float.
+        ValueError
+            If the point does not have the same number of dimensions as the figures in the index.
+
+        Returns
+        -------
+        list
+            The figures that contain the point.
+        """
+
+        point = self._validate_point(point)
+        if not self._shapes:
+            return []
+
+        candidates = list(self._cells.get(self._cell_of(point), {}).values()) + list(self._large_shapes.values())
+        return [shape for shape in candidates if shape.is_inside(*point)]
+
+    def query_box(self, lowest_corner:tuple, highest_corner:tuple) -> list:
+        """
+        Returns the geometrical figures whose bounding boxes overlap a box (including touching edges).
+
+        Parameters
+        ----------
+        lowest_corner : tuple
+            The corner of the box with the lowest values, (x, y) or (x, y, z).
+        highest_corner : tuple
+            The corner of the box with the highest values, (x, y) or (x, y, z).
+
+        Raises
+        ------
+        TypeError
+            If a value in the corners is not int or float.
+        ValueError
+            If the corners do not have the same number of dimensions as the figures in the index.
+
+        Returns
+        -------
+        list
+            The figures whose bounding boxes overlap the box.
+        """
+
+        lowest_corner = self._validate_point(lowest_corner)
+        highest_corner = self._validate_point(highest_corner)
+        if not self._shapes:
+            return []
+
+        lowest_cell, highest_cell = self._cell_of(lowest_corner), self._cell_of(highest_corner)
+        if math.prod(high - low + 1 for low, high in zip(lowest_cell, highest_cell)) > len(self._cells):
+            #The box covers more cells than there are cells with figures, so only the cells with figures are checked
+            cells = list(self._cells)
+        else:
+            cells = self._cells_in_box((lowest_corner, highest_corner))
+
+        found = {}
+        for candidates in [self._cells.get(cell, {}) for cell in cells] + [self._large_shapes]:
+            for key, shape in candidates.items():
+                if key not in found:
+                    box_lowest, box_highest = shape.bounding_box()
+                    if all(low <= high_box and low_box <= high for low, high, low_box, high_box in zip(lowest_corner, highest_corner, box_lowest, box_highest)):
+                        found[key] = shape
+        return list(found.values())
+
+    def nearest(self, point:tuple) -> tuple:
+        """
+        Returns the geometrical figure that is closest to a point, and the distance to it.
+
+        The distance is 0 if the point is inside a figure. For circles and spheres the distance is measured to the
+        edge of the figure, and for all other figures to the edge of their bounding box (which is the exact distance
+        for rectangles and cubes). The grid is searched in rings of cells around the point, and the search stops
+        when no figure in the remaining cells can be closer.
+
+        Parameters
+        ----------
+        point : tuple
+            The point (x, y) or (x, y, z).
+
+        Raises
+        ------
+        TypeError
+            If a value in the point is not int or float.
+        ValueError
+            If the point does not have the same number of dimensions as the figures in the index, or if the index is empty.
+
+        Returns
+        -------
+        tuple
+            (shape, distance)
+        """
+
+        point = self._validate_point(point)
+        if not self._shapes:
+            raise ValueError("The index is empty.")
+
+        centre_cell = self._cell_of(point)
+        best_shape, best_distance, seen = None, math.inf, set(self._large_shapes)
+        for shape in self._large_shapes.values():
+            distance = self._distance(shape, point)
+            if distance < best_distance:
+                best_shape, best_distance = shape, distance
+        ring = 0
+
+        #Every figure that has not been seen lies outside the cells within the previous ring, so it is at least (ring - 1)*cell_size away
+        while len(seen) < len(self._shapes) and best_distance > (ring - 1)*self._cell_size:
+            if (2*ring + 1)**self.dimensions > len(self._cells):
+                #The ring has more cells than there are cells with figures (the point is far away), so the rest are checked directly
+                candidates = [(key, shape) for key, shape in self._shapes.items() if key not in seen]
+            else:
+                candidates = [item for cell in self._ring(centre_cell, ring) for item in self._cells.get(cell, {}).items()]
+
+            for key, shape in candidates:
+                if key not in seen:
+                    seen.add(key)
+                    distance = self._distance(shape, point)
+                    if distance < best_distance:
+                        best_shape, best_distance = shape, distance
+            ring += 1
+        return best_shape, best_distance
+
+    def shape_changed(self, shape:Geometry) -> None:
+        """
+        Updates the position of a geometrical figure in the grid (called by the figure when it changes).
+
+        Parameters
+        ----------
+        shape : Geometry
+            The geometrical figure that has been moved or resized.
+
+        Returns
+        -------
+        None
+        """
+
+        if id(shape) in self._shapes:
+            self._clear_cells(shape)
+            self._fill_cells(shape, shape.bounding_box())
+
+    def __len__(self) -> int:
+        """Returns the number of geometrical figures in the index."""
+
+        return len(self._shapes)
+
+    def __contains__(self, shape:Geometry) -> bool:
+        """Checks if a geometrical figure (the same object, not a congruent figure) is in the index."""
+
+        return id(shape) in self._shapes
+
+    def __iter__(self):
+        """Iterates over the geometrical figures in the index."""
+
+        return iter(list(self._shapes.values()))
+
+    def __repr__(self) -> str:
+        """Returns information about the number of figures and the size of the grid."""
+
+        return f"ShapeIndex with {len(self)} geometrical figures in {len(self._cells)} cells of size {self._cell_size}."
+
+
+    #HELPERS
+
+    def _bounding_box(self, shape:Geometry) -> tuple:
+        """Validates a figure and returns its bounding box."""
+
+        if not isinstance(shape, Geometry):
+            raise TypeError(f"Please enter a Geometry object, not a {type(shape)}.")
+
+        box = shape.bounding_box()
+        if self.dimensions is not None and len(box[0]) != self.dimensions:
+            raise ValueError(f"All figures in the index must have {self.dimensions} dimensions, not {len(box[0])}.")
+        return box
+
+    def _add(self, shape:Geometry, box:tuple) -> None:
+        """Adds a figure with a known bounding box to the grid, and registers the index as its observer."""
+
+        if id(shape) in self._shapes:
+            return
+        if self._cell_size is None:
+            self._cell_size = max(high - low for low, high in zip(*box)) or 1.0
+        if self.dimensions is None:
+            self.dimensions = len(box[0])
+        elif len(box[0]) != self.dimensions:
+            raise ValueError(f"All figures in the index must have {self.dimensions} dimensions, not {len(box[0])}.")
+
+        self._shapes[id(shape)] = shape
+        self._fill_cells(shape, box)
+        shape.add_observer(self)
+
+    def _fill_cells(self, shape:Geometry, box:tuple) -> None:
+        """Stores a figure in every cell that its bounding box overlaps, or in the list of large figures if there are too many cells."""
+
+        lowest_cell, highest_cell = self._cell_of(box[0]), self._cell_of(box[1])
+        if math.prod(high - low + 1 for low, high in zip(lowest_cell, highest_cell)) > self.MAX_CELLS_PER_SHAPE:
+            #The cells are counted before they are made, so a huge figure does not make millions of cells
+            self._large_shapes[id(shape)] = shape
+            self._cells_of_shape[id(shape)] = []
+            return
+
+        cells = self._cells_in_box(box)
+        for cell in cells:
+            self._cells.setdefault(cell, {})[id(shape)] = shape
+        self._cells_of_shape[id(shape)] = cells
+
+    def _clear_cells(self, shape:Geometry) -> None:
+        """Removes a figure from all of its cells (and removes cells that become empty)."""
+
+        self._large_shapes.pop(id(shape), None)
+        for cell in self._cells_of_shape.pop(id(shape)):
+            shapes_in_cell = self._cells[cell]
+            del shapes_in_cell[id(shape)]
+            if not shapes_in_cell:
+                del self._cells[cell]
+
+    def _cell_of(self, point:tuple) -> tuple:
+        """Returns the grid cell of a point."""
+
+        return tuple(math.floor(value/self._cell_size) for value in point)
+
+    def _cells_in_box(self, box:tuple) -> list:
+        """Returns the grid cells that a box overlaps."""
+
+        lowest_cell, highest_cell = self._cell_of(box[0]), self._cell_of(box[1])
+        return list(product(*(range(low, high + 1) for low, high in zip(lowest_cell, highest_cell))))
+
+    def _ring(self, centre_cell:tuple, ring:int) -> list:
+        """Returns the grid cells at exactly ring steps (along the axis with the largest step) from a cell."""
+
+        if ring == 0:
+            return [centre_cell]
+        offsets = product(range(-ring, ring + 1), repeat=len(centre_cell))
+        return [tuple(centre + offset for centre, offset in zip(centre_cell, offsets_of_cell))
+                for offsets_of_cell in offsets if max(abs(offset) for offset in offsets_of_cell) == ring]
+
+    def _validate_point(self, point:tuple) -> tuple:
+        """Validates that a point is numerical and has the same number of dimensions as the figures in the index."""
+
+        point = tuple(Geometry.validation_numerical(value) for value in point)
+        if self.dimensions is not None and len(point) != self.dimensions:
+            raise ValueError(f"Please enter a point with {self.dimensions} values, not {len(point)}.")
+        return point
+
+    @staticmethod
+    def _distance(shape:Geometry, point:tuple) -> float:
+        """Returns the distance from a point to the edge of a figure (0 if the point is inside)."""
+
+        if isinstance(shape, Circle): #Also handles Sphere, which is a subclass of Circle
+            centre = (shape.x_coordinate, shape.y_coordinate, getattr(shape, "z_coordinate", 0))[:len(point)]
+            return max(0.0, math.dist(point, centre) - shape.radius)
+
+        lowest_corner, highest_corner = shape.bounding_box()
+        return math.hypot(*(max(low - value, 0, value - high) for value, low, high in zip(point, lowest_corner, highest_corner)))
+
+
+    #GETTERS
+
+    @property
+    def cell_size(self) -> float:
+        """Returns the side of the grid cells, as a private variable."""
+
+        return self._cell_size
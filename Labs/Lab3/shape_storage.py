@@ -0,0 +1,164 @@
+from circle import Circle
+from rectangle import Rectangle
+from sphere import Sphere
+from cube import Cube
+from shape_array import ShapeArray, CircleArray, RectangleArray, SphereArray, CubeArray
+from operator import attrgetter
+import numpy as np
+
+#The type tag that is stored for every Geometry subclass, and the ShapeArray that the stored figures are loaded as
+TYPE_TAGS = {Circle: 0, Rectangle: 1, Sphere: 2, Cube: 3}
+ARRAY_TYPES = {Circle: CircleArray, Rectangle: RectangleArray, Sphere: SphereArray, Cube: CubeArray}
+
+#The rows of the stored 7 x N array. Every row is a contiguous column of float64 values (the size is the radius, length or side)
+ROWS = ("type_tag", "index", "size", "width", "x_coordinate", "y_coordinate", "z_coordinate")
+FIELD_ROWS = {"radius": 2, "length": 2, "side": 2, "width": 3, "x_coordinate": 4, "y_coordinate": 5, "z_coordinate": 6}
+
+def save_shapes(path, shapes:list) -> None:
+    """
+    Saves Circle, Rectangle, Sphere and Cube objects (and ShapeArrays) to a binary NumPy .npy file.
+
+    The file holds a 7 x N float64 array (see ROWS), where every row is a column of values for all figures: the
+    type tag, the position of the figure in shapes, the sizes and the coordinates. The figures are grouped by type
+    tag (in their original order within each type), so that load_shape_arrays can return every type as a
+    slice of the file without copying. Fields that a type does not have (e.g. the width of a circle) are stored as 0.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The file to write (".npy" is added by NumPy if it is missing).
+    shapes : list
+        Circle, Rectangle, Sphere and Cube objects, and ShapeArray objects (which count as len(array) figures).
+
+    Raises
+    ------
+    TypeError
+        If a figure is not exactly a Circle, Rectangle, Sphere, Cube or ShapeArray.
+
+    Returns
+    -------
+    None
+    """
+
+    #The values of every type are collected first, and then copied into the rows of their type
+    values = {shape_type: [] for shape_type in TYPE_TAGS}
+    indices = {shape_type: [] for shape_type in TYPE_TAGS}
+    arrays = {shape_type: [] for shape_type in TYPE_TAGS}
+    getters = {shape_type: attrgetter(*array_type.fields) for shape_type, array_type in ARRAY_TYPES.items()}
+    position = 0
+    for shape in shapes:
+        if isinstance(shape, ShapeArray) and type(shape) in ARRAY_TYPES.values():
+            arrays[shape.shape_type].append((position, shape))
+            position += len(shape)
+            continue
+        if type(shape) not in TYPE_TAGS: #Sphere is a subclass of Circle, so the exact type is used
+            raise TypeError(f"Please enter Circle, Rectangle, Sphere, Cube or ShapeArray objects, not a {type(shape)}.")
+        values[type(shape)].append(getters[type(shape)](shape))
+        indices[type(shape)].append(position)
+        position += 1
+
+    data = np.zeros((len(ROWS), position), dtype=np.float64)
+    start = 0
+    for shape_type, tag in TYPE_TAGS.items():
+        fields = ARRAY_TYPES[shape_type].fields
+        blocks = [(np.array(indices[shape_type], dtype=np.int64), np.array(values[shape_type], dtype=np.float64).reshape(-1, len(fields)).T)]
+        blocks += [(np.arange(offset, offset + len(array)), [getattr(array, column) for column in array.columns]) for offset, array in arrays[shape_type]]
+        type_indices = np.concatenate([block_indices for block_indices, _ in blocks])
+        #Every block is in order, so the figures of a type only have to be sorted if there are several blocks
+        order = np.argsort(type_indices, kind="stable") if len(blocks) > 1 else slice(None)
+
+        end = start + len(type_indices)
+        data[0, start:end] = tag
+        data[1, start:end] = type_indices[order]
+        for number, field in enumerate(fields):
+            data[FIELD_ROWS[field], start:end] = np.concatenate([columns[number] for _, columns in blocks])[order]
+        start = end
+
+    np.save(path, data)
+
+def load_shape_arrays(path, mmap_mode:str="r") -> dict:
+    """
+    Loads a file written by save_shapes as one ShapeArray for every stored type, without creating any Geometry objects.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The .npy file to read.
+    mmap_mode : str
+        How the file is opened (default "r", which memory-maps it read-only, so only the pages that are used are read).
+        None reads the whole file into memory. See numpy.load for the other modes.
+
+    Raises
+    ------
+    ValueError
+        If the file does not hold a 7 x N float64 array of stored figures.
+
+    Returns
+    -------
+    dict
+        The Geometry subclasses that are stored (e.g. Circle), mapped to ShapeArrays (e.g. a CircleArray) whose
+        columns are views of the file, in the original order of the figures within each type.
+    """
+
+    data = _load(path, mmap_mode)
+    arrays = {}
+    for shape_type, (start, end) in _type_slices(data).items():
+        array_type = ARRAY_TYPES[shape_type]
+        #The values were validated when saved, so no value is read here (the constructor would read every size to check it)
+        arrays[shape_type] = array_type.from_trusted(*(data[FIELD_ROWS[field], start:end] for field in array_type.fields))
+    return arrays
+
+def load_shapes(path) -> list:
+    """
+    Loads a file written by save_shapes as Geometry objects, in the order they were saved.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The .npy file to read.
+
+    Raises
+    ------
+    ValueError
+        If the file does not hold a 7 x N float64 array of stored figures.
+
+    Returns
+    -------
+    list
+        Circle, Rectangle, Sphere and Cube objects.
+    """
+
+    data = _load(path, None)
+    shapes = [None]*data.shape[1]
+    for shape_type, (start, end) in _type_slices(data).items():
+        array_type = ARRAY_TYPES[shape_type]
+        #The values were validated when saved, so the objects are created without validating every value again
+        columns = [data[FIELD_ROWS[field], start:end].tolist() for field in array_type.fields]
+        for index, values in zip(data[1, start:end].astype(np.int64).tolist(), zip(*columns)):
+            shapes[index] = shape_type.from_trusted(*values)
+    return shapes
+
+
+#HELPERS
+
+def _load(path, mmap_mode:str) -> "np.ndarray":
+    """Loads the stored array and checks its shape and type."""
+
+    data = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+    if data.dtype != np.float64 or data.ndim != 2 or data.shape[0] != len(ROWS):
+        raise ValueError(f"The file does not hold stored figures (a {len(ROWS)} x N float64 array), but a {data.dtype} array with shape {data.shape}.")
+    return data
+
+def _type_slices(data:"np.ndarray") -> dict:
+    """Returns the Geometry subclasses in the file, mapped to the (start, end) columns of their figures."""
+
+    tags = data[0]
+    slices = {}
+    for shape_type, tag in TYPE_TAGS.items():
+        #The tags are sorted, so the figures of a type are found with a binary search
+        start, end = np.searchsorted(tags, [tag, tag + 1]).tolist()
+        if end > start:
+            slices[shape_type] = (start, end)
+    if sum(end - start for start, end in slices.values()) != len(tags):
+        raise ValueError("The file has unknown type tags, or is not sorted by type tag.")
+    return slices
@@ -1,7 +1,5 @@
 from circle import Circle
 import math
-import matplotlib.pyplot as plt
-import numpy as np
 
 class Sphere(Circle):
     """
@@ -20,6 +18,8 @@ class Sphere(Circle):
     
     Methods
     -------
+    from_trusted(radius : float, x_coordinate : float = 0, y_coordinate : float = 0, z_coordinate : float = 0) -> Sphere
+        Creates a Sphere object without validating the values.
     translate(x_new_value : float, y_new_value : float, z_new_value : float) -> None:
         Sets the x, y and z-coordinates to new values.
     area() -> float
@@ -28,12 +28,18 @@ class Sphere(Circle):
         Calculates the volume of a sphere.
     is_inside(x_value : float, y_value : float, z_value : float) -> bool
         Checks if a point (x, y, z) is inside a sphere.
-    plot_figure(fixed_scale10 : bool = False, point : tuple = None) -> None
+    is_inside_points(points : np.ndarray) -> np.ndarray
+        Checks which of many points (x, y, z) are inside a sphere.
+    plot_figure(fixed_scale10 : bool = False, point : tuple = None, resolution : int = 20) -> None
         Creates a Sphere object (and plots a point) in 3D, in a coordinate system.
+    bounding_box() -> tuple
+        Returns the lowest and the highest corner of the box around a sphere.
     __repr__() -> str
         Returns information about the size and position of a sphere.
     """
 
+    __slots__ = ("_z_coordinate",)
+
     def __init__(self, radius:float, x_coordinate:float=0, y_coordinate:float=0, z_coordinate:float=0) -> None:
         """
         Parameters
@@ -52,6 +58,38 @@ class Sphere(Circle):
         self.z_coordinate = z_coordinate
 
 
+    #CLASS METHODS
+
+    @classmethod
+    def from_trusted(cls, radius:float, x_coordinate:float=0, y_coordinate:float=0, z_coordinate:float=0) -> "Sphere":
+        """
+        Creates a Sphere object without validating the values, for values from an already validated source.
+
+        The setters are not called, so the values must be ints or floats (and the sizes above zero).
+        Use the normal constructor for all other values.
+
+        Parameters
+        ----------
+        radius : float
+            The radius of a sphere.
+        x_coordinate : float
+            The x-coordinate at the centre of a sphere (default 0).
+        y_coordinate : float
+            The y-coordinate at the centre of a sphere (default 0).
+        z_coordinate : float
+            The z-coordinate at the centre of a sphere (default 0).
+
+        Returns
+        -------
+        Sphere
+            A new Sphere object.
+        """
+
+        sphere = super().from_trusted(radius, x_coordinate, y_coordinate)
+        sphere._z_coordinate = z_coordinate
+        return sphere
+
+
     #METHODS
 
     def translate(self, x_new_value:float, y_new_value:float, z_new_value:float) -> None:
@@ -77,8 +115,8 @@ class Sphere(Circle):
         None
         """
 
+        self._z_coordinate = Circle.validation_numerical(z_new_value) #The z-coordinate is set first, since the observers are notified by super().translate
         super().translate(x_new_value, y_new_value)
-        self._z_coordinate = Circle.validation_numerical(z_new_value)
 
     def area(self) -> float:
         """Calculates the surface area of a sphere."""
@@ -119,13 +157,44 @@ class Sphere(Circle):
         super().is_inside(x_value, y_value)
         Circle.validation_numerical(z_value)
 
-        eucl_distance = math.sqrt((self.x_coordinate - x_value)**2 + (self.y_coordinate - y_value)**2 + (self.z_coordinate - z_value)**2)
-        if eucl_distance <= self.radius:
+        #Compares the squared distance with the squared radius, as is_inside_points and SphereArray.is_inside, so that they give the same
+        #answer on the edge (the squares are products, since x**2 of a float can round differently from x*x, which NumPy uses)
+        x_difference, y_difference, z_difference = self.x_coordinate - x_value, self.y_coordinate - y_value, self.z_coordinate - z_value
+        if x_difference*x_difference + y_difference*y_difference + z_difference*z_difference <= self.radius*self.radius:
             return True
         else: 
             return False
 
-    def plot_figure(self, fixed_scale10:bool=False, point:tuple=None) -> None: #Reference: https://stackoverflow.com/questions/40460960/how-to-plot-a-sphere-when-we-are-given-a-central-point-and-a-radius-size
+    def is_inside_points(self, points:"np.ndarray") -> "np.ndarray":
+        """
+        Checks which of many points (x, y, z) are inside a sphere.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            An N x 3 array with one point (x, y, z) per row.
+        
+        Raises
+        ------
+        TypeError
+            If the values in points are not int or float.
+        ValueError
+            If points is not an N x 3 array.
+        
+        Returns
+        -------
+        np.ndarray
+            A boolean mask that is True for the points in the sphere (including the edges of the sphere).
+        """
+
+        points = Circle.validation_points(points, 3)
+        #Compares the squared distances with the squared radius, so that no square root has to be calculated
+        squared_distances = (points[:, 0] - self.x_coordinate)**2
+        squared_distances += (points[:, 1] - self.y_coordinate)**2
+        squared_distances += (points[:, 2] - self.z_coordinate)**2
+        return squared_distances <= self.radius*self.radius
+
+    def plot_figure(self, fixed_scale10:bool=False, point:tuple=None, resolution:int=20) -> None: #Reference: https://stackoverflow.com/questions/40460960/how-to-plot-a-sphere-when-we-are-given-a-central-point-and-a-radius-size
         """
         Creates a Sphere object in 3D (and plots a point), in a coordinate system.
         
@@ -139,21 +208,26 @@ class Sphere(Circle):
             (default False)
         point : tuple
             Plots a point (x, y, z) in the coordinate system (default None).
+        resolution : int
+            The number of grid lines along every angle of the surface, fewer is faster (default 20).
 
         Returns 
         -------
         None
         """
 
+        import matplotlib.pyplot as plt #Imported here, so that matplotlib is only loaded when a figure is plotted (and not when importing the shapes)
+        from meshes import unit_sphere_grid
+
         #Sets up the figure and axes
         fig = plt.figure(dpi=100)
         ax = fig.add_subplot(111, projection='3d')
 
-        #Creates three arrays of spherical coordinates for the X, Y and Z-axis.
-        u, v = np.mgrid[0:2*np.pi:20j, 0:np.pi:20j]
-        X = self.x_coordinate + self.radius * np.cos(u) * np.sin(v)
-        Y = self.y_coordinate + self.radius * np.sin(u) * np.sin(v)
-        Z = self.z_coordinate + self.radius * np.cos(v)
+        #Scales and translates the cached grids of a unit sphere, for the X, Y and Z-axis
+        unit_x, unit_y, unit_z = unit_sphere_grid(resolution)
+        X = self.x_coordinate + self.radius * unit_x
+        Y = self.y_coordinate + self.radius * unit_y
+        Z = self.z_coordinate + self.radius * unit_z
 
         #Plots the surface of the sphere
         ax.plot_surface(X, Y, Z, cmap="Blues", alpha=0.5)
@@ -163,12 +237,7 @@ class Sphere(Circle):
             ax.plot(point[0], point[1], point[2], "ko")
 
         #Creates variables for the edges of the sphere
-        lowest_x = self.x_coordinate-self.radius
-        highest_x = self.x_coordinate+self.radius
-        lowest_y = self.y_coordinate-self.radius
-        highest_y = self.y_coordinate+self.radius
-        lowest_z = self.z_coordinate-self.radius
-        highest_z = self.z_coordinate+self.radius
+        (lowest_x, lowest_y, lowest_z), (highest_x, highest_y, highest_z) = self.bounding_box()
 
         #Sets the scale, depending on the values of the sphere and if fixed_scale10 is set to True
         if fixed_scale10 == True and lowest_x >= -10 and lowest_y >= -10 and lowest_z >= -10 and highest_x <= 10 and highest_y <= 10 and highest_z <= 10:
@@ -179,6 +248,19 @@ class Sphere(Circle):
         
         plt.show()
 
+    def bounding_box(self) -> tuple:
+        """
+        Returns the lowest and the highest corner of the box around a sphere.
+
+        Returns
+        -------
+        tuple
+            ((lowest_x, lowest_y, lowest_z), (highest_x, highest_y, highest_z))
+        """
+
+        return ((self.x_coordinate-self.radius, self.y_coordinate-self.radius, self.z_coordinate-self.radius), 
+                (self.x_coordinate+self.radius, self.y_coordinate+self.radius, self.z_coordinate+self.radius))
+
     def __repr__(self) -> str:
         """Returns information about the size and position of a sphere."""
 
@@ -213,4 +295,5 @@ class Sphere(Circle):
         None
         """
 
-        self._z_coordinate = Circle.validation_numerical(z_coordinate)
\ No newline at end of file
+        self._z_coordinate = Circle.validation_numerical(z_coordinate)
+        self.notify_observers()
\ No newline at end of file
@@ -3,7 +3,25 @@ from circle import Circle
 from rectangle import Rectangle
 from sphere import Sphere
 from cube import Cube
+from shape_array import ShapeArray, CircleArray, RectangleArray, SphereArray, CubeArray
+from shape_index import ShapeIndex
+from frozen_shapes import FrozenShape, FrozenCircle, FrozenRectangle, FrozenSphere, FrozenCube, congruence_key, group_congruent
+from monte_carlo import estimate_area, estimate_volume, estimate_boundary
+from csg import Union, Intersection, Difference
+from collisions import find_overlaps
+from shape_storage import save_shapes, load_shapes, load_shape_arrays
+from render import BatchRenderer, render_thumbnails
+from meshes import unit_sphere_grid, unit_sphere_mesh, unit_cube_mesh, combine_meshes, choose_resolution, write_obj, write_ply
+import tempfile
+import itertools
+import math
+import pickle
+import numpy as np
+import os
+import subprocess
+import sys
 import unittest
+from unittest import mock
 
 
 #TESTS ABSTRACT BASE CLASS GEOMETRY
@@ -537,5 +555,754 @@ class TestCube(unittest.TestCase):
         sph = Sphere(3, -2, 3, 4)
         self.assertEqual(cub == sph, False)
 
+#TESTS SHAPE ARRAYS
+
+def vars_of(shape) -> tuple:
+    """Returns the size and the coordinates of a shape (the overloaded == operator only compares the size)."""
+
+    fields = ("radius", "length", "width", "side", "x_coordinate", "y_coordinate", "z_coordinate")
+    return tuple(getattr(shape, field) for field in fields if hasattr(shape, field))
+
+class TestShapeArray(unittest.TestCase):
+    """Tests the CircleArray, RectangleArray, SphereArray and CubeArray classes."""
+
+    def setUp(self) -> None:
+        """Initialises lists of shapes to convert to shape arrays."""
+
+        self.circles = [Circle(2.5, 3, -3), Circle(1, 0, 0), Circle(4, -2, 5)]
+        self.rectangles = [Rectangle(4, 3, 3, -3), Rectangle(2, 6, 1, 1)]
+        self.spheres = [Sphere(3, 3, -3, 3), Sphere(1)]
+        self.cubes = [Cube(3, 3, -3, 3), Cube(2)]
+
+    def test_round_trip(self):
+        """Tests that converting shapes to a shape array and back gives the same values."""
+
+        for array_type, shapes in ((CircleArray, self.circles), (RectangleArray, self.rectangles), (SphereArray, self.spheres), (CubeArray, self.cubes)):
+            converted = array_type.from_shapes(shapes).to_shapes()
+            self.assertEqual([vars_of(shape) for shape in converted], [vars_of(shape) for shape in shapes])
+            self.assertEqual([type(shape) for shape in converted], [type(shape) for shape in shapes])
+
+    def test_area_circumference_volume(self):
+        """Tests that the vectorized calculations match the calculations of the objects."""
+
+        for array_type, shapes in ((CircleArray, self.circles), (RectangleArray, self.rectangles), (SphereArray, self.spheres), (CubeArray, self.cubes)):
+            array = array_type.from_shapes(shapes)
+            np.testing.assert_allclose(array.area(), [shape.area() for shape in shapes])
+            np.testing.assert_allclose(array.circumference(), [shape.circumference() for shape in shapes])
+        for array_type, shapes in ((SphereArray, self.spheres), (CubeArray, self.cubes)):
+            np.testing.assert_allclose(array_type.from_shapes(shapes).volume(), [shape.volume() for shape in shapes])
+
+    def test_is_inside(self):
+        """Tests that the mask matches is_inside of the objects, including points on the edges."""
+
+        circles = CircleArray.from_shapes(self.circles)
+        self.assertEqual(circles.is_inside(3, -5.5).tolist(), [circle.is_inside(3, -5.5) for circle in self.circles])
+        rectangles = RectangleArray.from_shapes(self.rectangles)
+        self.assertEqual(rectangles.is_inside(5, -4.5).tolist(), [rectangle.is_inside(5, -4.5) for rectangle in self.rectangles])
+        spheres = SphereArray.from_shapes(self.spheres)
+        self.assertEqual(spheres.is_inside(6, -3, 3).tolist(), [True, False])
+        cubes = CubeArray.from_shapes(self.cubes)
+        self.assertEqual(cubes.is_inside(4.5, -4.5, 4.5).tolist(), [True, False])
+
+    def test_is_inside_on_rounded_edges(self):
+        """Tests that the mask matches is_inside on edges where abs(p - x) <= l/2 rounds differently."""
+
+        rectangles = [Rectangle(0.2, 0.2, 0.3, 0.3), Rectangle(0.2, 0.2, 0.1, 0.1)]
+        for point in ((0.4, 0.4), (0.2, 0.2), (0.4, 0.2)):
+            self.assertEqual(RectangleArray.from_shapes(rectangles).is_inside(*point).tolist(), [rectangle.is_inside(*point) for rectangle in rectangles])
+        cubes = [Cube(0.2, 0.3, 0.3, 0.3), Cube(0.2, 0.1, 0.1, 0.1)]
+        for point in ((0.4, 0.4, 0.4), (0.2, 0.2, 0.2), (0.4, 0.2, 0.4)):
+            self.assertEqual(CubeArray.from_shapes(cubes).is_inside(*point).tolist(), [cube.is_inside(*point) for cube in cubes])
+
+    def test_is_inside_on_round_edges(self):
+        """Tests that the mask matches is_inside and is_inside_points for points on the edges of circles and spheres."""
+
+        angles = np.random.default_rng(5).uniform(0, 2*np.pi, (500, 2)).tolist()
+        circles, spheres = [Circle(1.0, 0.1, 0.2), Circle(0.7, 0.3, 0.2)], [Sphere(1.0, 0.1, 0.2, 0.3), Sphere(0.7, 0.3, 0.2, 0.1)]
+        circle_array, sphere_array = CircleArray.from_shapes(circles), SphereArray.from_shapes(spheres)
+        for index, (first_angle, second_angle) in enumerate(angles):
+            circ, sph = circles[index % 2], spheres[index % 2]
+            point_2d = (circ.x_coordinate + circ.radius*math.cos(first_angle), circ.y_coordinate + circ.radius*math.sin(first_angle))
+            self.assertEqual(circle_array.is_inside(*point_2d).tolist(), [circle.is_inside(*point_2d) for circle in circles])
+            self.assertEqual(circ.is_inside_points([point_2d]).tolist(), [circ.is_inside(*point_2d)])
+            point_3d = (sph.x_coordinate + sph.radius*math.cos(first_angle)*math.sin(second_angle),
+                        sph.y_coordinate + sph.radius*math.sin(first_angle)*math.sin(second_angle), sph.z_coordinate + sph.radius*math.cos(second_angle))
+            self.assertEqual(sphere_array.is_inside(*point_3d).tolist(), [sphere.is_inside(*point_3d) for sphere in spheres])
+            self.assertEqual(sph.is_inside_points([point_3d]).tolist(), [sph.is_inside(*point_3d)])
+
+    def test_translate(self):
+        """Tests that translate sets new coordinates, using both scalars and arrays."""
+
+        spheres = SphereArray.from_shapes(self.spheres)
+        spheres.translate([1, 2], 0, -1)
+        self.assertEqual((spheres.x_coordinates.tolist(), spheres.y_coordinates.tolist(), spheres.z_coordinates.tolist()), ([1, 2], [0, 0], [-1, -1]))
+
+    def test_getitem(self):
+        """Tests that an int returns a shape and that a mask returns a new shape array."""
+
+        circles = CircleArray.from_shapes(self.circles)
+        self.assertEqual(vars_of(circles[-1]), vars_of(self.circles[-1]))
+        self.assertEqual(circles[circles.radii > 2].radii.tolist(), [2.5, 4])
+
+    def test_invalid_values(self):
+        """Tests that invalid columns raise the same errors as the Geometry classes."""
+
+        with self.assertRaises(TypeError):
+            CircleArray(["3", "4"])
+        with self.assertRaises(ValueError):
+            CircleArray([3, -1])
+        with self.assertRaises(ValueError):
+            RectangleArray([1, 2], [1, 2, 3])
+        with self.assertRaises(TypeError):
+            CircleArray.from_shapes(self.spheres)
+
+
+#TESTS BATCH POINT QUERIES
+
+class TestIsInsidePoints(unittest.TestCase):
+    """Tests the is_inside_points method of every Geometry subclass."""
+
+    def setUp(self) -> None:
+        """Initialises random points (and the points on the edges that are used in the other tests)."""
+
+        rng = np.random.default_rng(1)
+        self.points_2d = np.vstack([rng.uniform(-8, 8, (500, 2)), [[3, -5.5], [3, -5.6], [5, -4.5], [5, -4.6]]])
+        self.points_3d = np.vstack([rng.uniform(-8, 8, (500, 3)), [[6, -3, 3], [6, -3.1, 3], [4.5, -4.5, 4.5], [4.6, -4.5, 4.5]]])
+
+    def test_matches_is_inside(self):
+        """Tests that the mask matches is_inside for every point."""
+
+        for shape in (Circle(2.5, 3, -3), Rectangle(4, 3, 3, -3)):
+            self.assertEqual(shape.is_inside_points(self.points_2d).tolist(), [shape.is_inside(*point) for point in self.points_2d.tolist()])
+        for shape in (Sphere(3, 3, -3, 3), Cube(3, 3, -3, 3)):
+            self.assertEqual(shape.is_inside_points(self.points_3d).tolist(), [shape.is_inside(*point) for point in self.points_3d.tolist()])
+
+    def test_points_on_the_edges(self):
+        """Tests that points on the edges (where abs(p - x) <= l/2 rounds differently) give the same answer as is_inside."""
+
+        rect = Rectangle(0.2, 0.2, 0.3, 0.3)
+        self.assertTrue(rect.is_inside(0.4, 0.4))
+        edges_2d = [[0.4, 0.4], [0.2, 0.2], [0.4, 0.2], [0.2, 0.4]]
+        self.assertEqual(rect.is_inside_points(edges_2d).tolist(), [rect.is_inside(*point) for point in edges_2d])
+
+        cube = Cube(0.2, 0.3, 0.3, 0.3)
+        edges_3d = [[0.4, 0.4, 0.4], [0.2, 0.2, 0.2], [0.4, 0.2, 0.4], [0.2, 0.4, 0.2]]
+        self.assertEqual(cube.is_inside_points(edges_3d).tolist(), [cube.is_inside(*point) for point in edges_3d])
+
+    def test_points_on_round_edges(self):
+        """Tests that points on the edges of circles and spheres (where the distance rounds either way) give the same answer as is_inside."""
+
+        angles = np.random.default_rng(4).uniform(0, 2*np.pi, (2000, 2))
+        circ = Circle(1.0, 0.1, 0.2)
+        edges_2d = np.column_stack((0.1 + np.cos(angles[:, 0]), 0.2 + np.sin(angles[:, 0])))
+        self.assertEqual(circ.is_inside_points(edges_2d).tolist(), [circ.is_inside(*point) for point in edges_2d.tolist()])
+
+        sph = Sphere(1.0, 0.1, 0.2, 0.3)
+        edges_3d = np.column_stack((0.1 + np.cos(angles[:, 0])*np.sin(angles[:, 1]), 0.2 + np.sin(angles[:, 0])*np.sin(angles[:, 1]), 0.3 + np.cos(angles[:, 1])))
+        self.assertEqual(sph.is_inside_points(edges_3d).tolist(), [sph.is_inside(*point) for point in edges_3d.tolist()])
+
+    def test_buffer_and_list_input(self):
+        """Tests that nested lists and objects supporting the buffer protocol are accepted."""
+
+        circ = Circle(1)
+        self.assertEqual(circ.is_inside_points([[0, 0], [2, 2]]).tolist(), [True, False])
+        self.assertEqual(circ.is_inside_points(memoryview(np.array([[0.5, 0.5]]))).tolist(), [True])
+
+    def test_invalid_points(self):
+        """Tests that a TypeError is raised for str values and a ValueError for the wrong number of dimensions."""
+
+        with self.assertRaises(TypeError):
+            Circle(1).is_inside_points([["1", "2"]])
+        with self.assertRaises(ValueError):
+            Circle(1).is_inside_points(self.points_3d)
+        with self.assertRaises(ValueError):
+            Cube(1).is_inside_points(self.points_2d)
+
+
+#TESTS SPATIAL INDEX
+
+class TestShapeIndex(unittest.TestCase):
+    """Tests the ShapeIndex class, by comparing its answers with loops over all shapes."""
+
+    def setUp(self) -> None:
+        """Initialises an index with random circles and rectangles, and random query points."""
+
+        rng = np.random.default_rng(2)
+        sizes, x_coordinates, y_coordinates = rng.uniform(0.1, 3, 300).tolist(), rng.uniform(-30, 30, 300).tolist(), rng.uniform(-30, 30, 300).tolist()
+        self.shapes = [Circle(size, x, y) if i % 2 else Rectangle(size, size/2, x, y) for i, (size, x, y) in enumerate(zip(sizes, x_coordinates, y_coordinates))]
+        self.index = ShapeIndex(self.shapes)
+        self.points = rng.uniform(-40, 40, (100, 2)).tolist()
+
+    def test_query_point(self):
+        """Tests that query_point returns the shapes that contain the point."""
+
+        for point in self.points:
+            self.assertEqual({id(shape) for shape in self.index.query_point(point)}, {id(shape) for shape in self.shapes if shape.is_inside(*point)})
+
+    def test_query_box(self):
+        """Tests that query_box returns the shapes whose bounding boxes overlap the box."""
+
+        lowest_corner, highest_corner = (-5, -2), (4, 8)
+        expected = {id(shape) for shape in self.shapes 
+                    if all(low <= box_high and box_low <= high for low, high, box_low, box_high in zip(lowest_corner, highest_corner, *shape.bounding_box()))}
+        self.assertEqual({id(shape) for shape in self.index.query_box(lowest_corner, highest_corner)}, expected)
+
+    def test_nearest(self):
+        """Tests that nearest returns the distance to the closest shape, also for points far away from all shapes."""
+
+        for point in self.points + [[500, -500]]:
+            shape, distance = self.index.nearest(point)
+            self.assertAlmostEqual(distance, min(ShapeIndex._distance(other, point) for other in self.shapes))
+
+    def test_translate_updates_index(self):
+        """Tests that the index is updated when a shape is moved or resized."""
+
+        circ = self.shapes[1]
+        circ.translate(100, 100)
+        self.assertEqual(self.index.query_point((100, 100)), [circ])
+        circ.radius = 10
+        self.assertEqual(self.index.query_point((109, 100)), [circ])
+        self.index.remove(circ)
+        self.assertEqual(self.index.query_point((100, 100)), [])
+
+    def test_large_shape(self):
+        """Tests that a shape that covers very many cells is not stored in the grid, but is still found."""
+
+        large = Rectangle(1e6, 1e6, 0, 0)
+        cells = len(self.index._cells)
+        self.index.insert(large)
+        self.assertEqual(len(self.index._cells), cells)
+        for point in self.points:
+            self.assertIn(large, self.index.query_point(point))
+        self.assertIn(large, self.index.query_box((-1, -1), (1, 1)))
+        self.assertEqual(self.index.nearest((0, 1e6)), (large, 1e6 - 5e5))
+
+        large.translate(1e7, 0) #Still too large, and then small enough for the grid
+        self.assertNotIn(large, self.index.query_point((0, 0)))
+        large.length, large.width = 1, 1
+        self.assertEqual(self.index.query_point((1e7, 0)), [large])
+        self.index.remove(large)
+        self.assertEqual(len(self.index._cells), cells)
+
+    def test_3d_shapes(self):
+        """Tests an index with spheres and cubes, and that a 2D shape can not be added to it."""
+
+        sph, cub = Sphere(2, 0, 0, 0), Cube(2, 10, 0, 0)
+        index = ShapeIndex([sph, cub])
+        self.assertEqual(index.query_point((10.5, 0.5, -0.5)), [cub])
+        self.assertEqual(index.nearest((0, 0, 5)), (sph, 3))
+        with self.assertRaises(ValueError):
+            index.insert(Circle(1))
+
+
+#TESTS IMPORTS
+
+class TestImports(unittest.TestCase):
+    """Tests that importing the shapes does not load the plotting libraries."""
+
+    def test_cold_import_without_plotting(self):
+        """Tests, in a new interpreter, that matplotlib and NumPy are not loaded by importing the shape modules."""
+
+        code = "import sys, geometry, circle, rectangle, sphere, cube, shape_index; print(' '.join(sorted({name.split('.')[0] for name in sys.modules} & {'matplotlib', 'mpl_toolkits', 'numpy'})))"
+        result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+#TESTS COMPACT SHAPES
+
+class TestCompactShapes(unittest.TestCase):
+    """Tests the slots of the Geometry classes and the from_trusted class methods."""
+
+    def test_no_instance_dict(self):
+        """Tests that the shapes store their values in slots, so that no new attributes can be added."""
+
+        for shape in (Circle(1), Rectangle(1, 2), Sphere(1), Cube(1)):
+            self.assertFalse(hasattr(shape, "__dict__"))
+            with self.assertRaises(AttributeError):
+                shape.colour = "red"
+
+    def test_from_trusted_matches_constructor(self):
+        """Tests that from_trusted creates the same shapes as the constructors."""
+
+        pairs = ((Circle(2.5, 3, -3), Circle.from_trusted(2.5, 3, -3)), (Rectangle(4, 3, 3, -3), Rectangle.from_trusted(4, 3, 3, -3)), 
+                 (Sphere(3, 3, -3, 3), Sphere.from_trusted(3, 3, -3, 3)), (Cube(3, 3, -3, 3), Cube.from_trusted(3, 3, -3, 3)))
+        for validated, trusted in pairs:
+            self.assertEqual(type(trusted), type(validated))
+            self.assertEqual(vars_of(trusted), vars_of(validated))
+            self.assertEqual((trusted.area(), trusted.bounding_box()), (validated.area(), validated.bounding_box()))
+
+    def test_from_trusted_shapes_notify_observers(self):
+        """Tests that shapes created with from_trusted can be indexed and moved."""
+
+        sph = Sphere.from_trusted(1, 0, 0, 0)
+        index = ShapeIndex([sph])
+        sph.translate(5, 5, 5)
+        self.assertEqual(index.query_point((5, 5, 5)), [sph])
+
+
+#TESTS FROZEN SHAPES
+
+class TestFrozenShapes(unittest.TestCase):
+    """Tests the frozen shapes and the grouping of congruent shapes."""
+
+    def test_hash_matches_equality(self):
+        """Tests that congruent frozen shapes are equal and have the same hash, independent of the position."""
+
+        self.assertEqual(FrozenCircle(3, -2, 3), FrozenCircle(3, 3, -2))
+        self.assertEqual(hash(FrozenCircle(3, -2, 3)), hash(FrozenCircle(3.0, 3, -2)))
+        self.assertNotEqual(FrozenCircle(3), FrozenSphere(3))
+        self.assertEqual(len({FrozenCube(3, 1, 1, 1), FrozenCube(3), FrozenCube(4)}), 2)
+
+    def test_rectangle_orientation(self):
+        """Tests that rectangles are only grouped together with switched sides when ignore_orientation is True."""
+
+        self.assertNotEqual(FrozenRectangle(2, 3), FrozenRectangle(3, 2))
+        self.assertNotEqual(congruence_key(Rectangle(2, 3)), congruence_key(Rectangle(3, 2)))
+        self.assertEqual(congruence_key(Rectangle(2, 3), ignore_orientation=True), congruence_key(Rectangle(3, 2), ignore_orientation=True))
+
+    def test_immutable(self):
+        """Tests that the values of a frozen shape can not be changed."""
+
+        circ = FrozenCircle(3)
+        with self.assertRaises(AttributeError):
+            circ.radius = 4
+        with self.assertRaises(AttributeError):
+            circ.colour = "red"
+
+    def test_validation(self):
+        """Tests that the frozen shapes validate their values like the Geometry classes."""
+
+        with self.assertRaises(TypeError):
+            FrozenCircle("3")
+        with self.assertRaises(ValueError):
+            FrozenRectangle(3, 0)
+
+    def test_conversion(self):
+        """Tests conversion between frozen shapes and Geometry objects, and pickling."""
+
+        for shape in (Circle(2.5, 3, -3), Rectangle(4, 3, 3, -3), Sphere(3, 3, -3, 3), Cube(3, 3, -3, 3)):
+            frozen = FrozenShape.from_shape(shape)
+            self.assertEqual(vars_of(frozen.to_shape()), vars_of(shape))
+            self.assertEqual(type(frozen.to_shape()), type(shape))
+            self.assertEqual(repr(pickle.loads(pickle.dumps(frozen))), repr(frozen))
+
+    def test_group_congruent(self):
+        """Tests that group_congruent puts congruent shapes (mutable and frozen) in the same group."""
+
+        shapes = [Circle(1, 5, 5), Rectangle(2, 3), FrozenCircle(1), Rectangle(3, 2), Sphere(1), Rectangle(2, 3, 1, 1)]
+        groups = group_congruent(shapes)
+        self.assertEqual(sorted(len(group) for group in groups.values()), [1, 1, 2, 2])
+        self.assertEqual(groups[(Circle, (1,))], [shapes[0], shapes[2]])
+        self.assertEqual(len(group_congruent(shapes, ignore_orientation=True)[(Rectangle, (2, 3))]), 3)
+
+
+#TESTS MONTE CARLO ESTIMATION
+
+class TestMonteCarlo(unittest.TestCase):
+    """Tests estimate_area and estimate_volume against areas and volumes with closed forms."""
+
+    def test_single_shape(self):
+        """Tests that the estimates for one shape are close to the area and the volume of the shape."""
+
+        circ, cub = Circle(2, 1, 1), Cube(3, 1, 1, 1)
+        area = estimate_area(circ, samples=200_000, seed=1)
+        self.assertAlmostEqual(area.estimate, circ.area(), delta=5*area.standard_error)
+        volume = estimate_volume(cub, samples=1_000, seed=1) #Every point in the box is inside the cube
+        self.assertEqual((volume.estimate, volume.standard_error), (cub.volume(), 0))
+
+    def test_boundary(self):
+        """Tests that the estimated circumference and surface area are close to the values of the shapes."""
+
+        for shape, expected in ((Circle(2, 1, 1), Circle(2).circumference()), (Rectangle(4, 1), 10), (Sphere(1), Sphere(1).area()), (Cube(2, 1, 1, 1), 24)):
+            boundary = estimate_boundary(shape, samples=500_000, seed=1)
+            self.assertAlmostEqual(boundary.estimate, expected, delta=5*boundary.standard_error)
+        section = estimate_boundary(Sphere(1, 0, 0, 2), samples=500_000, seed=1, z_value=2)
+        self.assertAlmostEqual(section.estimate, 2*math.pi, delta=5*section.standard_error)
+
+    def test_union_and_intersection(self):
+        """Tests two overlapping circles, where the area of the overlap is known."""
+
+        circles = [Circle(1), Circle(1, 1, 0)]
+        overlap = 2*math.acos(0.5) - math.sqrt(3)/2
+        intersection = estimate_area(circles, "intersection", samples=200_000, seed=2, chunk_size=30_000)
+        union = estimate_area(circles, "union", samples=200_000, seed=2, chunk_size=30_000)
+        self.assertAlmostEqual(intersection.estimate, overlap, delta=5*intersection.standard_error)
+        self.assertAlmostEqual(union.estimate, 2*math.pi - overlap, delta=5*union.standard_error)
+        low, high = union.confidence_interval
+        self.assertLess(low, union.estimate)
+        self.assertGreater(high, union.estimate)
+
+    def test_no_overlap(self):
+        """Tests that the intersection of shapes that do not overlap is 0."""
+
+        self.assertEqual(estimate_volume([Sphere(1), Sphere(1, 5, 5, 5)], "intersection").estimate, 0)
+
+    def test_same_result_with_processes(self):
+        """Tests that a seed gives the same estimate in one process and in several processes."""
+
+        shapes = [Sphere(1), Cube(1, 1, 0, 0)]
+        self.assertEqual(estimate_volume(shapes, samples=40_000, seed=3, chunk_size=10_000), 
+                         estimate_volume(shapes, samples=40_000, seed=3, chunk_size=10_000, processes=2))
+
+    def test_invalid_arguments(self):
+        """Tests that invalid shapes and arguments raise errors."""
+
+        with self.assertRaises(ValueError):
+            estimate_area([Circle(1), Sphere(1)])
+        with self.assertRaises(ValueError):
+            estimate_area(Circle(1), "difference")
+        with self.assertRaises(ValueError):
+            estimate_area(Circle(1), samples=0)
+        with self.assertRaises(TypeError):
+            estimate_area(["circle"])
+
+
+#TESTS CSG
+
+class TestCSG(unittest.TestCase):
+    """Tests Union, Intersection and Difference against the same combinations of is_inside calls."""
+
+    def setUp(self):
+        """Creates a tree with a union of many figures, from which an intersection and a circle are subtracted."""
+
+        rng = np.random.default_rng(0)
+        self.figures = [Circle(size, x, y) if i % 2 else Rectangle(size, 2*size, x, y) 
+                        for i, (size, x, y) in enumerate(zip(*rng.uniform((0.5, -8, -8), (2, 8, 8), (40, 3)).T.tolist()))]
+        self.subtracted = [Circle(4), Rectangle(6, 3)]
+        self.tree = Difference(Union(*self.figures), Intersection(*self.subtracted), Circle(1, 5, 5), x_coordinate=1)
+        self.points = rng.uniform(-12, 12, (2000, 2))
+
+    def expected(self, x_value:float, y_value:float) -> bool:
+        """Checks a point with nested and/or over is_inside."""
+
+        x_value -= 1 #The offset of the tree
+        return (any(figure.is_inside(x_value, y_value) for figure in self.figures) 
+                and not all(figure.is_inside(x_value, y_value) for figure in self.subtracted)
+                and not Circle(1, 5, 5).is_inside(x_value, y_value))
+
+    def test_is_inside(self):
+        """Tests that is_inside and is_inside_points give the same results as nested is_inside calls."""
+
+        expected = [self.expected(*point) for point in self.points.tolist()]
+        self.assertEqual([self.tree.is_inside(*point) for point in self.points.tolist()], expected)
+        self.assertEqual(self.tree.is_inside_points(self.points).tolist(), expected)
+
+    def test_changed_child(self):
+        """Tests that the cached bounding boxes are updated when a child deep in the tree is moved."""
+
+        self.figures[0].translate(30, 30)
+        self.assertTrue(self.tree.is_inside(31, 30))
+        self.assertEqual(self.tree.bounding_box()[1], (31 + self.figures[0].length/2, 30 + self.figures[0].width/2))
+        self.assertEqual(self.tree.is_inside_points(self.points).tolist(), [self.expected(*point) for point in self.points.tolist()])
+
+    def test_translate(self):
+        """Tests that translating a node moves the whole tree, without changing the children."""
+
+        node = Union(Circle(1), Circle(1, 3, 0))
+        node.translate(10, 0)
+        self.assertTrue(node.is_inside(13, 0))
+        self.assertFalse(node.is_inside(3, 0))
+        self.assertEqual(node.bounding_box(), ((9, -1), (14, 1)))
+        self.assertEqual(node.children[1].x_coordinate, 3)
+
+    def test_3d_and_measures(self):
+        """Tests 3D nodes, the estimated area and volume, and an intersection without overlap."""
+
+        node = Intersection(Sphere(1), Cube(1, 0, 0, 0), z_coordinate=2)
+        self.assertTrue(node.is_inside(0.5, 0.5, 2.5))
+        self.assertFalse(node.is_inside(0.5, 0.5, 0.5))
+        self.assertEqual(node.volume(samples=1_000, seed=1), 1.0)
+        self.assertAlmostEqual(Union(Circle(1)).area(samples=100_000, seed=1), math.pi, delta=0.05)
+        empty = Intersection(Circle(1), Circle(1, 5, 0))
+        self.assertEqual(empty.area(), 0)
+        self.assertFalse(empty.is_inside(4, 0))
+
+    def test_geometry_methods(self):
+        """Tests that a node can be used like the other Geometry objects, with estimated area, circumference and volume."""
+
+        two_circles = Union(Circle(1), Circle(1, 1, 0)) #The outer arcs are 4/3 of each circle
+        for shape in (two_circles, Circle(1)):
+            self.assertGreater(shape.area(), 0)
+            self.assertGreater(shape.circumference(), 0)
+        self.assertAlmostEqual(two_circles.circumference(samples=500_000, seed=1), 8*math.pi/3, delta=0.2)
+        self.assertEqual(two_circles.volume(), 0)
+
+        cube = Union(Cube(2, 0, 0, 5))
+        self.assertAlmostEqual(cube.area(samples=500_000, seed=1), 24, delta=0.6)
+        self.assertAlmostEqual(cube.circumference(samples=500_000, seed=1), 8, delta=0.2)
+
+    def test_pickle_and_equality(self):
+        """Tests that an unpickled tree is congruent with the original, and still follows its children."""
+
+        copy = pickle.loads(pickle.dumps(self.tree))
+        self.assertEqual(copy, self.tree)
+        self.assertNotEqual(copy, Union(*self.figures))
+        copy.children[0].children[0].translate(30, 30)
+        self.assertTrue(copy.is_inside(31, 30))
+
+    def test_not_hashable(self):
+        """Tests that nodes, which change with their children, can not be used as dict keys or in sets (as the other figures)."""
+
+        for shape in (self.tree, Circle(1)):
+            with self.assertRaises(TypeError):
+                hash(shape)
+
+    def test_invalid_values(self):
+        """Tests that invalid children and points raise errors."""
+
+        with self.assertRaises(ValueError):
+            Union()
+        with self.assertRaises(ValueError):
+            Union(Circle(1), Sphere(1))
+        with self.assertRaises(TypeError):
+            Union(Circle(1), "circle")
+        with self.assertRaises(ValueError):
+            Union(Circle(1)).is_inside(0, 0, 0)
+        with self.assertRaises(ValueError):
+            Union(Circle(1), z_coordinate=1)
+
+
+#TESTS COLLISIONS
+
+class TestCollisions(unittest.TestCase):
+    """Tests the overlap predicates and find_overlaps against a double loop."""
+
+    def test_overlaps(self):
+        """Tests every pair of types, including figures that only touch."""
+
+        self.assertTrue(Circle(1).overlaps(Circle(1, 2, 0)))
+        self.assertFalse(Circle(1).overlaps(Circle(1, 2, 0.1)))
+        self.assertTrue(Circle(1).overlaps(Rectangle(2, 2, 2, 0)))
+        self.assertFalse(Circle(1).overlaps(Rectangle(2, 2, 1.8, 1.8))) #The bounding boxes overlap, but not the figures
+        self.assertTrue(Rectangle(2, 2).overlaps(Rectangle(1, 1, 1.5, 1.5)))
+        self.assertFalse(Rectangle(2, 2).overlaps(Rectangle(1, 1, 1.6, 0)))
+        self.assertTrue(Sphere(1).overlaps(Sphere(1, 1, 1, 1)))
+        self.assertFalse(Sphere(1).overlaps(Cube(2, 1.6, 1.6, 1.6)))
+        self.assertTrue(Cube(2).overlaps(Sphere(1, 1.5, 0, 0)))
+        self.assertTrue(Cube(2).overlaps(Cube(2, 2, 2, 2)))
+
+    def test_find_overlaps(self):
+        """Tests that find_overlaps finds the same pairs as a double loop, in 2D and 3D, for one and two lists."""
+
+        rng = np.random.default_rng(0)
+        for dimensions, create_ball, create_box in ((2, Circle, lambda size, *centre: Rectangle(size, size/2, *centre)), (3, Sphere, Cube)):
+            values = rng.uniform((0.2,) + (-15,)*dimensions, (3,) + (15,)*dimensions, (300, dimensions + 1)).tolist()
+            shapes = [create_ball(*row) if i % 2 else create_box(*row) for i, row in enumerate(values)]
+            first, second = shapes[:200], shapes[200:]
+
+            expected = [[i, j] for i, j in itertools.combinations(range(len(first)), 2) if first[i].overlaps(first[j])]
+            self.assertEqual(find_overlaps(first).tolist(), expected)
+            expected = [[i, j] for i in range(len(first)) for j in range(len(second)) if first[i].overlaps(second[j])]
+            self.assertEqual(find_overlaps(first, second).tolist(), expected)
+            self.assertEqual(find_overlaps(first, second, cell_size=0.5).tolist(), expected) #Figures that overlap many cells
+
+    def test_touching_shapes(self):
+        """Tests that overlaps and find_overlaps give the same answer for figures that touch (where rounding decides)."""
+
+        rng = np.random.default_rng(3)
+        for radius1, radius2, x, y, angle in rng.uniform((0.01, 0.01, -10, -10, 0), (3, 3, 10, 10, 2*math.pi), (500, 5)).tolist():
+            distance = radius1 + radius2
+            pairs = ((Circle(radius1, x, y), Circle(radius2, x + distance*math.cos(angle), y + distance*math.sin(angle))),
+                     (Circle(radius1, x, y), Rectangle(2*radius2, 2*radius2, x + distance*math.cos(angle), y)),
+                     (Sphere(radius1, x, y, x), Sphere(radius2, x + distance*math.cos(angle), y, x + distance*math.sin(angle))))
+            for first, second in pairs:
+                self.assertEqual(first.overlaps(second), len(find_overlaps([first, second])) == 1)
+
+    def test_huge_shape(self):
+        """Tests that one huge figure among many small figures is not expanded into millions of grid cells."""
+
+        rng = np.random.default_rng(1)
+        shapes = [Circle(0.01, x, y) for x, y in rng.uniform(-1500, 1500, (1000, 2)).tolist()] + [Rectangle(2000, 2000), Rectangle(1, 1, 999, 999)]
+        expected = [[i, j] for i, j in itertools.combinations(range(len(shapes)), 2) if (i >= 1000 or j >= 1000) and shapes[i].overlaps(shapes[j])]
+        self.assertEqual(find_overlaps(shapes).tolist(), expected)
+
+    def test_invalid_values(self):
+        """Tests empty lists and invalid figures."""
+
+        self.assertEqual(find_overlaps([]).shape, (0, 2))
+        with self.assertRaises(ValueError):
+            find_overlaps([Circle(1), Sphere(1)])
+        with self.assertRaises(ValueError):
+            Circle(1).overlaps(Sphere(1))
+        with self.assertRaises(TypeError):
+            Circle(1).overlaps(Union(Circle(1)))
+        with self.assertRaises(ValueError):
+            find_overlaps([Circle(1)], cell_size=0)
+
+
+#TESTS SHAPE STORAGE
+
+class TestShapeStorage(unittest.TestCase):
+    """Tests saving figures to a binary file and loading them as objects and as memory-mapped ShapeArrays."""
+
+    def setUp(self):
+        """Creates a temporary directory and a list with all types of figures (and a ShapeArray) in mixed order."""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "shapes.npy")
+        self.shapes = [Cube(2, 1, 2, 3), Circle(1, 2, 3), Rectangle(2, 3, 4, 5), Sphere(1, 1, 1, 1), CircleArray([1, 2], [3, 4], [5, 6]), Circle(5)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Tests that the loaded objects have the same types and values, in the saved order."""
+
+        save_shapes(self.path, self.shapes)
+        expected = self.shapes[:4] + self.shapes[4].to_shapes() + self.shapes[5:]
+        loaded = load_shapes(self.path)
+        self.assertEqual([type(shape) for shape in loaded], [type(shape) for shape in expected])
+        self.assertEqual([vars_of(shape) for shape in loaded], [vars_of(shape) for shape in expected])
+
+    def test_memory_mapped_arrays(self):
+        """Tests that every type is loaded as a read-only ShapeArray, without creating objects."""
+
+        save_shapes(self.path, self.shapes)
+        arrays = load_shape_arrays(self.path)
+        self.assertEqual(set(arrays), {Circle, Rectangle, Sphere, Cube})
+        self.assertEqual(arrays[Circle].radii.tolist(), [1, 1, 2, 5])
+        self.assertEqual(arrays[Cube].z_coordinates.tolist(), [3])
+        self.assertFalse(arrays[Circle].radii.flags.writeable) #A view of the memory-mapped file
+        self.assertTrue(load_shape_arrays(self.path, mmap_mode=None)[Circle].radii.flags.writeable)
+
+    def test_memory_mapped_arrays_are_not_read(self):
+        """Tests that the sizes are not validated (read) again when the arrays are loaded, and that the arrays work as usual."""
+
+        save_shapes(self.path, self.shapes)
+        with mock.patch.object(ShapeArray, "validation_numerical_above_zero", side_effect=AssertionError("The sizes were read.")):
+            arrays = load_shape_arrays(self.path)
+        for array in arrays.values():
+            expected = type(array)(*(getattr(array, column) for column in array.columns)) #Validated by the constructor
+            self.assertEqual([vars_of(shape) for shape in array.to_shapes()], [vars_of(shape) for shape in expected.to_shapes()])
+            self.assertEqual((len(array), array.area().tolist()), (len(expected), expected.area().tolist()))
+
+    def test_invalid_values(self):
+        """Tests that figures that can not be stored and files that do not hold figures raise errors."""
+
+        with self.assertRaises(TypeError):
+            save_shapes(self.path, [Union(Circle(1))])
+        np.save(self.path, np.zeros((3, 3)))
+        with self.assertRaises(ValueError):
+            load_shapes(self.path)
+        save_shapes(self.path, [])
+        self.assertEqual(load_shapes(self.path), [])
+
+
+#TESTS RENDERING
+
+class TestRender(unittest.TestCase):
+    """Tests drawing figures to PNG and SVG files without a window."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.shapes = [Circle(1), Rectangle(2, 1, 2, 2), Sphere(1, 3, 0, 0), Cube(1, -2, -2, 0)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_render(self):
+        """Tests that one renderer writes several PNG and SVG files, and only keeps the collections of the last image."""
+
+        renderer = BatchRenderer()
+        png_path = renderer.render(self.shapes, os.path.join(self.directory.name, "shapes.png"), point=(0, 0))
+        svg_path = renderer.render(self.shapes[0], os.path.join(self.directory.name, "circle.svg"))
+        with open(png_path, "rb") as file:
+            self.assertEqual(file.read(8), b"\x89PNG\r\n\x1a\n")
+        with open(svg_path) as file:
+            self.assertIn("<svg", file.read())
+        self.assertEqual(len(renderer._axes.collections), 1)
+
+    def test_render_colours(self):
+        """Tests that the figures have the same colours as in plot_figure (blue circles and green rectangles)."""
+
+        from matplotlib.colors import to_rgba
+
+        renderer = BatchRenderer()
+        renderer.render(self.shapes, os.path.join(self.directory.name, "shapes.png"))
+        balls, boxes = renderer._axes.collections
+        self.assertEqual(tuple(balls.get_facecolor()[0]), to_rgba("cornflowerblue"))
+        self.assertEqual(tuple(boxes.get_facecolor()[0]), to_rgba("forestgreen"))
+
+    def test_thumbnails(self):
+        """Tests that one file is written for every figure, in one and in several processes."""
+
+        for processes in (1, 2):
+            paths = render_thumbnails(self.shapes, os.path.join(self.directory.name, str(processes)), processes=processes)
+            self.assertEqual([os.path.basename(path) for path in paths], [f"shape_{number}.png" for number in range(4)])
+            self.assertTrue(all(os.path.getsize(path) > 0 for path in paths))
+
+    def test_invalid_shapes(self):
+        """Tests that figures that can not be drawn raise a TypeError."""
+
+        with self.assertRaises(TypeError):
+            BatchRenderer().render([Union(Circle(1))], os.path.join(self.directory.name, "union.png"))
+
+
+#TESTS MESHES
+
+class TestMeshes(unittest.TestCase):
+    """Tests the cached unit meshes, combined meshes of spheres and cubes, and the OBJ and PLY export."""
+
+    @staticmethod
+    def signed_volume(vertices, faces) -> float:
+        """Returns the volume of a closed mesh, which is negative if the triangles face inwards."""
+
+        first, second, third = vertices[faces[:, 0]], vertices[faces[:, 1]], vertices[faces[:, 2]]
+        return float(np.einsum("ij,ij->i", first, np.cross(second, third)).sum()/6)
+
+    def test_unit_meshes(self):
+        """Tests that the unit meshes are cached, read-only, closed and face outwards."""
+
+        self.assertIs(unit_sphere_mesh(12), unit_sphere_mesh(12))
+        self.assertIs(unit_sphere_grid(), unit_sphere_grid())
+        vertices, faces = unit_sphere_mesh(32)
+        self.assertFalse(vertices.flags.writeable)
+        self.assertTrue(np.allclose(np.linalg.norm(vertices, axis=1), 1))
+        self.assertAlmostEqual(self.signed_volume(vertices, faces), 4/3*math.pi, delta=0.1)
+        self.assertEqual(self.signed_volume(*unit_cube_mesh()), 1)
+        with self.assertRaises(ValueError):
+            unit_sphere_mesh(2)
+
+    def test_combine_meshes(self):
+        """Tests that every figure in the combined mesh is scaled and translated to its own size and position."""
+
+        shapes = [Sphere(2, 1, 1, 1), Cube(2, 5, 5, 5), Sphere(1)]
+        vertices, faces = combine_meshes(shapes, resolution=12)
+        sphere_vertices = len(unit_sphere_mesh(12)[0])
+        self.assertEqual(len(vertices), 2*sphere_vertices + 8)
+        self.assertEqual(vertices[sphere_vertices:sphere_vertices + 8].min(axis=0).tolist(), [4, 4, 4])
+        self.assertEqual(vertices[sphere_vertices:sphere_vertices + 8].max(axis=0).tolist(), [6, 6, 6])
+        self.assertTrue(np.allclose(np.linalg.norm(vertices[:sphere_vertices] - 1, axis=1), 2))
+        self.assertEqual(faces.max(), len(vertices) - 1)
+        with self.assertRaises(TypeError):
+            combine_meshes([Circle(1)])
+
+    def test_level_of_detail(self):
+        """Tests that scenes with more spheres get coarser meshes."""
+
+        self.assertGreater(choose_resolution(10), choose_resolution(100_000))
+        vertices, faces = combine_meshes([Sphere(1)]*10_000, triangle_budget=100_000)
+        self.assertLessEqual(len(faces), 100_000)
+
+    def test_export(self):
+        """Tests that the OBJ and PLY files hold all vertices and faces."""
+
+        vertices, faces = combine_meshes([Sphere(1), Cube(1, 3, 0, 0)], resolution=8)
+        with tempfile.TemporaryDirectory() as directory:
+            obj_path, ply_path = os.path.join(directory, "mesh.obj"), os.path.join(directory, "mesh.ply")
+            write_obj(obj_path, vertices, faces)
+            with open(obj_path) as file:
+                lines = file.read().splitlines()
+            self.assertEqual(sum(line.startswith("v ") for line in lines), len(vertices))
+            self.assertEqual([line for line in lines if line.startswith("f ")][0], "f {} {} {}".format(*(faces[0] + 1)))
+
+            write_ply(ply_path, vertices, faces)
+            with open(ply_path, "rb") as file:
+                header, body = file.read().split(b"end_header\n")
+            self.assertIn(f"element vertex {len(vertices)}".encode(), header)
+            self.assertEqual(np.frombuffer(body[:24*len(vertices)], dtype="<f8").reshape(-1, 3).tolist(), vertices.tolist())
+            self.assertEqual(len(body), 24*len(vertices) + 13*len(faces))
+
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file